@@ -41,9 +41,11 @@ try {
     if ($count -gt 0) {
         $first = $response[0]
         Write-Host "  Premier candidat: $($first.first_name) $($first.last_name)" -ForegroundColor Gray
-        if ($first.documents.cv) {
-            $cvLength = $first.documents.cv.Length
-            Write-Host "  Texte CV extrait: $cvLength caractères" -ForegroundColor Gray
+        # documents.cv est une liste de {id, nom_fichier, texte}
+        foreach ($cv in @($first.documents.cv)) {
+            if ($cv.texte) {
+                Write-Host "  Texte CV extrait ($($cv.nom_fichier)): $($cv.texte.Length) caractères" -ForegroundColor Gray
+            }
         }
     }
 } catch {
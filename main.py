@@ -1,19 +1,84 @@
 """
 Script principal de traitement des candidatures
 """
+import argparse
 import asyncio
 import sys
+from pathlib import Path
+from src.config import settings
 from src.logger import app_logger as logger
 from src.processor.candidature_processor import candidature_processor
+from src.processor.job_queue import JobQueue
+from src.processor.parallel import run_workers
 
 
-async def main():
+def parse_args():
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Traitement des candidatures SEEG-AI")
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Ne reprend que les candidatures en échec dans la file de travail"
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Affiche l'état de la file de travail sans rien traiter"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Nombre de processus de traitement (candidatures réparties entre eux)"
+    )
+    return parser.parse_args()
+
+
+def print_status():
+    """Affiche le nombre de candidatures et de documents par état"""
+    queue = JobQueue(Path(settings.job_queue_path))
+    try:
+        counts = queue.get_counts()
+    finally:
+        queue.close()
+    
+    print(f"\nFile de travail: {settings.job_queue_path}")
+    for table, label in (("candidates", "Candidatures"), ("documents", "Documents")):
+        states = ", ".join(f"{state}: {count}" for state, count in counts[table].items())
+        print(f"  {label:<13} {states}")
+    print()
+
+
+async def main(retry_failed: bool = False):
     """Point d'entrée principal du script"""
     try:
         logger.info("🚀 Démarrage du traitement SEEG-AI")
         
         # Traitement de toutes les candidatures
-        await candidature_processor.process_all_candidatures()
+        await candidature_processor.process_all_candidatures(retry_failed=retry_failed)
+        
+        logger.success("✅ Traitement terminé avec succès")
+        return 0
+        
+    except KeyboardInterrupt:
+        logger.warning("⚠️ Traitement interrompu par l'utilisateur")
+        return 130
+        
+    except Exception as e:
+        logger.error(f"❌ Erreur fatale: {e}")
+        logger.exception(e)
+        return 1
+
+
+def main_parallel(workers: int, retry_failed: bool = False):
+    """Point d'entrée du traitement réparti sur plusieurs processus"""
+    try:
+        logger.info("🚀 Démarrage du traitement SEEG-AI")
+        
+        summary = run_workers(workers, retry_failed=retry_failed)
+        if summary["failed_workers"]:
+            logger.error("❌ Traitement incomplet : des processus se sont arrêtés")
+            return 1
         
         logger.success("✅ Traitement terminé avec succès")
         return 0
@@ -29,6 +94,13 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    args = parse_args()
+    if args.status:
+        print_status()
+        sys.exit(0)
+    
+    if args.workers > 1:
+        exit_code = main_parallel(args.workers, retry_failed=args.retry_failed)
+    else:
+        exit_code = asyncio.run(main(retry_failed=args.retry_failed))
     sys.exit(exit_code)
-
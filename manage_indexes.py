@@ -0,0 +1,156 @@
+"""
+Gestion des index MongoDB / Cosmos DB
+Compare les index déclarés (src/database/indexes.py) aux index existants,
+permet de créer ceux qui manquent et de renseigner les champs indexés
+des candidatures existantes ou de reconstruire l'index plein texte
+"""
+import argparse
+import sys
+from pymongo import MongoClient
+
+from src.config import settings
+from src.database.mongodb_client import MongoDBClient
+from src.database.indexes import (
+    FULLTEXT_INDEX_SPECS,
+    declared_specs,
+    spec_name,
+    ensure_indexes,
+    diff_indexes
+)
+
+
+def print_diff(diff, specs, title="INDEX DÉCLARÉS vs EXISTANTS"):
+    """Affiche l'écart entre index déclarés et index existants"""
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+    
+    for spec in specs:
+        name = spec_name(spec)
+        if name in diff["ok"]:
+            status = "✓ ok"
+        elif name in diff["mismatched"]:
+            status = "⚠️  définition différente"
+        else:
+            status = "✗ manquant"
+        print(f"  {name:<35} {status}")
+    
+    for name in diff["extra"]:
+        print(f"  {name:<35} + non déclaré")
+    
+    print()
+
+
+def build_maintenance_client(client: MongoClient, database: str, collection: str) -> MongoDBClient:
+    """
+    Prépare un MongoDBClient sur une connexion existante
+    
+    Toutes ses collections (candidatures, index plein texte, versions,
+    offres) sont renseignées : les opérations de maintenance incrémentent
+    ainsi la version des candidatures et invalident le cache de l'API.
+    Contrairement à connect(), aucun index n'est créé.
+    
+    Args:
+        client: Connexion MongoDB ouverte
+        database: Nom de la base
+        collection: Nom de la collection des candidatures
+    
+    Returns:
+        Client prêt pour les opérations de maintenance
+    """
+    maintenance_client = MongoDBClient()
+    maintenance_client.client = client
+    maintenance_client.database = client[database]
+    maintenance_client.collection = maintenance_client.database[collection]
+    maintenance_client.terms = maintenance_client.database[settings.fulltext_collection]
+    maintenance_client.meta = maintenance_client.database[settings.mongodb_meta_collection]
+    maintenance_client.offres = maintenance_client.database[settings.mongodb_offres_collection]
+    return maintenance_client
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Gestion des index SEEG-AI")
+    parser.add_argument(
+        "connection_string",
+        nargs="?",
+        default=settings.mongodb_connection_string,
+        help="Connection string MongoDB / Cosmos DB (défaut: configuration .env)"
+    )
+    parser.add_argument("--database", default=settings.mongodb_database)
+    parser.add_argument("--collection", default=settings.mongodb_collection)
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Crée les index manquants après affichage de l'écart"
+    )
+    parser.add_argument(
+        "--backfill-names",
+        action="store_true",
+        help="Renseigne les noms normalisés des candidatures existantes"
+    )
+    parser.add_argument(
+        "--rebuild-fulltext",
+        action="store_true",
+        help="Reconstruit l'index inversé plein texte (FULLTEXT_BACKEND=inverted)"
+    )
+    parser.add_argument(
+        "--extract-offres",
+        action="store_true",
+        help="Déplace les offres copiées dans les candidatures vers leur collection"
+    )
+    args = parser.parse_args()
+    
+    client = MongoClient(
+        args.connection_string,
+        serverSelectionTimeoutMS=10000,
+        connectTimeoutMS=10000
+    )
+    collection = client[args.database][args.collection]
+    terms = client[args.database][settings.fulltext_collection]
+    maintenance_client = build_maintenance_client(client, args.database, args.collection)
+    
+    # Collections à vérifier : candidatures, et index inversé selon le moteur
+    targets = [(collection, declared_specs(), "INDEX DÉCLARÉS vs EXISTANTS")]
+    if settings.fulltext_backend == "inverted":
+        targets.append((terms, FULLTEXT_INDEX_SPECS, f"INDEX {settings.fulltext_collection}"))
+    
+    try:
+        incomplete = False
+        
+        for target, specs, title in targets:
+            diff = diff_indexes(target, specs)
+            print_diff(diff, specs, title)
+            
+            if diff["mismatched"]:
+                print("⚠️  Les index à définition différente doivent être supprimés manuellement")
+            
+            if args.apply and diff["missing"]:
+                print("Création des index manquants...")
+                ensure_indexes(target, specs)
+                diff = diff_indexes(target, specs)
+                print_diff(diff, specs, title)
+            
+            incomplete = incomplete or bool(diff["missing"] or diff["mismatched"])
+        
+        if args.backfill_names:
+            updated = maintenance_client.backfill_normalized_names()
+            print(f"✓ Noms normalisés renseignés pour {updated} candidature(s)\n")
+        
+        if args.rebuild_fulltext:
+            indexed = maintenance_client.rebuild_fulltext_index()
+            print(f"✓ Index plein texte reconstruit pour {indexed} candidature(s)\n")
+        
+        if args.extract_offres:
+            extracted = maintenance_client.extract_embedded_offres()
+            print(f"✓ Offres extraites pour {extracted} candidature(s)\n")
+        
+        # Code retour non nul si des index déclarés sont absents ou différents
+        return 1 if incomplete else 0
+    
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,6 @@ import asyncio
 import json
 import sys
 from pathlib import Path
-from pymongo import MongoClient
 from pymongo.errors import DuplicateKeyError
 from dotenv import load_dotenv
 import os
@@ -16,6 +15,7 @@ import os
 from src.logger import app_logger as logger
 from src.processor.candidature_processor import candidature_processor
 from src.config import settings
+from src.database.indexes import ensure_indexes
 
 
 async def migrate_direct_to_cosmos(cosmos_connection_string: str):
@@ -44,39 +44,36 @@ async def migrate_direct_to_cosmos(cosmos_connection_string: str):
         total_candidats = len(candidats_data)
         logger.info(f"✓ {total_candidats} candidats trouvés dans le fichier\n")
         
-        # 3. Connexion à Cosmos DB
-        logger.info("🔌 Connexion à Cosmos DB Azure...")
-        client = MongoClient(
-            cosmos_connection_string,
-            serverSelectionTimeoutMS=10000,
-            connectTimeoutMS=10000
-        )
-        db = client["SEEG-AI"]
-        collection = db["candidats"]
-        
-        # Test de connexion
-        collection.find_one()
-        logger.success("✓ Connecté à Cosmos DB Azure\n")
-        
-        # Compter les documents existants
-        existing_count = collection.count_documents({})
-        logger.info(f"📊 Documents existants dans Cosmos DB: {existing_count}\n")
-        
-        # 4. Connexion aux services (Azure OCR, Supabase)
+        # 3. Connexion aux services (Azure OCR, Supabase)
         logger.info("🔌 Connexion aux services Azure OCR et Supabase...")
         await candidature_processor._connect_services()
         logger.info("")
         
-        # 5. Temporairement rediriger mongodb_client vers Cosmos DB
+        # 4. Temporairement rediriger mongodb_client vers Cosmos DB : les
+        # candidatures, offres, index plein texte et versions basculent ensemble
         from src.database.mongodb_client import mongodb_client
         
         # Sauvegarder l'ancienne connexion
-        old_client = mongodb_client.client
-        old_collection = mongodb_client.collection
+        old_state = dict(vars(mongodb_client))
         
-        # Remplacer par Cosmos DB
-        mongodb_client.client = client
-        mongodb_client.collection = collection
+        logger.info("🔌 Connexion à Cosmos DB Azure...")
+        mongodb_client.connect(cosmos_connection_string, database="SEEG-AI")
+        client = mongodb_client.client
+        collection = mongodb_client.collection
+        logger.success("✓ Connecté à Cosmos DB Azure\n")
+        
+        # Les offres déjà écrites en local doivent l'être aussi dans Cosmos DB
+        candidature_processor._stored_offres.clear()
+        
+        # Index requis (application_id unique pour le contrôle des doublons)
+        try:
+            ensure_indexes(collection)
+        except Exception as e:
+            logger.warning(f"⚠️  Création des index impossible: {e}")
+        
+        # 5. Compter les documents existants
+        existing_count = collection.count_documents({})
+        logger.info(f"📊 Documents existants dans Cosmos DB: {existing_count}\n")
         
         logger.info("=" * 80)
         logger.info(f"TRAITEMENT DE {total_candidats} CANDIDATURES")
@@ -120,8 +117,8 @@ async def migrate_direct_to_cosmos(cosmos_connection_string: str):
                 continue
         
         # 7. Restaurer l'ancienne connexion
-        mongodb_client.client = old_client
-        mongodb_client.collection = old_collection
+        vars(mongodb_client).update(old_state)
+        await candidature_processor._close_services()
         
         # 8. Vérification finale
         logger.info("\n" + "=" * 80)
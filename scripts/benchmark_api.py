@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Benchmark de charge de l'API SEEG-AI (requêtes concurrentes)
+
+Trois modes :
+- --url : mesure une API déployée (à lancer avant/après une mise à jour)
+- --local : mesure les routes réelles de src.api.app, en mémoire, contre
+  la base MongoDB configurée (MONGODB_*, à pointer vers une base de test
+  alimentée par main.py), avec le client motor puis avec le client
+  pymongo synchrone appelé dans les handlers (fonctionnement d'avant
+  motor). Le cache de réponses est désactivé.
+- --simulate : démonstration sans base (time.sleep contre asyncio.sleep)
+  du blocage de la boucle d'événements ; ses chiffres n'illustrent que le
+  principe et ne mesurent pas l'API
+
+Exemples :
+    python scripts/benchmark_api.py --url http://localhost:8000/candidatures?limit=20
+    python scripts/benchmark_api.py --local --path "/candidatures?limit=20&fields=-documents"
+    python scripts/benchmark_api.py --simulate --latency 0.05
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def run_load(client: httpx.AsyncClient, url: str, requests: int, concurrency: int):
+    """
+    Envoie des requêtes GET concurrentes et mesure le débit
+    
+    Returns:
+        Tuple (durée totale, nombre d'erreurs)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+    
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            try:
+                response = await client.get(url)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    return time.perf_counter() - start, errors
+
+
+def print_result(label: str, elapsed: float, requests: int, errors: int):
+    print(
+        f"  {label:<28} {requests / elapsed:8.1f} req/s "
+        f"({elapsed:.2f}s, {errors} erreur(s))"
+    )
+
+
+async def benchmark_url(url: str, requests: int, concurrency: int):
+    """Benchmark d'une API réelle"""
+    async with httpx.AsyncClient(timeout=60) as client:
+        elapsed, errors = await run_load(client, url, requests, concurrency)
+    print_result(url, elapsed, requests, errors)
+
+
+class BlockingRepository:
+    """
+    Client pymongo synchrone derrière l'interface du client motor
+    
+    Reproduit les handlers d'avant motor : chaque requête bloque la boucle
+    d'événements pendant l'aller-retour avec la base.
+    """
+    
+    def __init__(self, client):
+        self.client = client
+    
+    async def get_all_candidatures(self, limit=None, after=None, fields=None, expand_offre=False):
+        return self.client.get_all_candidatures(limit=limit, after=after, fields=fields)
+    
+    async def search_candidatures(self, first_name=None, last_name=None, expand_offre=False):
+        return self.client.search_candidatures(first_name=first_name, last_name=last_name)
+
+
+async def benchmark_local(path: str, requests: int, concurrency: int):
+    """Routes réelles de l'API, client motor puis client pymongo bloquant"""
+    from src.api.app import app
+    from src.database.async_mongodb_client import async_mongodb_client
+    from src.database.mongodb_client import mongodb_client
+    
+    await async_mongodb_client.connect()
+    mongodb_client.connect()
+    
+    variants = (
+        ("pymongo bloquant (avant)", BlockingRepository(mongodb_client)),
+        ("motor (après)", async_mongodb_client)
+    )
+    
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for label, repository in variants:
+                with patch("src.api.app.async_mongodb_client", repository), \
+                        patch("src.api.app.settings.api_cache_enabled", False):
+                    await client.get(path)  # échauffement
+                    elapsed, errors = await run_load(client, path, requests, concurrency)
+                print_result(label, elapsed, requests, errors)
+    finally:
+        async_mongodb_client.close()
+        mongodb_client.close()
+
+
+def build_simulated_app(latency: float):
+    """Application avec deux routes : accès base bloquant vs asynchrone"""
+    from fastapi import FastAPI
+    
+    app = FastAPI()
+    
+    @app.get("/blocking")
+    async def blocking():
+        # Équivalent d'un appel pymongo dans un handler async def
+        time.sleep(latency)
+        return []
+    
+    @app.get("/async")
+    async def non_blocking():
+        # Équivalent d'un appel motor (await)
+        await asyncio.sleep(latency)
+        return []
+    
+    return app
+
+
+async def benchmark_simulated(latency: float, requests: int, concurrency: int):
+    """Démonstration du blocage de la boucle d'événements (pas une mesure de l'API)"""
+    print("  Démonstration : latence simulée, ni handlers réels ni MongoDB\n")
+    transport = httpx.ASGITransport(app=build_simulated_app(latency))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, path in (("time.sleep (bloquant)", "/blocking"), ("asyncio.sleep (await)", "/async")):
+            elapsed, errors = await run_load(client, path, requests, concurrency)
+            print_result(label, elapsed, requests, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de charge de l'API SEEG-AI")
+    parser.add_argument("--url", help="URL à interroger (API déployée)")
+    parser.add_argument("--local", action="store_true", help="Routes réelles contre la base configurée")
+    parser.add_argument("--path", default="/candidatures?limit=20", help="Route mesurée en mode --local")
+    parser.add_argument("--simulate", action="store_true", help="Démonstration sans base (latence simulée)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence base simulée (s)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"\nBenchmark: {args.requests} requêtes, {args.concurrency} en parallèle\n")
+    
+    if args.local:
+        asyncio.run(benchmark_local(args.path, args.requests, args.concurrency))
+    elif args.simulate:
+        asyncio.run(benchmark_simulated(args.latency, args.requests, args.concurrency))
+    elif args.url:
+        asyncio.run(benchmark_url(args.url, args.requests, args.concurrency))
+    else:
+        parser.error("--url, --local ou --simulate requis")
+    
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Mesure du gain de la compression des réponses (taille et latence)
+
+Deux modes :
+- --url : interroge une API déployée avec et sans Accept-Encoding
+- par défaut : compresse en local un export construit depuis
+  data/Donnees_candidatures_SEEG.json (offres HTML, questions et réponses
+  MTP), avec --with-ocr pour ajouter des textes OCR simulés (répétitifs,
+  donc plus compressibles que des textes réels)
+
+Exemples :
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py --scale 25 --with-ocr
+    python scripts/benchmark_compression.py --url "http://localhost:8000/candidatures?limit=200"
+"""
+import argparse
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+SAMPLE_FILE = Path(__file__).resolve().parent.parent / "data" / "Donnees_candidatures_SEEG.json"
+OCR_TEXT = "Expérience professionnelle en gestion de réseaux électriques. " * 80
+
+
+def build_payload(scale: int, with_ocr: bool) -> bytes:
+    """Liste JSON de candidatures telle que renvoyée par /candidatures"""
+    from src.processor.candidature_processor import CandidatureProcessor
+    
+    processor = CandidatureProcessor()
+    candidates = json.loads(SAMPLE_FILE.read_text(encoding="utf-8-sig"))
+    documents = []
+    
+    for _ in range(scale):
+        for candidate in candidates:
+            document = processor._build_candidature_from_json(candidate).model_dump(by_alias=True)
+            if with_ocr:
+                document["documents"] = {
+                    "cv": [{"id": "cv", "nom_fichier": "CV.pdf", "texte": OCR_TEXT}],
+                    "cover_letter": [{"id": "lm", "nom_fichier": "LM.pdf", "texte": OCR_TEXT}]
+                }
+            documents.append(document)
+    
+    return json.dumps(documents, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def measure(label: str, compress, payload: bytes, rounds: int = 5):
+    """Affiche taille compressée, ratio et durée moyenne de compression"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compressed = compress(payload)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(
+        f"  {label:<14} {len(compressed) / 1024:10.1f} Ko "
+        f"x{len(payload) / len(compressed):5.1f} {elapsed * 1000:8.1f} ms"
+    )
+
+
+def benchmark_local(scale: int, with_ocr: bool):
+    """Compare les niveaux gzip et Brotli sur un export représentatif"""
+    payload = build_payload(scale, with_ocr)
+    print(f"Export de {scale * 40} candidatures: {len(payload) / 1024:.1f} Ko\n")
+    
+    for level in (1, 6, 9):
+        measure(
+            f"gzip {level}",
+            lambda data, level=level: zlib.compress(data, level),
+            payload
+        )
+    
+    if brotli is None:
+        print("  (module brotli non installé : Brotli non mesuré)")
+        return
+    
+    for quality in (1, 5, 11):
+        measure(
+            f"brotli {quality}",
+            lambda data, quality=quality: brotli.compress(data, quality=quality),
+            payload,
+            rounds=1 if quality == 11 else 5
+        )
+
+
+def benchmark_url(url: str, rounds: int = 5):
+    """Taille transférée et latence d'une API réelle selon l'encodage"""
+    encodings = ["identity", "gzip"] + (["br"] if brotli else [])
+    
+    with httpx.Client(timeout=120) as client:
+        for encoding in encodings:
+            sizes, durations = [], []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as response:
+                    raw = b"".join(response.iter_raw())
+                durations.append(time.perf_counter() - start)
+                sizes.append(len(raw))
+            print(
+                f"  {encoding:<10} {sizes[-1] / 1024:10.1f} Ko "
+                f"{sum(durations) / rounds * 1000:8.1f} ms "
+                f"(Content-Encoding: {response.headers.get('content-encoding', '-')})"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure de la compression des réponses")
+    parser.add_argument("--url", help="URL à interroger (API déployée)")
+    parser.add_argument("--scale", type=int, default=5, help="Multiplicateur de l'échantillon de 40 candidatures")
+    parser.add_argument("--with-ocr", action="store_true", help="Ajoute des textes OCR simulés")
+    args = parser.parse_args()
+    
+    print()
+    if args.url:
+        benchmark_url(args.url)
+    else:
+        benchmark_local(args.scale, args.with_ocr)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
 """
 API FastAPI pour consulter les candidatures
 """
-from typing import List, Optional
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse
+import json
+import zlib
+import asyncio
+from typing import List, Optional, AsyncIterator, Awaitable, Callable, Dict, Any, Union
+from bson import ObjectId
+from fastapi import FastAPI, Query, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from src.config import settings
 from src.logger import app_logger as logger
-from src.database.mongodb_client import mongodb_client
-from src.models import Candidature
+from src.database.mongodb_client import MongoDBClient, normalize_name
+from src.database.async_mongodb_client import async_mongodb_client
+from src.api.response_cache import ResponseCache, etag_matches
+from src.api.health import HealthMonitor
+from src.api.responses import MongoJSONResponse, model_keys, normalize_documents, restrict_keys
+from src.api.compression import CompressionMiddleware
+from src.models import Candidature, CandidaturePage, FulltextResult
 
 
 @asynccontextmanager
@@ -16,14 +26,28 @@ async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
     # Démarrage
     logger.info("🚀 Démarrage de l'API SEEG-AI")
-    mongodb_client.connect()
+    await async_mongodb_client.connect()
+    index_task = asyncio.create_task(async_mongodb_client.create_indexes())
+    health_monitor.start()
     logger.success("✓ API prête")
     
     yield
     
     # Arrêt
     logger.info("⏹️  Arrêt de l'API")
-    mongodb_client.close()
+    index_task.cancel()
+    await health_monitor.stop()
+    async_mongodb_client.close()
+
+
+# Clés de premier niveau publiées par /candidatures et /candidatures/search
+CANDIDATURE_KEYS = model_keys(Candidature)
+
+# Ping MongoDB rafraîchi en arrière-plan pour les sondes de santé
+health_monitor = HealthMonitor(
+    ping=lambda: async_mongodb_client.ping(),
+    interval=settings.api_health_ping_interval
+)
 
 
 # Création de l'application FastAPI
@@ -34,6 +58,23 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cache des réponses de lecture, invalidé par le compteur de version
+response_cache = ResponseCache(
+    max_entries=settings.api_cache_max_entries,
+    max_bytes=settings.api_cache_max_bytes,
+    ttl=settings.api_cache_ttl,
+    version_check_interval=settings.api_cache_version_check_interval
+)
+
+# Compression des réponses (textes OCR et descriptions HTML très compressibles)
+if settings.api_compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.api_compression_minimum_size,
+        gzip_level=settings.api_gzip_level,
+        brotli_quality=settings.api_brotli_quality
+    )
+
 # Configuration CORS (accès public)
 app.add_middleware(
     CORSMiddleware,
@@ -51,49 +92,249 @@ async def root():
         "message": "Bienvenue sur l'API SEEG-AI",
         "version": "1.0.0",
         "endpoints": {
-            "candidatures": "/candidatures",
+            "candidatures": "/candidatures?limit=100&after=<cursor>",
             "search": "/candidatures/search?first_name=XXX&last_name=YYY",
-            "health": "/health"
+            "fulltext": "/candidatures/fulltext?q=XXX",
+            "export": "/candidatures/export?gzip=true",
+            "health": "/health",
+            "liveness": "/health/live",
+            "readiness": "/health/ready"
         }
     }
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Sonde de vivacité : le processus répond, sans accès à la base"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Sonde de disponibilité : dernier ping MongoDB réussi et récent
+    
+    Le ping est exécuté en arrière-plan (API_HEALTH_PING_INTERVAL) : la
+    sonde ne lit aucun document et n'interroge pas la base.
+    
+    Returns:
+        État du ping et du pool de connexions (503 si indisponible)
+    """
+    ready = health_monitor.is_ready()
+    content = {
+        "status": "healthy" if ready else "unhealthy",
+        "database": "connected" if ready else "unavailable",
+        **health_monitor.snapshot(),
+        "pool": async_mongodb_client.get_pool_stats()
+    }
+    
+    if not ready:
+        logger.warning(f"Health check failed: {health_monitor.last_error}")
+    
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+
 @app.get("/health")
 async def health_check():
-    """Vérification de l'état de santé de l'API"""
-    try:
-        # Test de connexion MongoDB
-        mongodb_client.collection.find_one()
-        
-        return {
-            "status": "healthy",
-            "database": "connected"
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail="Service unavailable"
-        )
+    """Vérification de l'état de santé de l'API (équivalent de /health/ready)"""
+    return await readiness_check()
 
 
-@app.get("/candidatures", response_model=List[Candidature])
-async def get_all_candidatures():
+def _list_response(
+    content: Union[List[Dict[str, Any]], Dict[str, Any]],
+    headers: Dict[str, str],
+    response: Response
+) -> Union[List[Dict[str, Any]], Dict[str, Any], Response]:
     """
-    Récupère toutes les candidatures
+    Sérialise une liste de documents MongoDB
+    
+    Par défaut, les documents sont encodés directement par orjson : ils ne
+    sont pas revalidés par le response_model, qui ne sert qu'au schéma
+    OpenAPI. API_VALIDATE_RESPONSES=true rétablit la validation Pydantic.
+    
+    Args:
+        content: Documents à retourner (déjà limités aux champs publiés), ou
+            page {items, next}
+        headers: En-têtes à ajouter à la réponse
+        response: Réponse injectée par FastAPI (chemin validé)
     
     Returns:
-        Liste de toutes les candidatures stockées dans MongoDB
+        Réponse JSON, ou contenu à valider par le response_model
+    """
+    if settings.api_validate_responses:
+        response.headers.update(headers)
+        return content
+    return MongoJSONResponse(content, headers=headers)
+
+
+async def _cached_response(
+    request: Request,
+    headers: Dict[str, str],
+    endpoint: str,
+    params: Dict[str, Any],
+    load: Callable[[], Awaitable[Any]]
+) -> Union[Any, Response]:
+    """
+    Sert une réponse depuis le cache ou la charge depuis MongoDB
+    
+    Ajoute les en-têtes ETag et X-Cache, et retourne une réponse 304 si
+    l'ETag correspond à l'en-tête If-None-Match du client.
+    
+    Args:
+        request: Requête entrante
+        headers: En-têtes de la réponse, complétés par le cache
+        endpoint: Nom de l'endpoint (préfixe de la clé de cache)
+        params: Paramètres de la requête
+        load: Coroutine chargeant la réponse depuis MongoDB
+    
+    Returns:
+        Contenu de la réponse, ou Response 304
+    """
+    if not settings.api_cache_enabled:
+        return await load()
+    
+    version = await response_cache.current_version(async_mongodb_client.get_collection_version)
+    if version is None:
+        return await load()
+    
+    key = ResponseCache.make_key(endpoint, params)
+    entry = response_cache.get(key, version)
+    cache_status = "HIT"
+    
+    if entry is None:
+        entry = response_cache.put(key, version, await load())
+        cache_status = "MISS"
+    
+    headers.update({"ETag": entry.etag, "X-Cache": cache_status})
+    
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    
+    return entry.value
+
+
+@app.get(
+    "/candidatures",
+    response_model=Union[List[Candidature], CandidaturePage],
+    response_model_exclude_unset=True
+)
+async def get_all_candidatures(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.api_max_page_size,
+        description=(
+            "Nombre maximum de candidatures par page "
+            "(sans limit, after ni paginate : toutes les candidatures)"
+        )
+    ),
+    after: Optional[str] = Query(
+        None,
+        description="Curseur: _id de la dernière candidature de la page précédente"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Champs à retourner, séparés par des virgules "
+            "(ex: first_name,last_name,offre.intitule) ou à exclure avec '-' "
+            "(ex: -documents)"
+        )
+    ),
+    expand_offre: bool = Query(
+        False,
+        description="Inclut l'offre complète (description, questions MTP) de chaque candidature"
+    ),
+    paginate: bool = Query(
+        False,
+        description="Réponse {items, next} avec le curseur de la page suivante dans le corps"
+    )
+):
+    """
+    Récupère les candidatures, page par page si demandé
+    
+    Sans limit, after ni paginate, toutes les candidatures sont retournées
+    (comportement historique). Sinon la réponse est une page de limit
+    candidatures (API_DEFAULT_PAGE_SIZE par défaut) ; la page suivante est
+    indiquée par les en-têtes X-Next-Cursor et Link (absents sur la
+    dernière page) et, avec paginate=true, par le champ next du corps.
+    
+    Returns:
+        Liste des candidatures triées par _id, ou page {items, next}
+    
+    Examples:
+        - /candidatures?limit=50
+        - /candidatures?limit=50&after=6718f0c2a1b2c3d4e5f60718
+        - /candidatures?paginate=true&fields=-documents
+        - /candidatures?expand_offre=true
     """
     try:
-        logger.info("📋 Récupération de toutes les candidatures")
+        if after and not ObjectId.is_valid(after):
+            raise HTTPException(
+                status_code=400,
+                detail="Curseur 'after' invalide"
+            )
         
-        candidatures = mongodb_client.get_all_candidatures()
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        try:
+            MongoDBClient.build_projection(field_list)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        logger.success(f"✓ {len(candidatures)} candidatures retournées")
+        if limit is None and (after or paginate):
+            limit = settings.api_default_page_size
+        
+        logger.info(f"📋 Récupération des candidatures (limit={limit}, after={after})")
+        
+        async def load():
+            return restrict_keys(
+                await async_mongodb_client.get_all_candidatures(
+                    limit=limit,
+                    after=after,
+                    fields=field_list,
+                    expand_offre=expand_offre
+                ),
+                CANDIDATURE_KEYS
+            )
+        
+        headers: Dict[str, str] = {}
+        
+        try:
+            candidatures = await _cached_response(
+                request,
+                headers,
+                "candidatures",
+                {
+                    "limit": limit,
+                    "after": after,
+                    "fields": field_list,
+                    "expand_offre": expand_offre
+                },
+                load
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if isinstance(candidatures, Response):
+            return candidatures
         
-        return candidatures
+        # Curseur de la page suivante si la page est pleine
+        next_cursor = None
+        if limit and len(candidatures) == limit:
+            next_cursor = str(candidatures[-1]["_id"])
+            next_url = request.url.include_query_params(after=next_cursor)
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{next_url}>; rel="next"'
         
+        logger.success(f"✓ {len(candidatures)} candidatures retournées")
+        
+        if paginate:
+            return _list_response({"items": candidatures, "next": next_cursor}, headers, response)
+        return _list_response(candidatures, headers, response)
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erreur récupération candidatures: {e}")
         raise HTTPException(
@@ -102,15 +343,91 @@ async def get_all_candidatures():
         )
 
 
+async def _ndjson_lines(candidatures: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Sérialise chaque candidature sur une ligne JSON"""
+    async for candidature in candidatures:
+        candidature = normalize_documents(candidature)
+        yield json.dumps(candidature, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+async def _gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compresse un flux d'octets en gzip au fil de l'eau"""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@app.get("/candidatures/export")
+async def export_candidatures(
+    fields: Optional[str] = Query(
+        None,
+        description="Champs à exporter (même syntaxe que /candidatures)"
+    ),
+    gzip: bool = Query(
+        False,
+        description="Compresse le flux en gzip (Content-Encoding: gzip)"
+    ),
+    expand_offre: bool = Query(
+        False,
+        description="Inclut l'offre complète (description, questions MTP) de chaque candidature"
+    )
+):
+    """
+    Exporte toutes les candidatures en NDJSON (une candidature par ligne)
+    
+    Les documents sont lus par lots depuis un curseur MongoDB et envoyés au
+    fur et à mesure : la mémoire reste constante quelle que soit la taille
+    de la collection. Avec expand_offre, les offres sont lues une fois par
+    lot.
+    
+    Examples:
+        - /candidatures/export
+        - /candidatures/export?fields=-documents&gzip=true
+        - /candidatures/export?expand_offre=true
+    """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    
+    try:
+        MongoDBClient.build_projection(field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info("📤 Export NDJSON des candidatures")
+    
+    body = _ndjson_lines(
+        async_mongodb_client.iter_candidatures(
+            fields=field_list,
+            batch_size=settings.api_export_batch_size,
+            expand_offre=expand_offre
+        )
+    )
+    headers = {"Content-Disposition": 'attachment; filename="candidatures.ndjson"'}
+    
+    if gzip:
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
 @app.get("/candidatures/search", response_model=List[Candidature])
 async def search_candidatures(
+    request: Request,
+    response: Response,
     first_name: Optional[str] = Query(
         None,
-        description="Prénom du candidat à rechercher (insensible à la casse)"
+        description="Début du prénom à rechercher (insensible à la casse et aux accents)"
     ),
     last_name: Optional[str] = Query(
         None,
-        description="Nom du candidat à rechercher (insensible à la casse)"
+        description="Début du nom à rechercher (insensible à la casse et aux accents)"
+    ),
+    expand_offre: bool = Query(
+        False,
+        description="Inclut l'offre complète (description, questions MTP) de chaque candidature"
     )
 ):
     """
@@ -119,6 +436,7 @@ async def search_candidatures(
     Args:
         first_name: Prénom à rechercher (optionnel)
         last_name: Nom à rechercher (optionnel)
+        expand_offre: Inclut l'offre complète
     
     Returns:
         Liste des candidatures correspondant aux critères de recherche
@@ -129,8 +447,9 @@ async def search_candidatures(
         - /candidatures/search?first_name=Sevan&last_name=Kedesh
     """
     try:
-        # Validation : au moins un paramètre requis
-        if not first_name and not last_name:
+        # Validation : au moins un paramètre non vide une fois normalisé
+        # (un nom fait d'espaces donnerait un préfixe vide : toute la collection)
+        if not normalize_name(first_name) and not normalize_name(last_name):
             raise HTTPException(
                 status_code=400,
                 detail="Au moins un paramètre (first_name ou last_name) est requis"
@@ -141,15 +460,36 @@ async def search_candidatures(
             f"first_name={first_name}, last_name={last_name}"
         )
         
-        candidatures = mongodb_client.search_candidatures(
-            first_name=first_name,
-            last_name=last_name
+        async def load():
+            return restrict_keys(
+                await async_mongodb_client.search_candidatures(
+                    first_name=first_name,
+                    last_name=last_name,
+                    expand_offre=expand_offre
+                ),
+                CANDIDATURE_KEYS
+            )
+        
+        headers: Dict[str, str] = {}
+        candidatures = await _cached_response(
+            request,
+            headers,
+            "search",
+            {
+                "first_name": normalize_name(first_name),
+                "last_name": normalize_name(last_name),
+                "expand_offre": expand_offre
+            },
+            load
         )
         
-        logger.success(f"✓ {len(candidatures)} candidatures trouvées")
+        if isinstance(candidatures, Response):
+            return candidatures
         
-        return candidatures
+        logger.success(f"✓ {len(candidatures)} candidatures trouvées")
         
+        return _list_response(candidatures, headers, response)
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -160,6 +500,47 @@ async def search_candidatures(
         )
 
 
+@app.get("/candidatures/fulltext", response_model=List[FulltextResult])
+async def fulltext_search(
+    response: Response,
+    q: str = Query(..., min_length=2, description="Termes recherchés dans les documents OCR"),
+    limit: int = Query(20, ge=1, le=100, description="Nombre maximum de résultats")
+):
+    """
+    Recherche plein texte dans les CV, lettres, diplômes et certificats
+    
+    Les résultats sont classés par pertinence et ne contiennent que les
+    identifiants, les noms et des extraits où les termes sont surlignés
+    (<mark>...</mark>).
+    
+    Args:
+        q: Termes recherchés
+        limit: Nombre maximum de résultats
+    
+    Returns:
+        Liste des candidatures correspondantes, les plus pertinentes d'abord
+    
+    Examples:
+        - /candidatures/fulltext?q=comptabilité
+        - /candidatures/fulltext?q=ingénieur réseau&limit=5
+    """
+    try:
+        logger.info(f"🔍 Recherche plein texte: q={q}")
+        
+        results = await async_mongodb_client.fulltext_search(q, limit=limit)
+        
+        logger.success(f"✓ {len(results)} candidatures trouvées")
+        
+        return _list_response(results, {}, response)
+    
+    except Exception as e:
+        logger.error(f"Erreur recherche plein texte: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur lors de la recherche: {str(e)}"
+        )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Gestionnaire d'erreurs global"""
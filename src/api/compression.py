@@ -0,0 +1,218 @@
+"""
+Compression des réponses de l'API (gzip, et Brotli si disponible)
+"""
+import asyncio
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli optionnel : gzip uniquement
+    brotli = None
+
+
+# Types déjà compressés ou diffusés en continu, transmis tels quels
+EXCLUDED_CONTENT_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/gzip",
+    "application/zip",
+    "text/event-stream"
+)
+
+# Au-delà de cette taille, un bloc est compressé dans un thread pour ne pas
+# bloquer la boucle d'événements
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Analyse un en-tête Accept-Encoding
+    
+    Args:
+        header: Valeur de l'en-tête (ex: "br;q=1.0, gzip;q=0.8, *;q=0.1")
+    
+    Returns:
+        Dictionnaire {encodage: qualité}
+    """
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def negotiate_encoding(header: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Choisit l'encodage de la réponse
+    
+    Brotli est préféré à gzip à qualité égale (meilleur ratio sur du texte).
+    
+    Args:
+        header: Valeur de l'en-tête Accept-Encoding
+        brotli_available: Module brotli installé
+    
+    Returns:
+        "br", "gzip" ou None (pas de compression)
+    """
+    accepted = parse_accept_encoding(header or "")
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli_available else ["gzip"]
+    
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Compresseur incrémental commun à gzip et Brotli"""
+    
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compresse un bloc ; les blocs intermédiaires sont vidés pour le streaming"""
+        if self.encoding == "br":
+            output = self._compressor.process(data)
+            return output + (self._compressor.finish() if final else self._compressor.flush())
+        output = self._compressor.compress(data)
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compression des réponses
+    
+    L'encodage est négocié via Accept-Encoding. Ne sont pas compressées :
+    les réponses déjà encodées (ex: export avec gzip=true), les réponses
+    partielles ou sans corps, les types déjà compressés, et les réponses
+    complètes plus petites que minimum_size. Les réponses en flux sont
+    compressées bloc par bloc.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """État de compression d'une réponse"""
+    
+    def __init__(self, send: Send, encoding: str, middleware: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+    
+    @staticmethod
+    def _should_skip(message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        content_type = headers.get("content-type", "").lower()
+        return (
+            "content-encoding" in headers
+            or message["status"] in (204, 206, 304)
+            or message["status"] < 200
+            or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+        )
+    
+    async def _compress(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await asyncio.to_thread(self.compressor.compress, body, final)
+        return self.compressor.compress(body, final)
+    
+    def _start_compressed(self, length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        return self.start_message
+    
+    async def send(self, message: Message):
+        message_type = message["type"]
+        
+        if message_type == "http.response.start":
+            # Les en-têtes sont retenus jusqu'au premier bloc du corps
+            self.start_message = message
+            self.passthrough = self._should_skip(message)
+            if self.passthrough:
+                await self._send(message)
+            return
+        
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.compressor is None:
+            # Premier bloc : petite réponse complète transmise telle quelle
+            if not more_body and len(body) < self.middleware.minimum_size:
+                MutableHeaders(raw=self.start_message["headers"]).add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+            
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality
+            )
+            compressed = await self._compress(body, final=not more_body)
+            await self._send(self._start_compressed(None if more_body else len(compressed)))
+            await self._send({
+                "type": "http.response.body",
+                "body": compressed,
+                "more_body": more_body
+            })
+            return
+        
+        compressed = await self._compress(body, final=not more_body)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
@@ -0,0 +1,87 @@
+"""
+Surveillance de la base pour les sondes de santé de l'API
+"""
+import asyncio
+import time
+from typing import Optional, Dict, Any, Awaitable, Callable
+from src.logger import app_logger as logger
+
+
+class HealthMonitor:
+    """
+    Résultat de ping MongoDB rafraîchi en arrière-plan
+    
+    Les sondes lisent le dernier résultat sans interroger la base : une
+    sonde Azure App Service appelée en continu ne coûte qu'un ping toutes
+    les interval secondes, quel que soit le nombre d'appels.
+    """
+    
+    def __init__(self, ping: Callable[[], Awaitable[float]], interval: float = 15.0):
+        self.ping = ping
+        self.interval = interval
+        self.ok = False
+        self.latency: Optional[float] = None
+        self.last_check: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def check(self) -> bool:
+        """
+        Exécute un ping et enregistre son résultat
+        
+        Returns:
+            True si la base a répondu
+        """
+        try:
+            self.latency = await asyncio.wait_for(self.ping(), timeout=self.interval)
+            if not self.ok:
+                logger.info(f"✓ MongoDB joignable (ping {self.latency * 1000:.1f} ms)")
+            self.ok = True
+            self.last_error = None
+        except Exception as e:
+            if self.ok or self.last_check is None:
+                logger.error(f"Ping MongoDB en échec: {e}")
+            self.ok = False
+            self.last_error = str(e) or type(e).__name__
+        finally:
+            self.last_check = time.monotonic()
+        
+        return self.ok
+    
+    def start(self):
+        """Démarre le rafraîchissement périodique"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Arrête le rafraîchissement périodique"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+    
+    def is_ready(self) -> bool:
+        """Dernier ping réussi et récent (moins de trois intervalles)"""
+        return (
+            self.ok
+            and self.last_check is not None
+            and time.monotonic() - self.last_check <= 3 * self.interval
+        )
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """État du dernier ping, pour la réponse de la sonde"""
+        age = time.monotonic() - self.last_check if self.last_check is not None else None
+        return {
+            "ping_ok": self.ok,
+            "ping_latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "last_check_seconds_ago": round(age, 1) if age is not None else None,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,232 @@
+"""
+Cache en mémoire des réponses des endpoints de lecture
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Awaitable, Callable
+import orjson
+from src.logger import app_logger as logger
+
+
+class CacheEntry:
+    """Réponse mise en cache pour une version de la collection"""
+    
+    __slots__ = ("value", "version", "etag", "size", "expires_at")
+    
+    def __init__(self, value: Any, version: int, etag: str, size: int, expires_at: float):
+        self.value = value
+        self.version = version
+        self.etag = etag
+        self.size = size
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    Cache TTL + LRU des réponses de l'API
+    
+    Les entrées sont indexées par endpoint et paramètres normalisés. Elles
+    sont invalidées dès que le compteur de version de la collection change
+    (incrémenté à chaque écriture du traitement par lots) et expirent au
+    plus tard après ttl secondes. Le compteur n'est relu en base qu'une
+    fois toutes les version_check_interval secondes.
+    
+    La taille totale est bornée par max_bytes, mesurée sur le JSON des
+    réponses (approximation de leur empreinte mémoire) : une réponse plus
+    grande que ce budget, comme une liste complète avec les textes OCR,
+    n'est pas mise en cache.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 60.0,
+        version_check_interval: float = 5.0,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """
+        Construit la clé d'une requête
+        
+        L'ordre des paramètres et des champs demandés n'influe pas sur la clé ;
+        les paramètres absents sont ignorés.
+        
+        Args:
+            endpoint: Nom de l'endpoint
+            params: Paramètres de la requête
+        
+        Returns:
+            Clé de cache
+        """
+        normalized = {}
+        for name, value in params.items():
+            if value is None or value == "" or value == []:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = sorted(str(item).strip() for item in value)
+            elif isinstance(value, str):
+                value = value.strip()
+            normalized[name] = value
+        
+        return f"{endpoint}?{json.dumps(normalized, sort_keys=True)}"
+    
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        """Sérialise une réponse (orjson, comme MongoJSONResponse)"""
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    
+    @staticmethod
+    def make_etag(payload: bytes) -> str:
+        """ETag faible calculé sur le contenu sérialisé de la réponse"""
+        return f'W/"{hashlib.blake2b(payload, digest_size=12).hexdigest()}"'
+    
+    async def current_version(self, loader: Callable[[], Awaitable[int]]) -> Optional[int]:
+        """
+        Retourne la version de la collection, relue au plus une fois par intervalle
+        
+        Un changement de version vide le cache.
+        
+        Args:
+            loader: Coroutine lisant le compteur de version en base
+        
+        Returns:
+            Version courante, ou None si elle ne peut pas être lue
+        """
+        now = time.monotonic()
+        checked_recently = now - self._version_checked_at < self.version_check_interval
+        if self._version is not None and checked_recently:
+            return self._version
+        
+        try:
+            version = await loader()
+        except Exception as e:
+            logger.warning(f"Lecture de la version de la collection impossible: {e}")
+            return None
+        
+        if version != self._version and self._entries:
+            logger.debug(f"Version collection {self._version} → {version}: cache vidé")
+            self._entries.clear()
+            self._bytes = 0
+        
+        self._version = version
+        self._version_checked_at = now
+        return version
+    
+    def get(self, key: str, version: int) -> Optional[CacheEntry]:
+        """
+        Récupère une réponse en cache
+        
+        Args:
+            key: Clé calculée par make_key
+            version: Version courante de la collection
+        
+        Returns:
+            Entrée valide, ou None si absente, expirée ou obsolète
+        """
+        entry = self._entries.get(key)
+        
+        if entry is None or entry.version != version or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, version: int, value: Any) -> CacheEntry:
+        """
+        Enregistre une réponse puis évince les entrées les moins récemment utilisées
+        
+        La réponse n'est sérialisée qu'une fois, pour son ETag et sa taille.
+        Une réponse plus grande que max_bytes n'est pas conservée.
+        
+        Args:
+            key: Clé calculée par make_key
+            version: Version de la collection au moment de la lecture
+            value: Réponse à mettre en cache (ne doit plus être modifiée)
+        
+        Returns:
+            Entrée créée
+        """
+        payload = self.encode(value)
+        entry = CacheEntry(
+            value=value,
+            version=version,
+            etag=self.make_etag(payload),
+            size=len(payload),
+            expires_at=time.monotonic() + self.ttl
+        )
+        
+        if key in self._entries:
+            self._remove(key)
+        if entry.size > self.max_bytes:
+            return entry
+        
+        self._entries[key] = entry
+        self._bytes += entry.size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+        
+        return entry
+    
+    def _remove(self, key: str):
+        """Supprime une entrée et libère sa taille"""
+        self._bytes -= self._entries.pop(key).size
+    
+    def clear(self):
+        """Vide le cache et force la relecture de la version"""
+        self._entries.clear()
+        self._bytes = 0
+        self._version = None
+        self._version_checked_at = 0.0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Statistiques d'utilisation du cache"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match correspond à l'ETag
+    
+    Args:
+        if_none_match: Valeur de l'en-tête (liste d'ETags ou "*")
+        etag: ETag de la réponse
+    
+    Returns:
+        True si le client possède déjà cette version
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    # Comparaison faible : le préfixe W/ est ignoré
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,80 @@
+"""
+Sérialisation rapide des réponses de l'API
+"""
+from typing import List, Dict, Any, Type
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """
+    Réponse JSON sérialisée par orjson, sans passer par les modèles Pydantic
+    
+    Les types BSON non gérés par orjson (ObjectId, Decimal128...) sont
+    convertis en chaîne.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_keys(model: Type[BaseModel]) -> frozenset:
+    """Clés de premier niveau d'un modèle telles que sérialisées (alias compris)"""
+    return frozenset(
+        field.alias or name for name, field in model.model_fields.items()
+    )
+
+
+# Types de documents stockés en liste (voir models.Documents)
+DOCUMENT_TYPES = ("cv", "cover_letter", "diplome", "certificats")
+
+
+def normalize_documents(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convertit les documents enregistrés avec un seul texte par type
+    
+    Les candidatures traitées avant le passage à plusieurs documents par
+    type ont documents.cv (etc.) sous forme de chaîne : le chemin rapide
+    les publie au format liste, comme le fait la validation Pydantic.
+    
+    Args:
+        document: Document MongoDB d'une candidature (modifié sur place)
+    
+    Returns:
+        Le même document
+    """
+    documents = document.get("documents")
+    if not isinstance(documents, dict):
+        return document
+    
+    for doc_type in DOCUMENT_TYPES:
+        if doc_type not in documents:
+            continue
+        value = documents[doc_type]
+        if value is None:
+            documents[doc_type] = []
+        elif isinstance(value, str):
+            documents[doc_type] = [{"id": None, "nom_fichier": None, "texte": value}]
+    return document
+
+
+def restrict_keys(documents: List[Dict[str, Any]], keys: frozenset) -> List[Dict[str, Any]]:
+    """
+    Ne garde que les clés de premier niveau publiées par le modèle de réponse
+    
+    Reproduit le filtrage de response_model : les champs techniques
+    (documents_meta, noms normalisés...) ne sont pas exposés, et les
+    documents à l'ancien format sont convertis (voir normalize_documents).
+    
+    Args:
+        documents: Documents MongoDB
+        keys: Clés autorisées (voir model_keys)
+    
+    Returns:
+        Nouveaux dictionnaires limités aux clés autorisées
+    """
+    return [
+        normalize_documents({key: value for key, value in document.items() if key in keys})
+        for document in documents
+    ]
@@ -0,0 +1,404 @@
+"""
+Client MongoDB asynchrone (motor) utilisé par l'API
+"""
+import time
+from typing import List, Optional, Dict, Any, AsyncIterator
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, monitoring
+from src.config import settings
+from src.logger import app_logger as logger
+from src.database.mongodb_client import MongoDBClient, build_connection_string
+from src.database.indexes import index_models, FULLTEXT_INDEX_SPECS
+from src.database.fulltext import tokenize, rank_postings, make_snippets
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Compte les connexions du pool MongoDB (événements pymongo)"""
+    
+    def __init__(self):
+        self.stats = {"open": 0, "in_use": 0, "created": 0, "checkout_failed": 0}
+    
+    def connection_created(self, event):
+        self.stats["open"] += 1
+        self.stats["created"] += 1
+    
+    def connection_closed(self, event):
+        self.stats["open"] = max(0, self.stats["open"] - 1)
+    
+    def connection_checked_out(self, event):
+        self.stats["in_use"] += 1
+    
+    def connection_checked_in(self, event):
+        self.stats["in_use"] = max(0, self.stats["in_use"] - 1)
+    
+    def connection_check_out_failed(self, event):
+        self.stats["checkout_failed"] += 1
+    
+    # Événements sans effet sur les compteurs
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_check_out_started(self, event):
+        pass
+
+
+class AsyncMongoDBClient:
+    """
+    Accès asynchrone aux candidatures pour les handlers FastAPI
+    
+    Les requêtes ne bloquent pas la boucle d'événements : une requête lente
+    sur Cosmos DB n'empêche pas les autres appels de l'API d'avancer. Le
+    client synchrone MongoDBClient reste utilisé par les scripts batch.
+    """
+    
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database = None
+        self.collection = None
+        self.terms = None
+        self.meta = None
+        self.offres = None
+        self.pool_listener = PoolStatsListener()
+    
+    async def connect(self):
+        """Établit la connexion à MongoDB"""
+        try:
+            logger.info(f"Connexion asynchrone à MongoDB: {settings.mongodb_database}")
+            
+            self.client = AsyncIOMotorClient(
+                build_connection_string(),
+                event_listeners=[self.pool_listener]
+            )
+            self.database = self.client[settings.mongodb_database]
+            self.collection = self.database[settings.mongodb_collection]
+            self.terms = self.database[settings.fulltext_collection]
+            self.meta = self.database[settings.mongodb_meta_collection]
+            self.offres = self.database[settings.mongodb_offres_collection]
+            
+            # Test de connexion
+            await self.client.admin.command('ping')
+            logger.success("✓ Connexion MongoDB asynchrone établie avec succès")
+        
+        except Exception as e:
+            logger.error(f"Erreur de connexion MongoDB: {e}")
+            raise
+    
+    async def ping(self) -> float:
+        """
+        Vérifie que la base répond, sans lire de document
+        
+        Returns:
+            Latence du ping en secondes
+        """
+        start = time.perf_counter()
+        await self.client.admin.command('ping')
+        return time.perf_counter() - start
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Statistiques du pool de connexions"""
+        stats = dict(self.pool_listener.stats)
+        if self.client is not None:
+            stats["max_pool_size"] = self.client.options.pool_options.max_pool_size
+        return stats
+    
+    async def create_indexes(self):
+        """Crée les index déclarés dans src.database.indexes"""
+        try:
+            await self.collection.create_indexes(index_models())
+            if settings.fulltext_backend == "inverted":
+                await self.terms.create_indexes(index_models(FULLTEXT_INDEX_SPECS))
+            logger.debug("Index MongoDB créés")
+        except Exception as e:
+            logger.warning(f"Erreur création d'index: {e}")
+    
+    async def get_collection_version(self) -> int:
+        """
+        Lit le compteur de version des candidatures
+        
+        Returns:
+            Version courante (0 si aucune écriture n'a été enregistrée)
+        """
+        document = await self.meta.find_one(
+            {"_id": settings.mongodb_collection},
+            {"version": 1}
+        )
+        return document.get("version", 0) if document else 0
+    
+    async def inline_offres(self, candidatures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Remplace le résumé d'offre des candidatures par l'offre complète
+        
+        Les offres de la page sont lues en une seule requête ($in sur les
+        offre_id distincts). Les candidatures sans offre_id (enregistrées
+        avec l'offre copiée) sont laissées telles quelles.
+        
+        Args:
+            candidatures: Candidatures contenant offre_id
+        
+        Returns:
+            Les mêmes candidatures, offre complète incluse
+        """
+        offre_ids = {c["offre_id"] for c in candidatures if c.get("offre_id")}
+        if not offre_ids:
+            return candidatures
+        
+        offres = {
+            offre.pop("_id"): offre
+            for offre in await self.offres.find(
+                {"_id": {"$in": list(offre_ids)}}
+            ).to_list(length=None)
+        }
+        
+        for candidature in candidatures:
+            offre = offres.get(candidature.get("offre_id"))
+            if offre is not None:
+                # Les champs propres à la candidature (date_publication) priment
+                candidature["offre"] = {**offre, **candidature.get("offre", {})}
+        
+        return candidatures
+    
+    @staticmethod
+    def _projection(fields: Optional[List[str]], expand_offre: bool) -> Optional[Dict[str, int]]:
+        """Projection demandée, avec offre_id si l'offre doit être incluse"""
+        projection = MongoDBClient.build_projection(fields)
+        if expand_offre and projection and 1 in projection.values():
+            projection["offre_id"] = 1
+        return projection
+    
+    async def get_all_candidatures(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        expand_offre: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère les candidatures, page par page si limit est fourni
+        
+        Args:
+            limit: Nombre maximum de candidatures (toutes si None)
+            after: _id de la dernière candidature de la page précédente
+            fields: Projection (voir MongoDBClient.build_projection)
+            expand_offre: Inclut l'offre complète depuis la collection des offres
+        
+        Returns:
+            Liste des candidatures triées par _id
+        """
+        try:
+            query = {}
+            if after:
+                query["_id"] = {"$gt": ObjectId(after)}
+            
+            cursor = self.collection.find(
+                query,
+                self._projection(fields, expand_offre)
+            ).sort("_id", ASCENDING)
+            
+            if limit:
+                cursor = cursor.limit(limit)
+            
+            candidatures = await cursor.to_list(length=None)
+            
+            # Conversion des ObjectId en string
+            for candidature in candidatures:
+                candidature["_id"] = str(candidature["_id"])
+            
+            if expand_offre:
+                await self.inline_offres(candidatures)
+            
+            logger.info(f"✓ {len(candidatures)} candidatures récupérées")
+            return candidatures
+        
+        except Exception as e:
+            logger.error(f"Erreur récupération candidatures: {e}")
+            raise
+    
+    async def iter_candidatures(
+        self,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 500,
+        expand_offre: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parcourt toutes les candidatures depuis un curseur, sans les charger
+        
+        Avec expand_offre, les candidatures sont regroupées par lots de
+        batch_size et les offres de chaque lot lues en une requête : la
+        mémoire reste bornée par la taille du lot.
+        
+        Args:
+            fields: Projection (voir MongoDBClient.build_projection)
+            batch_size: Nombre de documents récupérés par aller-retour
+            expand_offre: Inclut l'offre complète depuis la collection des offres
+        
+        Yields:
+            Candidatures triées par _id
+        """
+        cursor = self.collection.find(
+            {},
+            self._projection(fields, expand_offre),
+            batch_size=batch_size
+        ).sort("_id", ASCENDING)
+        
+        batch = []
+        try:
+            async for candidature in cursor:
+                candidature["_id"] = str(candidature["_id"])
+                if not expand_offre:
+                    yield candidature
+                    continue
+                
+                batch.append(candidature)
+                if len(batch) >= batch_size:
+                    for expanded in await self.inline_offres(batch):
+                        yield expanded
+                    batch = []
+            
+            for expanded in await self.inline_offres(batch):
+                yield expanded
+        finally:
+            await cursor.close()
+    
+    async def search_candidatures(
+        self,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        expand_offre: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche des candidatures par nom/prénom
+        
+        Args:
+            first_name: Prénom à rechercher (optionnel)
+            last_name: Nom à rechercher (optionnel)
+            expand_offre: Inclut l'offre complète depuis la collection des offres
+        
+        Returns:
+            Liste des candidatures correspondantes
+        """
+        try:
+            query = MongoDBClient.build_search_query(first_name, last_name)
+            
+            candidatures = await self.collection.find(query).to_list(length=None)
+            
+            # Conversion des ObjectId en string
+            for candidature in candidatures:
+                candidature["_id"] = str(candidature["_id"])
+            
+            if expand_offre:
+                await self.inline_offres(candidatures)
+            
+            logger.info(
+                f"✓ {len(candidatures)} candidatures trouvées "
+                f"(first_name={first_name}, last_name={last_name})"
+            )
+            return candidatures
+        
+        except Exception as e:
+            logger.error(f"Erreur recherche candidatures: {e}")
+            raise
+    
+    async def fulltext_search(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Recherche plein texte dans les textes OCR, classée par pertinence
+        
+        Utilise l'index $text (FULLTEXT_BACKEND=text) ou l'index inversé
+        maintenu par le traitement (FULLTEXT_BACKEND=inverted).
+        
+        Args:
+            text: Termes recherchés
+            limit: Nombre maximum de résultats
+        
+        Returns:
+            Liste [{_id, application_id, first_name, last_name, score, snippets}]
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+        
+        try:
+            if settings.fulltext_backend == "inverted":
+                candidatures = await self._search_inverted_index(terms, limit)
+            else:
+                candidatures = await self._search_text_index(text, limit)
+            
+            results = [
+                {
+                    "_id": str(candidature["_id"]),
+                    "application_id": candidature.get("application_id"),
+                    "first_name": candidature.get("first_name"),
+                    "last_name": candidature.get("last_name"),
+                    "score": candidature["score"],
+                    "snippets": make_snippets(candidature.get("documents"), terms)
+                }
+                for candidature in candidatures
+            ]
+            
+            logger.info(f"✓ {len(results)} candidatures trouvées (fulltext={text!r})")
+            return results
+        
+        except Exception as e:
+            logger.error(f"Erreur recherche plein texte: {e}")
+            raise
+    
+    async def _search_text_index(self, text: str, limit: int) -> List[Dict[str, Any]]:
+        """Recherche via l'index $text, triée par textScore"""
+        cursor = self.collection.find(
+            {"$text": {"$search": text}},
+            {
+                "score": {"$meta": "textScore"},
+                "application_id": 1,
+                "first_name": 1,
+                "last_name": 1,
+                "documents": 1
+            }
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        
+        return await cursor.to_list(length=None)
+    
+    async def _search_inverted_index(self, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Recherche via l'index inversé, classement TF-IDF côté API"""
+        postings = await self.terms.find(
+            {"term": {"$in": sorted(set(terms))}},
+            {"_id": 0, "term": 1, "application_id": 1, "tf": 1}
+        ).to_list(length=None)
+        if not postings:
+            return []
+        
+        # Nombre de candidatures (métadonnées, sans parcours) pour l'IDF
+        total = await self.collection.estimated_document_count()
+        ranked = rank_postings(postings, total, limit)
+        scores = {item["application_id"]: item["score"] for item in ranked}
+        
+        candidatures = await self.collection.find(
+            {"application_id": {"$in": list(scores)}},
+            {"application_id": 1, "first_name": 1, "last_name": 1, "documents": 1}
+        ).to_list(length=None)
+        
+        for candidature in candidatures:
+            candidature["score"] = scores[candidature["application_id"]]
+        
+        return sorted(candidatures, key=lambda c: c["score"], reverse=True)
+    
+    def close(self):
+        """Ferme la connexion MongoDB"""
+        if self.client:
+            self.client.close()
+            logger.info("Connexion MongoDB asynchrone fermée")
+
+
+# Instance globale
+async_mongodb_client = AsyncMongoDBClient()
@@ -0,0 +1,164 @@
+"""
+Écriture groupée des candidatures via bulk_write
+"""
+import asyncio
+from typing import List, Optional, Dict, Any, Tuple, Callable
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from src.logger import app_logger as logger
+
+
+class CandidatureBulkWriter:
+    """
+    Accumule des upserts et les envoie par lots à MongoDB
+    
+    Les lots sont envoyés dès que batch_size opérations sont en attente, ou
+    au plus tard après flush_interval secondes. Chaque appel à upsert()
+    attend l'envoi de son lot et retourne l'ID inséré (None si le document
+    existait déjà). on_flush est appelé (dans un thread) après chaque lot
+    ayant écrit au moins un document.
+    """
+    
+    def __init__(
+        self,
+        collection,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        on_flush: Optional[Callable[[], None]] = None
+    ):
+        self.collection = collection
+        self.on_flush = on_flush
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[Dict[str, Any], Dict[str, Any], asyncio.Future]] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {"batches": 0, "upserted": 0, "matched": 0, "errors": 0}
+    
+    def start(self):
+        """Démarre l'envoi périodique des lots en attente"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._periodic_flush())
+    
+    async def close(self):
+        """Arrête l'envoi périodique et envoie les opérations restantes"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        
+        await self.flush()
+        
+        logger.info(
+            f"Écriture groupée: {self.stats['batches']} lot(s), "
+            f"{self.stats['upserted']} insertion(s), "
+            f"{self.stats['matched']} mise(s) à jour, "
+            f"{self.stats['errors']} erreur(s)"
+        )
+    
+    async def _periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Erreur envoi périodique du lot: {e}")
+    
+    async def upsert(self, filter_query: Dict[str, Any], document: Dict[str, Any]) -> Optional[str]:
+        """
+        Ajoute un upsert au lot courant et attend son envoi
+        
+        Args:
+            filter_query: Filtre identifiant la candidature
+            document: Champs à écrire ($set)
+        
+        Returns:
+            ID du document inséré, ou None s'il a été mis à jour
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((filter_query, document, future))
+        
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        
+        return await future
+    
+    async def flush(self) -> Dict[str, Any]:
+        """
+        Envoie les opérations en attente en un seul bulk_write non ordonné
+        
+        Returns:
+            Dictionnaire {"upserted": [IDs insérés], "matched": nombre}
+        """
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return {"upserted": [], "matched": 0}
+            
+            # Un seul upsert par filtre : la dernière version l'emporte
+            grouped: Dict[tuple, List[int]] = {}
+            for position, (filter_query, _, _) in enumerate(batch):
+                key = tuple(sorted(filter_query.items()))
+                grouped.setdefault(key, []).append(position)
+            
+            positions = list(grouped.values())
+            operations = [
+                UpdateOne(batch[group[-1]][0], {"$set": batch[group[-1]][1]}, upsert=True)
+                for group in positions
+            ]
+            
+            upserted_ids: Dict[int, Any] = {}
+            failed: Dict[int, Exception] = {}
+            
+            try:
+                result = await asyncio.to_thread(
+                    self.collection.bulk_write, operations, ordered=False
+                )
+                upserted_ids = result.upserted_ids or {}
+                matched = result.matched_count
+            
+            except BulkWriteError as e:
+                details = e.details or {}
+                upserted_ids = {
+                    item["index"]: item["_id"] for item in details.get("upserted", [])
+                }
+                matched = details.get("nMatched", 0)
+                for error in details.get("writeErrors", []):
+                    failed[error["index"]] = RuntimeError(error.get("errmsg", "Erreur d'écriture"))
+            
+            except Exception as e:
+                logger.error(f"Erreur écriture groupée: {e}")
+                failed = {index: e for index in range(len(operations))}
+                matched = 0
+            
+            self.stats["batches"] += 1
+            self.stats["upserted"] += len(upserted_ids)
+            self.stats["matched"] += matched
+            self.stats["errors"] += len(failed)
+            
+            if self.on_flush and len(failed) < len(operations):
+                await asyncio.to_thread(self.on_flush)
+            
+            for index, group in enumerate(positions):
+                for position in group:
+                    future = batch[position][2]
+                    if future.done():
+                        continue
+                    if index in failed:
+                        future.set_exception(failed[index])
+                    else:
+                        upserted_id = upserted_ids.get(index)
+                        future.set_result(str(upserted_id) if upserted_id else None)
+            
+            logger.debug(
+                f"Lot envoyé: {len(operations)} opération(s), "
+                f"{len(upserted_ids)} insertion(s), {matched} mise(s) à jour"
+            )
+            
+            return {
+                "upserted": [str(_id) for _id in upserted_ids.values()],
+                "matched": matched
+            }
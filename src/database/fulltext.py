@@ -0,0 +1,199 @@
+"""
+Recherche plein texte dans les textes OCR des candidatures
+
+Deux moteurs sont disponibles (FULLTEXT_BACKEND) :
+- "text" : index $text de MongoDB, classement par textScore
+- "inverted" : index inversé maintenu par l'application dans une
+  collection dédiée, pour les déploiements Cosmos DB sans $text
+"""
+import html
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+
+# Champs OCR indexés
+DOCUMENT_FIELDS = ("cv", "cover_letter", "diplome", "certificats")
+
+# Mots vides français/anglais ignorés à l'indexation et à la recherche
+STOPWORDS = frozenset("""
+    au aux avec ce ces dans de des du elle en et eux il je la le les leur lui
+    ma mais me meme mes moi mon ne nos notre nous on ou par pas pour qu que qui
+    sa se ses son sur ta te tes toi ton tu un une vos votre vous est sont ete
+    a an and are as at be by for from in is it of on or the to with
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Largeur du contexte autour d'un terme trouvé dans un extrait
+SNIPPET_CONTEXT = 60
+
+
+def fold_text(text: str) -> str:
+    """Met un texte en minuscules et supprime les accents"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Découpe un texte en termes indexables
+    
+    Args:
+        text: Texte brut (OCR ou requête)
+    
+    Returns:
+        Termes normalisés, hors mots vides et termes d'un caractère
+    """
+    if not text:
+        return []
+    return [
+        token for token in _TOKEN_PATTERN.findall(fold_text(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def iter_document_texts(documents: Optional[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """
+    Parcourt les textes OCR d'une candidature
+    
+    Accepte les listes de documents par type ({id, nom_fichier, texte})
+    comme l'ancien format à un texte par type.
+    
+    Args:
+        documents: Documents de la candidature, par type
+    
+    Yields:
+        Tuples (type du document, texte) pour les textes non vides
+    """
+    if not documents:
+        return
+    
+    for field in DOCUMENT_FIELDS:
+        entries = documents.get(field)
+        if isinstance(entries, str):
+            entries = [{"texte": entries}]
+        for entry in entries or []:
+            text = entry.get("texte") if isinstance(entry, dict) else None
+            if text:
+                yield field, text
+
+
+def build_postings(application_id: str, documents: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Construit les entrées de l'index inversé d'une candidature
+    
+    Args:
+        application_id: ID unique de l'application
+        documents: Documents OCR par type de document
+    
+    Returns:
+        Une entrée {term, application_id, tf} par terme distinct
+    """
+    counts = Counter()
+    for _, text in iter_document_texts(documents):
+        counts.update(tokenize(text))
+    
+    return [
+        {"term": term, "application_id": application_id, "tf": tf}
+        for term, tf in counts.items()
+    ]
+
+
+def rank_postings(
+    postings: Iterable[Dict[str, Any]],
+    total_documents: int,
+    limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Classe les candidatures par score TF-IDF
+    
+    Args:
+        postings: Entrées de l'index correspondant aux termes recherchés
+        total_documents: Nombre de candidatures indexées
+        limit: Nombre maximum de résultats
+    
+    Returns:
+        Liste [{application_id, score}] triée par score décroissant
+    """
+    by_term: Dict[str, List[Dict[str, Any]]] = {}
+    for posting in postings:
+        by_term.setdefault(posting["term"], []).append(posting)
+    
+    scores: Dict[str, float] = {}
+    for term_postings in by_term.values():
+        idf = math.log(1 + total_documents / len(term_postings))
+        for posting in term_postings:
+            tf_weight = 1 + math.log(posting["tf"])
+            scores[posting["application_id"]] = (
+                scores.get(posting["application_id"], 0.0) + tf_weight * idf
+            )
+    
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [
+        {"application_id": application_id, "score": round(score, 4)}
+        for application_id, score in ranked
+    ]
+
+
+def make_snippets(
+    documents: Optional[Dict[str, Any]],
+    terms: List[str],
+    max_snippets: int = 3
+) -> List[Dict[str, str]]:
+    """
+    Extrait des passages des documents où apparaissent les termes
+    
+    Les termes trouvés sont entourés de <mark>...</mark> ; le texte OCR,
+    issu de documents déposés par les candidats, est échappé (HTML).
+    
+    Args:
+        documents: Documents OCR par type de document
+        terms: Termes recherchés (déjà normalisés)
+        max_snippets: Nombre maximum d'extraits
+    
+    Returns:
+        Liste [{field, text}]
+    """
+    if not documents or not terms:
+        return []
+    
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, terms)) + r")")
+    snippets = []
+    
+    for field, text in iter_document_texts(documents):
+        # La recherche se fait sur le texte sans accents ; il garde les mêmes
+        # positions que l'original pour les caractères latins précomposés.
+        # Sinon (ligatures, accents décomposés), l'extrait est rendu sans accents.
+        folded = fold_text(text)
+        if len(folded) != len(text):
+            text = folded
+        
+        match = pattern.search(folded)
+        if not match:
+            continue
+        
+        start = max(0, match.start() - SNIPPET_CONTEXT)
+        end = min(len(text), match.end() + SNIPPET_CONTEXT)
+        excerpt = text[start:end]
+        folded_excerpt = folded[start:end]
+        
+        highlighted = []
+        cursor = 0
+        for found in pattern.finditer(folded_excerpt):
+            highlighted.append(html.escape(excerpt[cursor:found.start()]))
+            highlighted.append(f"<mark>{html.escape(excerpt[found.start():found.end()])}</mark>")
+            cursor = found.end()
+        highlighted.append(html.escape(excerpt[cursor:]))
+        
+        snippet = " ".join("".join(highlighted).split())
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        snippets.append({"field": field, "text": f"{prefix}{snippet}{suffix}"})
+        
+        if len(snippets) >= max_snippets:
+            break
+    
+    return snippets
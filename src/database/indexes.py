@@ -0,0 +1,176 @@
+"""
+Déclaration et gestion des index MongoDB / Cosmos DB
+"""
+from typing import List, Dict, Any, Optional
+from pymongo import ASCENDING, TEXT, IndexModel
+from src.config import settings
+from src.logger import app_logger as logger
+from src.database.fulltext import DOCUMENT_FIELDS
+
+
+# Index requis par le traitement et l'API, déclarés en un seul endroit.
+# Les noms suivent la convention par défaut de MongoDB pour rester
+# compatibles avec les index déjà créés par les versions précédentes.
+INDEX_SPECS: List[Dict[str, Any]] = [
+    {
+        # Clé des upserts, du mode incrémental et des contrôles de doublons
+        "keys": [("application_id", ASCENDING)],
+        "options": {"unique": True, "sparse": True}
+    },
+    {
+        # Recherche par préfixe prénom (+ nom) sur /candidatures/search
+        "keys": [("first_name_normalized", ASCENDING), ("last_name_normalized", ASCENDING)],
+        "options": {}
+    },
+    {
+        # Recherche par préfixe du nom seul
+        "keys": [("last_name_normalized", ASCENDING)],
+        "options": {}
+    },
+    {
+        # Upsert de repli sans application_id (prénom + nom)
+        "keys": [("first_name", ASCENDING), ("last_name", ASCENDING)],
+        "options": {}
+    }
+]
+
+# Index plein texte sur les textes OCR (FULLTEXT_BACKEND=text).
+# Non supporté par Cosmos DB (API MongoDB RU) : il n'est déclaré qu'avec
+# ce moteur, l'index inversé ayant sa propre collection.
+TEXT_INDEX_SPEC: Dict[str, Any] = {
+    "name": "documents_text",
+    "keys": [(f"documents.{field}.texte", TEXT) for field in DOCUMENT_FIELDS],
+    "options": {"default_language": "french"}
+}
+
+# Index de la collection de l'index inversé (FULLTEXT_BACKEND=inverted)
+FULLTEXT_INDEX_SPECS: List[Dict[str, Any]] = [
+    {
+        # Lecture des entrées d'un terme, une entrée par candidature
+        "keys": [("term", ASCENDING), ("application_id", ASCENDING)],
+        "options": {"unique": True}
+    },
+    {
+        # Remplacement des entrées d'une candidature ré-indexée
+        "keys": [("application_id", ASCENDING)],
+        "options": {}
+    }
+]
+
+# Options comparées entre index déclarés et index existants
+_COMPARED_OPTIONS = ("unique", "sparse")
+
+
+def index_name(keys: List[tuple]) -> str:
+    """Nom MongoDB par défaut d'un index (ex: first_name_1_last_name_1)"""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def spec_name(spec: Dict[str, Any]) -> str:
+    """Nom d'un index déclaré (nom explicite ou nom par défaut)"""
+    return spec.get("name") or index_name(spec["keys"])
+
+
+def declared_specs() -> List[Dict[str, Any]]:
+    """Index déclarés pour la collection des candidatures"""
+    if settings.fulltext_backend == "text":
+        return INDEX_SPECS + [TEXT_INDEX_SPEC]
+    return list(INDEX_SPECS)
+
+
+def index_models(specs: Optional[List[Dict[str, Any]]] = None) -> List[IndexModel]:
+    """
+    Construit les IndexModel des index déclarés
+    
+    La construction est demandée en arrière-plan pour ne pas bloquer les
+    écritures sur une collection déjà peuplée.
+    
+    Args:
+        specs: Index à construire (défaut: index des candidatures)
+    
+    Returns:
+        Liste d'IndexModel utilisable par create_indexes (pymongo ou motor)
+    """
+    return [
+        IndexModel(
+            spec["keys"],
+            name=spec_name(spec),
+            background=True,
+            **spec["options"]
+        )
+        for spec in (declared_specs() if specs is None else specs)
+    ]
+
+
+def ensure_indexes(collection, specs: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+    """
+    Crée les index déclarés de manière idempotente
+    
+    Les index existants avec la même définition sont ignorés par MongoDB.
+    
+    Args:
+        collection: Collection pymongo cible
+        specs: Index à créer (défaut: index des candidatures)
+    
+    Returns:
+        Noms des index déclarés
+    """
+    names = collection.create_indexes(index_models(specs))
+    logger.debug(f"Index MongoDB vérifiés: {', '.join(names)}")
+    return names
+
+
+def _same_keys(actual: Dict[str, Any], spec: Dict[str, Any]) -> bool:
+    """Compare les clés d'un index existant à sa déclaration"""
+    if any(direction == TEXT for _, direction in spec["keys"]):
+        # MongoDB stocke un index texte sous les clés _fts/_ftsx :
+        # les champs indexés figurent dans "weights"
+        fields = {field for field, _ in spec["keys"]}
+        return set(actual.get("weights", {})) == fields
+    return [tuple(key) for key in actual.get("key", [])] == list(spec["keys"])
+
+
+def diff_indexes(
+    collection,
+    specs: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, List[str]]:
+    """
+    Compare les index déclarés aux index réellement présents
+    
+    Args:
+        collection: Collection pymongo cible
+        specs: Index attendus (défaut: index des candidatures)
+    
+    Returns:
+        Dictionnaire avec les index "ok", "missing" (absents),
+        "mismatched" (définition différente) et "extra" (non déclarés)
+    """
+    existing = collection.index_information()
+    declared_names = set()
+    diff = {"ok": [], "missing": [], "mismatched": [], "extra": []}
+    
+    for spec in (declared_specs() if specs is None else specs):
+        name = spec_name(spec)
+        declared_names.add(name)
+        actual = existing.get(name)
+        
+        if actual is None:
+            diff["missing"].append(name)
+            continue
+        
+        same_keys = _same_keys(actual, spec)
+        same_options = all(
+            bool(actual.get(option)) == bool(spec["options"].get(option))
+            for option in _COMPARED_OPTIONS
+        )
+        
+        if same_keys and same_options:
+            diff["ok"].append(name)
+        else:
+            diff["mismatched"].append(name)
+    
+    diff["extra"] = sorted(
+        name for name in existing if name not in declared_names and name != "_id_"
+    )
+    
+    return diff
@@ -1,12 +1,54 @@
 """
 Client MongoDB pour la gestion des candidatures
 """
-from typing import List, Optional, Dict, Any
-from pymongo import MongoClient, ASCENDING
+import re
+import threading
+import unicodedata
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from bson import ObjectId
+from pymongo import MongoClient, ASCENDING, ReturnDocument, UpdateOne
 from pymongo.errors import DuplicateKeyError, PyMongoError
 from src.config import settings
 from src.logger import app_logger as logger
-from src.models import Candidature
+from src.models import Candidature, Offre
+from src.database.bulk_writer import CandidatureBulkWriter
+from src.database.indexes import ensure_indexes, FULLTEXT_INDEX_SPECS
+from src.database.fulltext import build_postings
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Normalise un nom pour la recherche
+    
+    Minuscules, accents supprimés et espaces superflus retirés :
+    "Teddy Osée " devient "teddy osee".
+    
+    Args:
+        name: Nom ou prénom brut
+        
+    Returns:
+        Nom normalisé (chaîne vide si absent)
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.lower().split())
+
+
+def build_connection_string() -> str:
+    """Construit la chaîne de connexion MongoDB depuis la configuration"""
+    connection_string = settings.mongodb_connection_string
+    
+    # Si username/password fournis (pour Cosmos DB), les injecter
+    if settings.mongodb_username and settings.mongodb_password:
+        connection_string = connection_string.replace(
+            "<user>", settings.mongodb_username
+        ).replace(
+            "<password>", settings.mongodb_password
+        )
+    
+    return connection_string
 
 
 class MongoDBClient:
@@ -16,29 +58,36 @@ class MongoDBClient:
         self.client = None
         self.database = None
         self.collection = None
+        self.terms = None
+        self.meta = None
+        self.offres = None
     
-    def connect(self):
-        """Établit la connexion à MongoDB"""
+    def connect(self, connection_string: Optional[str] = None, database: Optional[str] = None):
+        """
+        Établit la connexion à MongoDB
+        
+        Toutes les collections (candidatures, offres, index plein texte,
+        versions) sont ouvertes sur la même base.
+        
+        Args:
+            connection_string: Chaîne de connexion (configuration si None)
+            database: Nom de la base (MONGODB_DATABASE si None)
+        """
         try:
-            # Construction de la chaîne de connexion
-            connection_string = settings.mongodb_connection_string
-            
-            # Si username/password fournis (pour Cosmos DB), les injecter
-            if settings.mongodb_username and settings.mongodb_password:
-                connection_string = connection_string.replace(
-                    "<user>", settings.mongodb_username
-                ).replace(
-                    "<password>", settings.mongodb_password
-                )
+            connection_string = connection_string or build_connection_string()
+            database = database or settings.mongodb_database
             
-            logger.info(f"Connexion à MongoDB: {settings.mongodb_database}")
+            logger.info(f"Connexion à MongoDB: {database}")
             
             self.client = MongoClient(connection_string)
-            self.database = self.client[settings.mongodb_database]
+            self.database = self.client[database]
             self.collection = self.database[settings.mongodb_collection]
+            self.terms = self.database[settings.fulltext_collection]
+            self.meta = self.database[settings.mongodb_meta_collection]
+            self.offres = self.database[settings.mongodb_offres_collection]
             
-            # Création d'index pour optimiser les recherches
-            self._create_indexes()
+            # Création d'index pour optimiser les recherches (en arrière-plan)
+            self._create_indexes_in_background()
             
             # Test de connexion
             self.client.admin.command('ping')
@@ -49,85 +98,319 @@ class MongoDBClient:
             raise
     
     def _create_indexes(self):
-        """Crée les index nécessaires"""
+        """Crée les index déclarés dans src.database.indexes"""
         try:
-            # Index sur first_name et last_name pour les recherches
-            self.collection.create_index([("first_name", ASCENDING)])
-            self.collection.create_index([("last_name", ASCENDING)])
-            
-            # Index composé pour les recherches combinées
-            self.collection.create_index([
-                ("first_name", ASCENDING),
-                ("last_name", ASCENDING)
-            ])
-            
+            ensure_indexes(self.collection)
+            if settings.fulltext_backend == "inverted":
+                ensure_indexes(self.terms, FULLTEXT_INDEX_SPECS)
             logger.debug("Index MongoDB créés")
         except Exception as e:
             logger.warning(f"Erreur création d'index: {e}")
     
-    def insert_or_update_candidature(self, candidature: Candidature, application_id: str = None) -> str:
+    def _create_indexes_in_background(self):
+        """Lance la création des index sans bloquer le démarrage"""
+        thread = threading.Thread(
+            target=self._create_indexes,
+            name="mongodb-indexes",
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    @staticmethod
+    def build_candidature_upsert(
+        candidature: Candidature,
+        application_id: str = None,
+        extra_fields: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Prépare le filtre et le document d'un upsert de candidature
+        
+        Args:
+            candidature: Objet Candidature à écrire
+            application_id: ID unique de l'application (depuis JSON)
+            extra_fields: Champs techniques supplémentaires à stocker
+            
+        Returns:
+            Tuple (filtre, champs à écrire)
+        """
+        # Conversion en dict
+        candidature_dict = candidature.model_dump(
+            exclude_none=False,
+            by_alias=True
+        )
+        
+        # Supprimer le champ _id s'il est None
+        if "_id" in candidature_dict and candidature_dict["_id"] is None:
+            del candidature_dict["_id"]
+        
+        if extra_fields:
+            candidature_dict.update(extra_fields)
+        
+        # Utilisation de l'application_id comme clé unique si fourni
+        if application_id:
+            filter_query = {"application_id": application_id}
+            candidature_dict["application_id"] = application_id
+        else:
+            # Fallback: utiliser first_name + last_name
+            filter_query = {
+                "first_name": candidature.first_name,
+                "last_name": candidature.last_name
+            }
+        
+        # Noms normalisés pour la recherche par préfixe indexée
+        candidature_dict["first_name_normalized"] = normalize_name(candidature.first_name)
+        candidature_dict["last_name_normalized"] = normalize_name(candidature.last_name)
+        
+        return filter_query, candidature_dict
+    
+    @staticmethod
+    def offre_summary(offre: Offre) -> Dict[str, Any]:
+        """
+        Résumé de l'offre conservé dans la candidature
+        
+        L'offre complète (description HTML, questions MTP...) est stockée une
+        seule fois dans la collection des offres. date_publication reste
+        dans la candidature car elle provient de la date de candidature.
+        
+        Args:
+            offre: Offre complète
+        
+        Returns:
+            Champs de l'offre conservés dans la candidature
+        """
+        return {
+            "intitule": offre.intitule,
+            "reference": offre.reference,
+            "date_publication": offre.date_publication
+        }
+    
+    def upsert_offre(self, offre_id: str, offre: Offre):
+        """
+        Enregistre une offre dans la collection des offres (clé: job_id)
+        
+        Args:
+            offre_id: Identifiant de l'offre (job_id)
+            offre: Offre complète
+        """
+        self.offres.update_one(
+            {"_id": offre_id},
+            {"$set": offre.model_dump(exclude={"date_publication"})},
+            upsert=True
+        )
+    
+    def extract_embedded_offres(self) -> int:
+        """
+        Déplace les offres complètes des candidatures existantes vers la
+        collection des offres et ne garde qu'un résumé et une référence
+        
+        Returns:
+            Nombre de candidatures mises à jour
+        """
+        operations = []
+        stored = set()
+        cursor = self.collection.find(
+            {"offre_id": {"$exists": False}, "offre.reference": {"$nin": [None, ""]}},
+            {"offre": 1}
+        )
+        
+        for candidature in cursor:
+            offre = Offre(**candidature["offre"])
+            if offre.reference not in stored:
+                self.upsert_offre(offre.reference, offre)
+                stored.add(offre.reference)
+            
+            operations.append(UpdateOne(
+                {"_id": candidature["_id"]},
+                {"$set": {
+                    "offre_id": offre.reference,
+                    "offre": self.offre_summary(offre)
+                }}
+            ))
+        
+        if not operations:
+            return 0
+        
+        result = self.collection.bulk_write(operations, ordered=False)
+        self.bump_collection_version()
+        logger.info(
+            f"✓ {len(stored)} offres extraites de {result.modified_count} candidatures"
+        )
+        return result.modified_count
+    
+    def create_bulk_writer(self) -> CandidatureBulkWriter:
+        """
+        Crée un writer groupé sur la collection courante
+        
+        Returns:
+            Writer configuré avec la taille de lot et l'intervalle d'envoi
+        """
+        return CandidatureBulkWriter(
+            self.collection,
+            batch_size=settings.mongodb_write_batch_size,
+            flush_interval=settings.mongodb_write_flush_interval,
+            on_flush=self.bump_collection_version
+        )
+    
+    def bump_collection_version(self):
+        """
+        Incrémente le compteur de version des candidatures
+        
+        L'API s'en sert pour invalider son cache de réponses.
+        """
+        if self.meta is None:
+            return
+        try:
+            self.meta.update_one(
+                {"_id": settings.mongodb_collection},
+                {"$inc": {"version": 1}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Incrémentation de la version impossible: {e}")
+    
+    def insert_or_update_candidature(
+        self,
+        candidature: Candidature,
+        application_id: str = None,
+        extra_fields: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Insère ou met à jour une candidature (upsert pour idempotence)
         
         Args:
             candidature: Objet Candidature à insérer/mettre à jour
             application_id: ID unique de l'application (depuis JSON)
+            extra_fields: Champs techniques supplémentaires à stocker
             
         Returns:
             ID de la candidature
         """
         try:
-            # Conversion en dict
-            candidature_dict = candidature.model_dump(
-                exclude_none=False,
-                by_alias=True
+            filter_query, candidature_dict = self.build_candidature_upsert(
+                candidature,
+                application_id=application_id,
+                extra_fields=extra_fields
             )
             
-            # Supprimer le champ _id s'il est None
-            if "_id" in candidature_dict and candidature_dict["_id"] is None:
-                del candidature_dict["_id"]
-            
-            # Utilisation de l'application_id comme clé unique si fourni
-            if application_id:
-                filter_query = {"application_id": application_id}
-                candidature_dict["application_id"] = application_id
-            else:
-                # Fallback: utiliser first_name + last_name
-                filter_query = {
-                    "first_name": candidature.first_name,
-                    "last_name": candidature.last_name
-                }
-            
-            # Upsert
-            result = self.collection.update_one(
+            # Upsert en un seul aller-retour : l'_id d'un nouveau document
+            # est généré côté client, celui d'un document existant est
+            # retourné par la projection
+            new_id = ObjectId()
+            existing = self.collection.find_one_and_update(
                 filter_query,
-                {"$set": candidature_dict},
-                upsert=True
+                {
+                    "$set": candidature_dict,
+                    "$setOnInsert": {"_id": new_id}
+                },
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
             )
+            self.bump_collection_version()
             
-            if result.upserted_id:
+            if existing is None:
                 logger.info(
                     f"✓ Nouvelle candidature insérée: "
                     f"{candidature.first_name} {candidature.last_name}"
                 )
-                return str(result.upserted_id)
+                return str(new_id)
             else:
                 logger.info(
                     f"✓ Candidature mise à jour: "
                     f"{candidature.first_name} {candidature.last_name}"
                 )
-                # Récupérer l'ID existant
-                existing = self.collection.find_one(filter_query)
-                return str(existing["_id"]) if existing else None
+                return str(existing["_id"])
                 
         except Exception as e:
             logger.error(f"Erreur insertion/mise à jour candidature: {e}")
             raise
     
-    def get_all_candidatures(self) -> List[Dict[str, Any]]:
-        """Récupère toutes les candidatures"""
+    def get_documents_state(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère les textes OCR et métadonnées stockés pour une candidature
+        
+        Args:
+            application_id: ID unique de l'application
+            
+        Returns:
+            Dictionnaire {documents, documents_meta} ou None si inconnue
+        """
+        try:
+            return self.collection.find_one(
+                {"application_id": application_id},
+                {"_id": 0, "documents": 1, "documents_meta": 1}
+            )
+            
+        except Exception as e:
+            logger.error(f"Erreur lecture état des documents: {e}")
+            raise
+    
+    @staticmethod
+    def build_projection(fields: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+        """
+        Construit une projection MongoDB depuis une liste de champs
+        
+        Args:
+            fields: Champs à inclure (ex: "first_name", "offre.intitule")
+                ou à exclure s'ils sont préfixés par "-" (ex: "-documents")
+            
+        Returns:
+            Projection MongoDB, ou None pour retourner tous les champs
+            
+        Raises:
+            ValueError: Si inclusions et exclusions sont mélangées, ou si _id
+                (curseur de pagination) est exclu
+        """
+        if not fields:
+            return None
+        
+        excluded = [field[1:] for field in fields if field.startswith("-")]
+        included = [field for field in fields if not field.startswith("-")]
+        
+        if excluded and included:
+            raise ValueError("Impossible de mélanger champs inclus et exclus")
+        if "_id" in excluded:
+            raise ValueError("Le champ _id ne peut pas être exclu (curseur de pagination)")
+        
+        if excluded:
+            return {field: 0 for field in excluded}
+        return {field: 1 for field in included}
+    
+    def get_all_candidatures(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère les candidatures, page par page si limit est fourni
+        
+        La pagination est par curseur sur _id (keyset) : la page suivante
+        commence après le dernier _id de la page courante.
+        
+        Args:
+            limit: Nombre maximum de candidatures (toutes si None)
+            after: _id de la dernière candidature de la page précédente
+            fields: Projection (voir build_projection)
+            
+        Returns:
+            Liste des candidatures triées par _id
+        """
         try:
-            candidatures = list(self.collection.find({}))
+            query = {}
+            if after:
+                query["_id"] = {"$gt": ObjectId(after)}
+            
+            cursor = self.collection.find(
+                query,
+                self.build_projection(fields)
+            ).sort("_id", ASCENDING)
+            
+            if limit:
+                cursor = cursor.limit(limit)
+            
+            candidatures = list(cursor)
             
             # Conversion des ObjectId en string
             for candidature in candidatures:
@@ -140,6 +423,64 @@ class MongoDBClient:
             logger.error(f"Erreur récupération candidatures: {e}")
             raise
     
+    def iter_candidatures(
+        self,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt toutes les candidatures depuis un curseur, sans les charger
+        
+        Args:
+            fields: Projection (voir build_projection)
+            batch_size: Nombre de documents récupérés par aller-retour
+            
+        Yields:
+            Candidatures triées par _id
+        """
+        cursor = self.collection.find(
+            {},
+            self.build_projection(fields),
+            batch_size=batch_size
+        ).sort("_id", ASCENDING)
+        
+        try:
+            for candidature in cursor:
+                candidature["_id"] = str(candidature["_id"])
+                yield candidature
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def build_search_query(
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Construit le filtre de recherche par nom/prénom
+        
+        Args:
+            first_name: Prénom à rechercher (optionnel)
+            last_name: Nom à rechercher (optionnel)
+            
+        Returns:
+            Filtre MongoDB
+        """
+        query = {}
+        first_name = normalize_name(first_name)
+        last_name = normalize_name(last_name)
+        
+        # Recherche par préfixe ancré sur les noms normalisés : insensible
+        # à la casse et aux accents, et résolue par l'index. Un nom vide
+        # après normalisation (espaces seuls) n'est pas un critère.
+        if first_name:
+            query["first_name_normalized"] = {"$regex": "^" + re.escape(first_name)}
+        
+        if last_name:
+            query["last_name_normalized"] = {"$regex": "^" + re.escape(last_name)}
+        
+        return query
+    
     def search_candidatures(
         self,
         first_name: Optional[str] = None,
@@ -156,14 +497,7 @@ class MongoDBClient:
             Liste des candidatures correspondantes
         """
         try:
-            query = {}
-            
-            if first_name:
-                # Recherche insensible à la casse
-                query["first_name"] = {"$regex": first_name, "$options": "i"}
-            
-            if last_name:
-                query["last_name"] = {"$regex": last_name, "$options": "i"}
+            query = self.build_search_query(first_name, last_name)
             
             candidatures = list(self.collection.find(query))
             
@@ -181,6 +515,86 @@ class MongoDBClient:
             logger.error(f"Erreur recherche candidatures: {e}")
             raise
     
+    def backfill_normalized_names(self) -> int:
+        """
+        Renseigne les noms normalisés des candidatures enregistrées avant
+        leur introduction
+        
+        Returns:
+            Nombre de candidatures mises à jour
+        """
+        operations = []
+        cursor = self.collection.find(
+            {"first_name_normalized": {"$exists": False}},
+            {"first_name": 1, "last_name": 1}
+        )
+        
+        for candidature in cursor:
+            operations.append(UpdateOne(
+                {"_id": candidature["_id"]},
+                {"$set": {
+                    "first_name_normalized": normalize_name(candidature.get("first_name")),
+                    "last_name_normalized": normalize_name(candidature.get("last_name"))
+                }}
+            ))
+        
+        if not operations:
+            return 0
+        
+        result = self.collection.bulk_write(operations, ordered=False)
+        self.bump_collection_version()
+        logger.info(f"✓ Noms normalisés renseignés pour {result.modified_count} candidatures")
+        return result.modified_count
+    
+    def index_candidature_text(
+        self,
+        application_id: str,
+        documents: Dict[str, Any]
+    ) -> int:
+        """
+        Met à jour l'index inversé plein texte d'une candidature
+        
+        Les entrées précédentes de la candidature sont remplacées.
+        Utilisé uniquement avec FULLTEXT_BACKEND=inverted.
+        
+        Args:
+            application_id: ID unique de l'application
+            documents: Documents OCR par type de document
+        
+        Returns:
+            Nombre de termes indexés
+        """
+        postings = build_postings(application_id, documents)
+        
+        self.terms.delete_many({"application_id": application_id})
+        if postings:
+            self.terms.insert_many(postings, ordered=False)
+        
+        return len(postings)
+    
+    def rebuild_fulltext_index(self) -> int:
+        """
+        Reconstruit l'index inversé à partir des candidatures enregistrées
+        
+        Returns:
+            Nombre de candidatures indexées
+        """
+        indexed = 0
+        cursor = self.collection.find(
+            {"application_id": {"$exists": True}},
+            {"application_id": 1, "documents": 1}
+        )
+        
+        for candidature in cursor:
+            self.index_candidature_text(
+                candidature["application_id"],
+                candidature.get("documents") or {}
+            )
+            indexed += 1
+        
+        logger.info(f"✓ Index plein texte reconstruit pour {indexed} candidatures")
+        return indexed
+    
     def close(self):
         """Ferme la connexion MongoDB"""
         if self.client:
@@ -1,8 +1,8 @@
 """
 Modèles Pydantic pour la validation des données
 """
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
 from datetime import date
 
 
@@ -41,12 +41,29 @@ class Offre(BaseModel):
     autres_informations: Optional[str] = None
 
 
+class Document(BaseModel):
+    """Document déposé par le candidat et son texte extrait par OCR"""
+    id: Optional[str] = None
+    nom_fichier: Optional[str] = None
+    texte: Optional[str] = None
+
+
 class Documents(BaseModel):
-    """Documents extraits par OCR"""
-    cv: Optional[str] = None
-    cover_letter: Optional[str] = None
-    diplome: Optional[str] = None
-    certificats: Optional[str] = None
+    """Documents extraits par OCR, plusieurs par type (ex: deux diplômes)"""
+    cv: List[Document] = Field(default_factory=list)
+    cover_letter: List[Document] = Field(default_factory=list)
+    diplome: List[Document] = Field(default_factory=list)
+    certificats: List[Document] = Field(default_factory=list)
+    
+    @field_validator("cv", "cover_letter", "diplome", "certificats", mode="before")
+    @classmethod
+    def _from_single_text(cls, value):
+        """Candidatures enregistrées avec un seul texte par type"""
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [{"texte": value}]
+        return value
 
 
 class Candidature(BaseModel):
@@ -73,9 +90,46 @@ class Candidature(BaseModel):
                     "categorie": "Technique"
                 },
                 "documents": {
-                    "cv": "Texte extrait du CV...",
-                    "cover_letter": "Texte de la lettre..."
+                    "cv": [
+                        {
+                            "id": "a784af73",
+                            "nom_fichier": "CV.pdf",
+                            "texte": "Texte extrait du CV..."
+                        }
+                    ],
+                    "diplome": [
+                        {"id": "65c93a22", "nom_fichier": "BAC.pdf", "texte": "Texte du BAC..."},
+                        {
+                            "id": "746fa838",
+                            "nom_fichier": "Bachelor.pdf",
+                            "texte": "Texte du Bachelor..."
+                        }
+                    ]
                 }
             }
         }
 
+
+class FulltextSnippet(BaseModel):
+    """Extrait d'un document contenant les termes recherchés"""
+    field: str
+    text: str
+
+
+class CandidaturePage(BaseModel):
+    """Page de candidatures et curseur de la page suivante (None en fin de liste)"""
+    items: List[Candidature] = Field(default_factory=list)
+    next: Optional[str] = None
+
+
+class FulltextResult(BaseModel):
+    """Résultat de recherche plein texte (sans le contenu des documents)"""
+    candidat_id: str = Field(alias="_id")
+    application_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    score: float
+    snippets: List[FulltextSnippet] = Field(default_factory=list)
+    
+    class Config:
+        populate_by_name = True
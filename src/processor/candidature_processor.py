@@ -1,16 +1,18 @@
 """
 Processeur principal pour le traitement des candidatures
 """
-import json
+import time
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 from src.config import settings
 from src.logger import app_logger as logger
 from src.models import Candidature, Offre, ReponsesMTP, Documents, QuestionsMTP
-from src.database.mongodb_client import mongodb_client
+from src.database.mongodb_client import mongodb_client, MongoDBClient
 from src.services.supabase_client import supabase_client
-from src.services.azure_ocr import azure_ocr_service
+from src.services.azure_ocr import azure_ocr_service, OCRTransientError
+from src.processor.candidature_reader import iter_candidatures
+from src.processor.job_queue import JobQueue, DOWNLOADED, OCR_DONE, STORED, FAILED
 
 
 class CandidatureProcessor:
@@ -19,11 +21,34 @@ class CandidatureProcessor:
     def __init__(self):
         self.data_folder = Path(settings.data_folder)
         self.temp_folder = Path(settings.temp_folder)
-        self.temp_folder.mkdir(parents=True, exist_ok=True)
+        if not settings.ocr_in_memory:
+            self.temp_folder.mkdir(parents=True, exist_ok=True)
+        self.bulk_writer = None
+        self.job_queue: Optional[JobQueue] = None
+        self._stored_offres = set()
+        
+        # Mode multi-processus : part (index, nombre de parts) de la file de
+        # travail traitée par ce processus, et suivi des compteurs après
+        # chaque candidature
+        self.shard: Optional[Tuple[int, int]] = None
+        self.on_progress: Optional[Callable[[Dict[str, int]], None]] = None
     
-    async def process_all_candidatures(self):
+    async def process_all_candidatures(
+        self,
+        retry_failed: bool = False,
+        sync_queue: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Traite toutes les candidatures du dossier data
+        
+        Args:
+            retry_failed: Ne reprendre que les candidatures en échec dans
+                la file de travail
+            sync_queue: Alimenter la file de travail depuis l'export (déjà
+                fait par le processus parent en mode multi-processus)
+        
+        Returns:
+            Statistiques du traitement, ou None si l'export est absent ou invalide
         """
         logger.info("=" * 80)
         logger.info("DÉMARRAGE DU TRAITEMENT DES CANDIDATURES")
@@ -32,40 +57,143 @@ class CandidatureProcessor:
         # Connexion aux services
         await self._connect_services()
         
-        # Récupération du fichier JSON principal
-        json_file = self.data_folder / "Donnees_candidatures_SEEG.json"
+        try:
+            return await self._process_json_file(
+                self.data_folder / "Donnees_candidatures_SEEG.json",
+                retry_failed=retry_failed,
+                sync_queue=sync_queue
+            )
+        finally:
+            await self._close_services()
+    
+    async def _process_json_file(
+        self,
+        json_file: Path,
+        retry_failed: bool = False,
+        sync_queue: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Lit le fichier d'export en flux et traite les candidatures au fil de l'eau
+        
+        Avec la file de travail (JOB_QUEUE_ENABLED), l'export alimente d'abord
+        la file, puis seules les candidatures non enregistrées sont traitées :
+        une exécution interrompue reprend là où elle s'est arrêtée.
         
+        Args:
+            json_file: Chemin du fichier JSON (tableau) ou JSONL des candidatures
+            retry_failed: Ne reprendre que les candidatures en échec
+            sync_queue: Alimenter la file de travail depuis l'export
+        
+        Returns:
+            Statistiques du traitement, ou None si l'export est absent ou invalide
+        """
         if not json_file.exists():
             logger.warning(f"Fichier {json_file} non trouvé")
-            return
+            return None
         
-        # Lecture du fichier JSON (c'est un tableau)
-        with open(json_file, 'r', encoding='utf-8') as f:
-            candidats_data = json.load(f)
+        logger.info(f"📁 Lecture en flux du fichier {json_file.name}")
         
-        if not isinstance(candidats_data, list):
-            logger.error("Le fichier JSON doit contenir un tableau de candidats")
-            return
+        try:
+            if not settings.job_queue_enabled:
+                if self.shard is not None:
+                    logger.error("❌ Le mode multi-processus nécessite la file de travail")
+                    return None
+                return await self._process_candidates(iter_candidatures(json_file))
+            
+            self.job_queue = JobQueue(Path(settings.job_queue_path))
+            try:
+                if sync_queue:
+                    self.job_queue.sync(iter_candidatures(json_file))
+                summary = await self._process_candidates(
+                    self.job_queue.iter_candidates(retry_failed=retry_failed, shard=self.shard)
+                )
+                counts = self.job_queue.get_counts()["candidates"]
+                logger.info(
+                    f"🗂️ File de travail: {counts[STORED]} enregistrées, "
+                    f"{counts[FAILED]} en échec (--retry-failed pour les reprendre)"
+                )
+                return summary
+            finally:
+                self.job_queue.close()
+                self.job_queue = None
+        
+        except ValueError as e:
+            logger.error(f"Fichier d'export invalide: {e}")
+            return None
+    
+    async def _process_candidates(
+        self,
+        candidats_data: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Traite des candidatures avec une concurrence bornée
         
-        logger.info(f"📁 {len(candidats_data)} candidatures trouvées dans le fichier")
+        Les candidatures sont consommées au fur et à mesure : un nouveau
+        candidat n'est lu que lorsqu'une place se libère dans le pool.
+        
+        Args:
+            candidats_data: Itérable des données JSON des candidats
+            
+        Returns:
+            Statistiques du traitement (succès, échecs, débit)
+        """
+        concurrency = max(1, settings.max_concurrent_candidates)
+        semaphore = asyncio.Semaphore(concurrency)
+        counts = {"processed": 0, "failed": 0}
+        tasks = set()
         
-        # Traitement de chaque candidature
-        processed_count = 0
-        failed_count = 0
+        logger.info(f"⚙️ Traitement avec {concurrency} candidature(s) en parallèle")
         
-        for idx, candidate_data in enumerate(candidats_data, 1):
+        async def worker(idx: int, candidate_data: Dict[str, Any]):
             try:
                 logger.info(f"\n{'=' * 80}")
-                logger.info(f"Traitement candidat {idx}/{len(candidats_data)}")
+                logger.info(f"Traitement candidat {idx}")
                 logger.info(f"{'=' * 80}")
-                
+                    
                 await self.process_single_candidature_from_data(candidate_data)
-                processed_count += 1
+                if self._mark_candidate(candidate_data, STORED) == FAILED:
+                    logger.warning(
+                        f"⚠️ Candidat {idx} enregistré avec des documents en échec "
+                        "(--retry-failed pour les reprendre)"
+                    )
+                    counts["failed"] += 1
+                else:
+                    counts["processed"] += 1
                 
             except Exception as e:
                 logger.error(f"❌ Erreur traitement candidat {idx}: {e}")
                 logger.exception(e)
-                failed_count += 1
+                counts["failed"] += 1
+                self._mark_candidate(candidate_data, FAILED, error=str(e) or type(e).__name__)
+            finally:
+                semaphore.release()
+                if self.on_progress:
+                    self.on_progress(dict(counts))
+        
+        start_time = time.perf_counter()
+        total = 0
+        
+        # Les sauvegardes des workers sont regroupées en bulk_write
+        self.bulk_writer = mongodb_client.create_bulk_writer()
+        self.bulk_writer.start()
+        
+        try:
+            for idx, candidate_data in enumerate(candidats_data, 1):
+                await semaphore.acquire()
+                total = idx
+                task = asyncio.create_task(worker(idx, candidate_data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            # Attente des candidatures en cours, même si la lecture échoue
+            await asyncio.gather(*tasks)
+            await self.bulk_writer.close()
+            self.bulk_writer = None
+        
+        elapsed = time.perf_counter() - start_time
+        processed_count = counts["processed"]
+        failed_count = counts["failed"]
+        throughput = total / elapsed if elapsed > 0 else 0.0
         
         # Résumé
         logger.info("\n" + "=" * 80)
@@ -74,7 +202,31 @@ class CandidatureProcessor:
         logger.info(f"✓ Candidatures traitées avec succès: {processed_count}")
         if failed_count > 0:
             logger.warning(f"❌ Candidatures en erreur: {failed_count}")
+        logger.info(f"⏱️ Durée totale: {elapsed:.1f}s ({throughput:.2f} candidatures/s)")
+        cache_stats = azure_ocr_service.get_cache_stats()
+        logger.info(
+            f"🗃️ Cache OCR: {cache_stats['hits']} succès, "
+            f"{cache_stats['misses']} échecs"
+        )
+        rate_stats = azure_ocr_service.get_rate_limit_stats()
+        if rate_stats:
+            logger.info(
+                f"🚦 Débit OCR: {rate_stats['acquired']} appels, "
+                f"{rate_stats['throttled']} limités (429), "
+                f"{rate_stats['waited_seconds']}s d'attente, "
+                f"débit final {rate_stats['rate']} appels/s"
+            )
         logger.info("=" * 80)
+        
+        return {
+            "total": total,
+            "processed": processed_count,
+            "failed": failed_count,
+            "elapsed_seconds": elapsed,
+            "throughput": throughput,
+            "ocr_cache": cache_stats,
+            "ocr_rate_limit": rate_stats
+        }
     
     async def _connect_services(self):
         """Initialise les connexions aux services"""
@@ -91,6 +243,11 @@ class CandidatureProcessor:
         
         logger.success("✓ Tous les services sont connectés")
     
+    async def _close_services(self):
+        """Libère les ressources des services externes"""
+        await supabase_client.close()
+        await azure_ocr_service.close()
+    
     async def process_single_candidature_from_data(self, candidate_data: Dict[str, Any]):
         """
         Traite une candidature individuelle depuis les données JSON
@@ -110,35 +267,190 @@ class CandidatureProcessor:
             f"👤 Candidat: {candidature.first_name} {candidature.last_name} (ID: {application_id})"
         )
         
-        # Récupération des URLs des documents
+        # Récupération des URLs des documents (plusieurs par type possibles)
         document_urls = supabase_client.get_document_urls_from_candidate(
             candidate_data
         )
         
-        if not document_urls:
+        documents_meta = supabase_client.get_document_metadata_from_candidate(
+            candidate_data
+        )
+        
+        # Mode incrémental: réutilisation des textes des documents inchangés
+        unchanged_documents = {}
+        if settings.incremental_processing and application_id:
+            unchanged_documents = await self._get_unchanged_documents(
+                application_id,
+                documents_meta
+            )
+        
+        # Reprise: textes déjà obtenus lors d'une exécution interrompue
+        job_key = candidate_data.get("_job_key") if self.job_queue else None
+        if job_key:
+            resumed = self.job_queue.get_document_texts(job_key)
+            if resumed:
+                logger.info(f"⏯️ {len(resumed)} documents repris de la file de travail")
+                unchanged_documents = {**resumed, **unchanged_documents}
+        
+        total_documents = sum(len(entries) for entries in document_urls.values())
+        if not total_documents:
             logger.warning("⚠️ Aucune URL de document trouvée")
         else:
-            logger.info(f"📎 {len(document_urls)} documents à traiter")
+            logger.info(
+                f"📎 {total_documents - len(unchanged_documents)} documents à traiter"
+            )
+            if unchanged_documents:
+                logger.info(
+                    f"♻️ {len(unchanged_documents)} documents inchangés (OCR réutilisé)"
+                )
         
         # Téléchargement et OCR des documents
         documents_text = await self._process_documents(
             document_urls,
             candidature.first_name,
-            candidature.last_name
+            candidature.last_name,
+            known_texts=unchanged_documents,
+            job_key=job_key
         )
+        if job_key:
+            self.job_queue.mark_candidate(job_key, OCR_DONE)
         
         # Mise à jour de la candidature avec les textes extraits
         candidature.documents = Documents(**documents_text)
         
         # Sauvegarde dans MongoDB avec l'application_id comme clé unique
-        candidat_id = mongodb_client.insert_or_update_candidature(
-            candidature,
-            application_id=application_id
-        )
+        extra_fields = {"documents_meta": documents_meta}
+        
+        # Offre stockée une seule fois, la candidature n'en garde qu'un résumé
+        offre_id = candidate_data.get("job_id")
+        if settings.deduplicate_offres and offre_id:
+            await self._store_offre(offre_id, candidature.offre)
+            extra_fields["offre_id"] = offre_id
+            extra_fields["offre"] = MongoDBClient.offre_summary(candidature.offre)
+        
+        if self.bulk_writer:
+            filter_query, document = mongodb_client.build_candidature_upsert(
+                candidature,
+                application_id=application_id,
+                extra_fields=extra_fields
+            )
+            candidat_id = await self.bulk_writer.upsert(filter_query, document)
+        else:
+            candidat_id = mongodb_client.insert_or_update_candidature(
+                candidature,
+                application_id=application_id,
+                extra_fields=extra_fields
+            )
         
         logger.success(
-            f"💾 Candidature sauvegardée (ID: {candidat_id})"
+            f"💾 Candidature sauvegardée (ID: {candidat_id or application_id})"
         )
+        
+        # Index inversé plein texte (Cosmos DB sans $text)
+        if settings.fulltext_backend == "inverted" and application_id:
+            await asyncio.to_thread(
+                mongodb_client.index_candidature_text,
+                application_id,
+                documents_text
+            )
+    
+    async def _store_offre(self, offre_id: str, offre: Offre):
+        """
+        Enregistre une offre au plus une fois par exécution
+        
+        Args:
+            offre_id: Identifiant de l'offre (job_id)
+            offre: Offre complète construite depuis l'export
+        """
+        if offre_id in self._stored_offres:
+            return
+        
+        # Marquée avant l'écriture : les candidatures concurrentes de la même
+        # offre ne la réécrivent pas
+        self._stored_offres.add(offre_id)
+        try:
+            await asyncio.to_thread(mongodb_client.upsert_offre, offre_id, offre)
+            logger.info(f"📌 Offre enregistrée: {offre.intitule} ({offre_id})")
+        except Exception:
+            self._stored_offres.discard(offre_id)
+            raise
+    
+    def _mark_candidate(
+        self,
+        candidate_data: Dict[str, Any],
+        state: str,
+        error: Optional[str] = None
+    ) -> str:
+        """
+        Enregistre l'état d'une candidature dans la file de travail, si active
+        
+        Returns:
+            État enregistré (failed si un document est en échec)
+        """
+        job_key = candidate_data.get("_job_key")
+        if self.job_queue and job_key:
+            return self.job_queue.mark_candidate(job_key, state, error=error)
+        return state
+    
+    def _mark_document(
+        self,
+        job: Optional[Tuple[str, str]],
+        state: str,
+        texte: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """Enregistre l'état d'un document dans la file de travail, si active"""
+        if self.job_queue and job:
+            self.job_queue.mark_document(*job, state, texte=texte, error=error)
+    
+    async def _get_unchanged_documents(
+        self,
+        application_id: str,
+        documents_meta: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, str]:
+        """
+        Compare les métadonnées des documents à celles du dernier traitement
+        
+        Un document est considéré inchangé si son id, sa taille et sa date
+        d'upload sont identiques et qu'un texte OCR a déjà été stocké pour
+        cet id. Les candidatures enregistrées avec un seul texte par type
+        n'ont pas d'id par document : elles sont entièrement ré-analysées.
+        
+        Args:
+            application_id: ID unique de l'application
+            documents_meta: Métadonnées actuelles des documents
+            
+        Returns:
+            Textes déjà extraits des documents inchangés, par id de document
+        """
+        # Lecture pymongo synchrone : hors de la boucle d'événements
+        previous = await asyncio.to_thread(mongodb_client.get_documents_state, application_id)
+        if not previous:
+            return {}
+        
+        previous_meta = self._entries_by_id(previous.get("documents_meta"))
+        previous_texts = {
+            doc_id: entry.get("texte")
+            for doc_id, entry in self._entries_by_id(previous.get("documents")).items()
+        }
+        
+        return {
+            doc_id: previous_texts[doc_id]
+            for doc_id, meta in self._entries_by_id(documents_meta).items()
+            if previous_meta.get(doc_id) == meta and previous_texts.get(doc_id)
+        }
+    
+    @staticmethod
+    def _entries_by_id(by_type: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Indexe par id les entrées {id, ...} rangées en listes par type de document"""
+        entries = {}
+        for values in (by_type or {}).values():
+            if not isinstance(values, list):
+                continue
+            for entry in values:
+                if isinstance(entry, dict) and entry.get("id"):
+                    entries[entry["id"]] = entry
+        return entries
     
     def _build_candidature_from_json(
         self,
@@ -203,69 +515,214 @@ class CandidatureProcessor:
     
     async def _process_documents(
         self,
-        document_urls: Dict[str, str],
+        document_urls: Dict[str, List[Dict[str, Any]]],
         first_name: str,
-        last_name: str
-    ) -> Dict[str, str]:
+        last_name: str,
+        known_texts: Optional[Dict[str, str]] = None,
+        job_key: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Télécharge et extrait le texte de tous les documents
+        Télécharge et extrait le texte de tous les documents en parallèle
+        
+        Tous les documents du candidat, quel que soit leur type, sont traités
+        ensemble dans la limite de MAX_CONCURRENT_DOCUMENTS.
         
         Args:
-            document_urls: Dictionnaire des URLs des documents
+            document_urls: Documents {id, nom_fichier, url} par type
             first_name: Prénom du candidat
             last_name: Nom du candidat
-            
+            known_texts: Textes déjà extraits, par id de document (non ré-analysés)
+            job_key: Clé de la candidature dans la file de travail (suivi
+                de l'état de chaque document)
+        
         Returns:
-            Dictionnaire avec les textes extraits
+            Documents {id, nom_fichier, texte} par type, dans l'ordre de l'export
         """
+        known_texts = known_texts or {}
         documents_text = {
-            "cv": None,
-            "cover_letter": None,
-            "diplome": None,
-            "certificats": None
+            "cv": [],
+            "cover_letter": [],
+            "diplome": [],
+            "certificats": []
         }
         
-        # Traitement de chaque document
-        for doc_type, url in document_urls.items():
-            if not url:
-                continue
-            
-            try:
-                logger.info(f"📄 Traitement {doc_type}...")
-                
-                # Création du chemin de destination
-                safe_name = f"{first_name}_{last_name}".replace(" ", "_")
-                file_extension = Path(url).suffix or ".pdf"
-                destination = self.temp_folder / f"{safe_name}_{doc_type}{file_extension}"
-                
-                # Téléchargement du fichier
-                success = await supabase_client.download_file(url, destination)
-                
-                if not success:
-                    logger.warning(f"⚠️ Échec téléchargement {doc_type}")
-                    continue
-                
-                # Extraction OCR
-                extracted_text = azure_ocr_service.extract_text_from_file(
-                    destination
-                )
-                
-                if extracted_text:
-                    documents_text[doc_type] = extracted_text
-                    logger.success(
-                        f"✓ {doc_type}: {len(extracted_text)} caractères extraits"
+        semaphore = asyncio.Semaphore(max(1, settings.max_concurrent_documents))
+        
+        async def bounded(
+            doc_type: str,
+            url: str,
+            index: int,
+            document_id: Optional[str]
+        ) -> Optional[str]:
+            job = (job_key, document_id or f"{doc_type}-{index}") if job_key else None
+            async with semaphore:
+                try:
+                    extracted_text = await self._process_single_document(
+                        doc_type, url, first_name, last_name, index, job=job
                     )
-                else:
-                    logger.warning(f"⚠️ Aucun texte extrait de {doc_type}")
-                
-                # Nettoyage du fichier temporaire (optionnel)
-                # destination.unlink(missing_ok=True)
-                
-            except Exception as e:
-                logger.error(f"❌ Erreur traitement {doc_type}: {e}")
-                continue
+                except OCRTransientError as e:
+                    self._mark_document(job, FAILED, error=str(e))
+                    raise
+            
+            if extracted_text:
+                self._mark_document(job, OCR_DONE, texte=extracted_text)
+            else:
+                self._mark_document(job, FAILED, error="Aucun texte extrait")
+            return extracted_text
+        
+        # Entrées du résultat et traitements à lancer, dans l'ordre de l'export
+        pending = []
+        for doc_type, entries in document_urls.items():
+            for index, entry in enumerate(entries):
+                document = {
+                    "id": entry.get("id"),
+                    "nom_fichier": entry.get("nom_fichier"),
+                    "texte": known_texts.get(entry.get("id"))
+                }
+                documents_text.setdefault(doc_type, []).append(document)
+                if document["texte"] is None and entry.get("url"):
+                    pending.append((
+                        document,
+                        bounded(doc_type, entry["url"], index, entry.get("id"))
+                    ))
+        
+        # Traitement concurrent des documents du candidat. Tous les documents
+        # vont à leur terme (les textes obtenus restent dans le cache OCR)
+        # avant qu'une erreur transitoire ne fasse échouer la candidature.
+        results = await asyncio.gather(
+            *(task for _, task in pending),
+            return_exceptions=True
+        )
+        
+        for (document, _), extracted_text in zip(pending, results):
+            if isinstance(extracted_text, BaseException):
+                raise extracted_text
+            document["texte"] = extracted_text or None
         
         return documents_text
+    
+    async def _process_single_document(
+        self,
+        doc_type: str,
+        url: str,
+        first_name: str,
+        last_name: str,
+        index: int = 0,
+        job: Optional[Tuple[str, str]] = None
+    ) -> Optional[str]:
+        """
+        Télécharge un document et en extrait le texte
+        
+        Args:
+            doc_type: Type du document (cv, cover_letter, ...)
+            url: URL du document
+            first_name: Prénom du candidat
+            last_name: Nom du candidat
+            index: Rang du document parmi ceux du même type
+            job: (clé de la candidature, id du document) dans la file de travail
+        
+        Returns:
+            Texte extrait, ou None en cas d'échec
+        """
+        label = doc_type if index == 0 else f"{doc_type} #{index + 1}"
+        
+        try:
+            logger.info(f"📄 Traitement {label}...")
+            
+            if settings.ocr_in_memory:
+                extracted_text = await self._extract_in_memory(url, job)
+            else:
+                extracted_text = await self._extract_via_file(
+                    doc_type, url, first_name, last_name, index, job
+                )
+            
+            if extracted_text is None:
+                logger.warning(f"⚠️ Échec téléchargement {label}")
+                return None
+            
+            if extracted_text:
+                logger.success(
+                    f"✓ {label}: {len(extracted_text)} caractères extraits"
+                )
+            else:
+                logger.warning(f"⚠️ Aucun texte extrait de {label}")
+            
+            return extracted_text or None
+        
+        except OCRTransientError:
+            # Propagée : la candidature n'est pas enregistrée avec un texte
+            # manquant et sera retraitée
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erreur traitement {label}: {e}")
+            return None
+    
+    async def _extract_in_memory(
+        self,
+        url: str,
+        job: Optional[Tuple[str, str]] = None
+    ) -> Optional[str]:
+        """
+        Télécharge un document dans un tampon et le passe directement à l'OCR
+        
+        Args:
+            url: URL du document
+            job: (clé de la candidature, id du document) dans la file de travail
+        
+        Returns:
+            Texte extrait, ou None si le téléchargement a échoué
+        """
+        buffer = await supabase_client.download_to_buffer(
+            url,
+            settings.download_spool_max_mb * 1024 * 1024
+        )
+        if buffer is None:
+            return None
+        self._mark_document(job, DOWNLOADED)
+        
+        with buffer:
+            return await azure_ocr_service.extract_text(buffer, Path(url).name)
+    
+    async def _extract_via_file(
+        self,
+        doc_type: str,
+        url: str,
+        first_name: str,
+        last_name: str,
+        index: int,
+        job: Optional[Tuple[str, str]] = None
+    ) -> Optional[str]:
+        """
+        Télécharge un document dans le dossier temporaire puis l'analyse
+        
+        Le fichier est conservé (OCR_IN_MEMORY=false sert à inspecter les
+        documents téléchargés).
+        
+        Args:
+            doc_type: Type du document (cv, cover_letter, ...)
+            url: URL du document
+            first_name: Prénom du candidat
+            last_name: Nom du candidat
+            index: Rang du document parmi ceux du même type
+            job: (clé de la candidature, id du document) dans la file de travail
+        
+        Returns:
+            Texte extrait, ou None si le téléchargement a échoué
+        """
+        # Création du chemin de destination (un fichier par document du type)
+        safe_name = f"{first_name}_{last_name}".replace(" ", "_")
+        file_extension = Path(url).suffix or ".pdf"
+        suffix = "" if index == 0 else f"_{index + 1}"
+        destination = self.temp_folder / f"{safe_name}_{doc_type}{suffix}{file_extension}"
+        
+        # Téléchargement du fichier
+        success = await supabase_client.download_file(url, destination)
+        if not success:
+            return None
+        self._mark_document(job, DOWNLOADED)
+        
+        # Extraction OCR
+        return await azure_ocr_service.extract_text_from_file(destination)
 
 
 # Instance globale
@@ -0,0 +1,116 @@
+"""
+Lecture en flux des fichiers d'export de candidatures
+"""
+import json
+from pathlib import Path
+from typing import Iterator, Dict, Any, TextIO
+
+
+# Taille des blocs lus depuis le fichier (caractères)
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_candidatures(json_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Itère sur les candidatures d'un export sans charger tout le fichier
+    
+    Deux formats sont acceptés :
+    - un tableau JSON de candidats (export standard)
+    - du JSONL (un candidat par ligne)
+    
+    Args:
+        json_file: Chemin du fichier d'export
+    
+    Yields:
+        Données JSON de chaque candidat, dans l'ordre du fichier
+    
+    Raises:
+        ValueError: Si le fichier n'est ni un tableau JSON ni du JSONL
+    """
+    with open(json_file, "r", encoding="utf-8-sig") as f:
+        first_char = _peek_first_char(f)
+        
+        if first_char == "[":
+            yield from _iter_json_array(f)
+        elif first_char == "{":
+            yield from _iter_json_lines(f)
+        elif first_char:
+            raise ValueError(
+                "Le fichier doit contenir un tableau JSON ou des lignes JSONL"
+            )
+
+
+def _peek_first_char(f: TextIO) -> str:
+    """Retourne le premier caractère significatif et rembobine le fichier"""
+    while True:
+        char = f.read(1)
+        if not char:
+            return ""
+        if char in _WHITESPACE:
+            continue
+        f.seek(0)
+        return char
+
+
+def _iter_json_lines(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Itère sur un fichier JSONL"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_json_array(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Itère sur les éléments d'un tableau JSON au fil de la lecture
+    
+    Le tampon ne contient que l'élément en cours de décodage et le bloc
+    suivant, la mémoire reste donc proportionnelle au plus gros candidat.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = "", 0
+    eof = False
+    separators = _WHITESPACE
+    
+    while True:
+        # Saut des séparateurs entre éléments
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(CHUNK_SIZE), 0
+            eof = not buffer
+        
+        if pos >= len(buffer):
+            raise ValueError("Tableau JSON non terminé")
+        
+        # Ouverture du tableau
+        if separators == _WHITESPACE:
+            if buffer[pos] != "[":
+                raise ValueError("Le fichier doit contenir un tableau JSON")
+            pos += 1
+            separators = _WHITESPACE + ","
+            continue
+        
+        if buffer[pos] == "]":
+            return
+        
+        # Décodage de l'élément suivant, en lisant davantage si nécessaire
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            
+            chunk = f.read(CHUNK_SIZE)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        
+        buffer, pos = buffer[end:], 0
+        yield item
@@ -0,0 +1,337 @@
+"""
+File de travail persistante (SQLite) du traitement par lots
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Dict, Any, Optional, Tuple
+from src.logger import app_logger as logger
+
+
+# États d'une candidature ou d'un document
+PENDING = "pending"
+DOWNLOADED = "downloaded"
+OCR_DONE = "ocr_done"
+STORED = "stored"
+FAILED = "failed"
+
+STATES = (PENDING, DOWNLOADED, OCR_DONE, STORED, FAILED)
+
+# Candidatures lues par requête lors de la reprise
+PAGE_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    shard_hash INTEGER,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_state_position ON candidates (state, position);
+CREATE TABLE IF NOT EXISTS documents (
+    candidate_key TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    texte TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (candidate_key, document_id)
+);
+"""
+
+
+def candidate_key(candidate_data: Dict[str, Any], position: int) -> str:
+    """
+    Clé d'une candidature dans la file
+    
+    Args:
+        candidate_data: Données JSON du candidat
+        position: Rang dans l'export (clé de repli sans application_id)
+    
+    Returns:
+        application_id, ou le rang dans l'export
+    """
+    return candidate_data.get("application_id") or f"#{position}"
+
+
+def shard_hash(key: str) -> int:
+    """
+    Empreinte d'une clé de candidature pour la répartition entre processus
+    
+    Stable d'un processus à l'autre, contrairement à hash(), et positive
+    sur 63 bits pour tenir dans un INTEGER SQLite.
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def shard_of(key: str, shards: int) -> int:
+    """Part à laquelle appartient une candidature (mode multi-processus)"""
+    return shard_hash(key) % shards
+
+
+def fingerprint(candidate_data: Dict[str, Any]) -> str:
+    """Empreinte du contenu d'une candidature (détecte les exports modifiés)"""
+    canonical = json.dumps(candidate_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    """
+    File de travail reprenable, alimentée depuis l'export
+    
+    Chaque candidature et chacun de ses documents passent par les états
+    pending -> downloaded -> ocr_done -> stored, ou failed. Les textes OCR
+    des documents sont conservés tant que la candidature n'est pas
+    enregistrée : une reprise ne re-télécharge ni ne ré-analyse les
+    documents déjà traités. Les écritures sont locales et courtes ; elles
+    sont faites depuis la boucle d'événements. Le mode WAL permet à
+    plusieurs processus de partager la file.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Attente des verrous : plusieurs processus peuvent écrire (--workers)
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self._migrate()
+    
+    def _migrate(self):
+        """Ajoute l'empreinte de répartition aux files créées avant --workers"""
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(candidates)")}
+        with self.connection:
+            if "shard_hash" not in columns:
+                self.connection.execute("ALTER TABLE candidates ADD COLUMN shard_hash INTEGER")
+            keys = [row["key"] for row in self.connection.execute(
+                "SELECT key FROM candidates WHERE shard_hash IS NULL"
+            )]
+            self.connection.executemany(
+                "UPDATE candidates SET shard_hash = ? WHERE key = ?",
+                [(shard_hash(key), key) for key in keys]
+            )
+    
+    def close(self):
+        """Ferme la base de la file"""
+        self.connection.close()
+    
+    def sync(
+        self,
+        candidats_data: Iterable[Dict[str, Any]],
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Alimente la file depuis l'export
+        
+        Les nouvelles candidatures sont ajoutées en pending. Une candidature
+        dont le contenu a changé depuis l'export précédent repart en pending
+        (ses documents sont oubliés) ; les autres gardent leur état. Les
+        positions suivent l'ordre du nouvel export.
+        
+        Args:
+            candidats_data: Itérable des données JSON des candidats
+            batch_size: Candidatures écrites par transaction
+        
+        Returns:
+            Compteurs {added, changed, unchanged}
+        """
+        counts = {"added": 0, "changed": 0, "unchanged": 0}
+        batch = []
+        
+        # Les candidatures absentes de cet export gardent une position
+        # négative et ne sont plus proposées au traitement
+        with self.connection:
+            self.connection.execute("UPDATE candidates SET position = -ABS(position)")
+        
+        for position, candidate_data in enumerate(candidats_data, 1):
+            batch.append((candidate_key(candidate_data, position), position, candidate_data))
+            if len(batch) >= batch_size:
+                self._sync_batch(batch, counts)
+                batch = []
+        if batch:
+            self._sync_batch(batch, counts)
+        
+        logger.info(
+            f"🗂️ File de travail: {counts['added']} ajoutées, "
+            f"{counts['changed']} modifiées, {counts['unchanged']} inchangées"
+        )
+        return counts
+    
+    def _sync_batch(self, batch, counts: Dict[str, int]):
+        now = time.time()
+        with self.connection:
+            for key, position, candidate_data in batch:
+                digest = fingerprint(candidate_data)
+                row = self.connection.execute(
+                    "SELECT fingerprint FROM candidates WHERE key = ?", (key,)
+                ).fetchone()
+                
+                if row is None:
+                    counts["added"] += 1
+                elif row["fingerprint"] != digest:
+                    counts["changed"] += 1
+                    self.connection.execute(
+                        "DELETE FROM documents WHERE candidate_key = ?", (key,)
+                    )
+                else:
+                    counts["unchanged"] += 1
+                    self.connection.execute(
+                        "UPDATE candidates SET position = ? WHERE key = ?", (position, key)
+                    )
+                    continue
+                
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO candidates "
+                    "(key, position, fingerprint, data, shard_hash, state, attempts, error, "
+                    "updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0, NULL, ?)",
+                    (key, position, digest, json.dumps(candidate_data, ensure_ascii=False),
+                     shard_hash(key), PENDING, now)
+                )
+    
+    def iter_candidates(
+        self,
+        retry_failed: bool = False,
+        shard: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur les candidatures restant à traiter, dans l'ordre de l'export
+        
+        Args:
+            retry_failed: Ne reprendre que les candidatures en échec
+            shard: Part (index, nombre de parts) à lire, en mode
+                multi-processus ; le filtre est fait par SQLite, seules les
+                candidatures de la part sont décodées
+        
+        Yields:
+            Données JSON des candidats, avec leur clé dans la file (_job_key)
+        """
+        if retry_failed:
+            condition, params = "state = ?", (FAILED,)
+        else:
+            condition, params = "state NOT IN (?, ?)", (STORED, FAILED)
+        if shard is not None:
+            index, count = shard
+            condition += " AND shard_hash % ? = ?"
+            params += (count, index)
+        
+        last_position = 0
+        while True:
+            rows = self.connection.execute(
+                f"SELECT key, position, data FROM candidates WHERE {condition} "
+                "AND position > ? ORDER BY position LIMIT ?",
+                (*params, last_position, PAGE_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            
+            for row in rows:
+                candidate_data = json.loads(row["data"])
+                candidate_data["_job_key"] = row["key"]
+                yield candidate_data
+            last_position = rows[-1]["position"]
+    
+    def mark_candidate(self, key: str, state: str, error: Optional[str] = None) -> str:
+        """
+        Met à jour l'état d'une candidature
+        
+        Une candidature enregistrée libère les textes OCR de ses documents ;
+        si l'un de ses documents est en échec, elle passe en failed (reprise
+        par --retry-failed, seuls les documents en échec sont ré-analysés).
+        Un échec incrémente son nombre de tentatives.
+        
+        Args:
+            key: Clé de la candidature dans la file
+            state: Nouvel état
+            error: Message d'erreur (état failed)
+        
+        Returns:
+            État enregistré
+        """
+        now = time.time()
+        with self.connection:
+            if state == STORED:
+                failed_documents = self.connection.execute(
+                    "SELECT COUNT(*) FROM documents WHERE candidate_key = ? AND state = ?",
+                    (key, FAILED)
+                ).fetchone()[0]
+                if failed_documents:
+                    state = FAILED
+                    error = f"{failed_documents} document(s) en échec"
+                else:
+                    self.connection.execute(
+                        "UPDATE documents SET state = ?, texte = NULL, updated_at = ? "
+                        "WHERE candidate_key = ?",
+                        (STORED, now, key)
+                    )
+            
+            self.connection.execute(
+                "UPDATE candidates SET state = ?, error = ?, updated_at = ?, "
+                "attempts = attempts + ? WHERE key = ?",
+                (state, error, now, 1 if state == FAILED else 0, key)
+            )
+        return state
+    
+    def mark_document(
+        self,
+        key: str,
+        document_id: str,
+        state: str,
+        texte: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Met à jour l'état d'un document d'une candidature
+        
+        Args:
+            key: Clé de la candidature dans la file
+            document_id: Identifiant du document
+            state: Nouvel état
+            texte: Texte OCR (état ocr_done)
+            error: Message d'erreur (état failed)
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(candidate_key, document_id, state, texte, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, document_id, state, texte, error, time.time())
+            )
+    
+    def get_document_texts(self, key: str) -> Dict[str, str]:
+        """
+        Textes OCR déjà obtenus pour les documents d'une candidature
+        
+        Args:
+            key: Clé de la candidature dans la file
+        
+        Returns:
+            Dictionnaire id du document -> texte
+        """
+        rows = self.connection.execute(
+            "SELECT document_id, texte FROM documents "
+            "WHERE candidate_key = ? AND state = ? AND texte IS NOT NULL",
+            (key, OCR_DONE)
+        ).fetchall()
+        return {row["document_id"]: row["texte"] for row in rows}
+    
+    def get_counts(self) -> Dict[str, Dict[str, int]]:
+        """Nombre de candidatures et de documents par état"""
+        counts = {}
+        for table in ("candidates", "documents"):
+            rows = self.connection.execute(
+                f"SELECT state, COUNT(*) AS n FROM {table} GROUP BY state"
+            ).fetchall()
+            counts[table] = {state: 0 for state in STATES}
+            counts[table].update({row["state"]: row["n"] for row in rows})
+        return counts
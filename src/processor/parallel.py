@@ -0,0 +1,238 @@
+"""
+Traitement par lots réparti sur plusieurs processus (main.py --workers N)
+"""
+import asyncio
+import multiprocessing
+import queue
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from src.config import settings
+from src.logger import app_logger as logger
+from src.processor.candidature_reader import iter_candidatures
+from src.processor.job_queue import JobQueue
+
+
+# Intervalle minimal entre deux journaux de progression du parent (secondes)
+PROGRESS_INTERVAL = 10.0
+
+# Attente d'un message des processus avant de vérifier qu'ils sont vivants
+POLL_TIMEOUT = 1.0
+
+
+def merge_summaries(summaries: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Additionne les statistiques des processus
+    
+    Les compteurs (candidatures, cache OCR, appels OCR) sont sommés, ainsi
+    que les débits OCR finaux : chaque processus a sa part du débit autorisé.
+    La durée et le débit en candidatures/s sont calculés par le parent.
+    
+    Args:
+        summaries: Statistiques renvoyées par chaque processus (None ignoré)
+    
+    Returns:
+        Statistiques cumulées
+    """
+    merged: Dict[str, Any] = {
+        "total": 0,
+        "processed": 0,
+        "failed": 0,
+        "ocr_cache": {"hits": 0, "misses": 0},
+        "ocr_rate_limit": None
+    }
+    
+    for summary in summaries:
+        if not summary:
+            continue
+        for key in ("total", "processed", "failed"):
+            merged[key] += summary.get(key, 0)
+        for key, value in (summary.get("ocr_cache") or {}).items():
+            merged["ocr_cache"][key] = merged["ocr_cache"].get(key, 0) + value
+        
+        rate_stats = summary.get("ocr_rate_limit")
+        if rate_stats:
+            merged_rate = merged["ocr_rate_limit"] or {}
+            for key, value in rate_stats.items():
+                merged_rate[key] = round(merged_rate.get(key, 0) + value, 2)
+            merged["ocr_rate_limit"] = merged_rate
+    
+    return merged
+
+
+def _run_shard(index: int, workers: int, retry_failed: bool, queue_path: str, events):
+    """
+    Point d'entrée d'un processus : traite une part des candidatures
+    
+    Le processus est démarré en « spawn » : les singletons (clients MongoDB,
+    Supabase, Azure) sont recréés à l'import, sans rien hériter du parent.
+    Il ne lit pas l'export : SQLite ne lui renvoie que les candidatures de
+    sa part, déjà alimentées par le parent.
+    """
+    from src.processor.candidature_processor import candidature_processor
+    from src.services.azure_ocr import azure_ocr_service
+    
+    settings.job_queue_enabled = True
+    settings.job_queue_path = queue_path
+    
+    # Le débit OCR autorisé est partagé entre les processus
+    azure_ocr_service.set_rate_limit(
+        settings.ocr_rate_limit_tps / workers,
+        settings.ocr_rate_limit_min_tps / workers
+    )
+    candidature_processor.shard = (index, workers)
+    candidature_processor.on_progress = lambda counts: events.put(("progress", index, counts))
+    
+    summary, kind = None, "done"
+    try:
+        summary = asyncio.run(candidature_processor.process_all_candidatures(
+            retry_failed=retry_failed,
+            sync_queue=False
+        ))
+    except KeyboardInterrupt:
+        logger.warning(f"⚠️ Processus {index} interrompu")
+        kind = "error"
+    except Exception as e:
+        logger.error(f"❌ Erreur fatale du processus {index}: {e}")
+        logger.exception(e)
+        kind = "error"
+    finally:
+        events.put((kind, index, summary))
+
+
+def run_workers(workers: int, retry_failed: bool = False) -> Dict[str, Any]:
+    """
+    Répartit les candidatures de l'export sur plusieurs processus
+    
+    Chaque candidature est attribuée à un processus selon l'empreinte de sa
+    clé (colonne shard_hash de la file de travail). L'export n'est lu
+    qu'une fois, par le parent, qui alimente la file avant le démarrage des
+    processus ; sans file persistante (JOB_QUEUE_ENABLED=false), une file
+    temporaire est utilisée le temps de l'exécution. Chaque processus ouvre
+    ensuite ses propres connexions.
+    
+    Args:
+        workers: Nombre de processus
+        retry_failed: Ne reprendre que les candidatures en échec
+    
+    Returns:
+        Statistiques cumulées, avec le nombre de processus arrêtés en
+        erreur ou sans résumé (failed_workers)
+    """
+    json_file = Path(settings.data_folder) / "Donnees_candidatures_SEEG.json"
+    temp_folder = None
+    if settings.job_queue_enabled:
+        queue_path = Path(settings.job_queue_path)
+    else:
+        temp_folder = tempfile.mkdtemp(prefix="seeg-jobs-")
+        queue_path = Path(temp_folder) / "job_queue.db"
+    
+    try:
+        if json_file.exists():
+            job_queue = JobQueue(queue_path)
+            try:
+                job_queue.sync(iter_candidatures(json_file))
+            finally:
+                job_queue.close()
+        
+        return _run_processes(workers, retry_failed, queue_path)
+    finally:
+        if temp_folder:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+
+def _run_processes(workers: int, retry_failed: bool, queue_path: Path) -> Dict[str, Any]:
+    """Démarre les processus, suit leur progression et cumule leurs résumés"""
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    processes = [
+        context.Process(
+            target=_run_shard,
+            args=(index, workers, retry_failed, str(queue_path), events),
+            name=f"seeg-worker-{index}"
+        )
+        for index in range(workers)
+    ]
+    
+    logger.info(f"🧵 Traitement réparti sur {workers} processus")
+    start_time = time.perf_counter()
+    for process in processes:
+        process.start()
+    
+    progress = {index: {"processed": 0, "failed": 0} for index in range(workers)}
+    summaries: Dict[int, Optional[Dict[str, Any]]] = {}
+    crashed = set()
+    last_log = start_time
+    
+    try:
+        while len(summaries) + len(crashed) < workers:
+            try:
+                kind, index, payload = events.get(timeout=POLL_TIMEOUT)
+            except queue.Empty:
+                # Processus arrêté sans résumé (signal, mémoire...)
+                for index, process in enumerate(processes):
+                    if index not in summaries and index not in crashed and not process.is_alive():
+                        crashed.add(index)
+                        logger.error(
+                            f"❌ Processus {index} arrêté sans résumé (code {process.exitcode})"
+                        )
+                continue
+            
+            if kind == "done":
+                summaries[index] = payload
+                continue
+            if kind == "error":
+                crashed.add(index)
+                continue
+            
+            progress[index] = payload
+            now = time.perf_counter()
+            if now - last_log >= PROGRESS_INTERVAL:
+                last_log = now
+                processed = sum(counts["processed"] for counts in progress.values())
+                failed = sum(counts["failed"] for counts in progress.values())
+                logger.info(
+                    f"📈 Progression: {processed} traitées, {failed} en erreur "
+                    f"({(processed + failed) / (now - start_time):.2f} candidatures/s)"
+                )
+    finally:
+        for process in processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+    
+    elapsed = time.perf_counter() - start_time
+    summary = merge_summaries(list(summaries.values()))
+    summary["elapsed_seconds"] = elapsed
+    summary["throughput"] = summary["total"] / elapsed if elapsed > 0 else 0.0
+    summary["workers"] = workers
+    summary["failed_workers"] = len(crashed)
+    
+    # Résumé global
+    logger.info("\n" + "=" * 80)
+    logger.info(f"RÉSUMÉ DU TRAITEMENT ({workers} processus)")
+    logger.info("=" * 80)
+    logger.info(f"✓ Candidatures traitées avec succès: {summary['processed']}")
+    if summary["failed"] > 0:
+        logger.warning(f"❌ Candidatures en erreur: {summary['failed']}")
+    if crashed:
+        logger.warning(f"❌ Processus arrêtés en erreur: {len(crashed)}")
+    logger.info(f"⏱️ Durée totale: {elapsed:.1f}s ({summary['throughput']:.2f} candidatures/s)")
+    logger.info(
+        f"🗃️ Cache OCR: {summary['ocr_cache']['hits']} succès, "
+        f"{summary['ocr_cache']['misses']} échecs"
+    )
+    rate_stats = summary["ocr_rate_limit"]
+    if rate_stats:
+        logger.info(
+            f"🚦 Débit OCR: {rate_stats['acquired']} appels, "
+            f"{rate_stats['throttled']} limités (429), "
+            f"{rate_stats['waited_seconds']}s d'attente cumulée, "
+            f"débit final {rate_stats['rate']} appels/s"
+        )
+    logger.info("=" * 80)
+    
+    return summary
@@ -1,30 +1,89 @@
 """
 Service d'extraction de texte via Azure Form Recognizer
 """
-import time
+import asyncio
 from pathlib import Path
-from typing import Optional
-from azure.ai.formrecognizer import DocumentAnalysisClient
+from typing import Optional, Dict, Any, IO, Union
+import aiohttp
+from azure.ai.formrecognizer.aio import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
-from tenacity import retry, stop_after_attempt, wait_exponential
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from src.config import settings
 from src.logger import app_logger as logger
+from src.services.ocr_cache import OCRCache
+from src.services.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+# Modèle Azure utilisé pour l'extraction de texte générale
+OCR_MODEL_ID = "prebuilt-read"
+
+# Statuts HTTP transitoires : limitation de débit, délai dépassé, erreur serveur
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Erreurs réseau transitoires : connexion impossible ou interrompue, délai dépassé
+TRANSIENT_ERRORS = (
+    ServiceRequestError,
+    ServiceResponseError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError
+)
+
+
+class OCRTransientError(Exception):
+    """OCR impossible pour une raison transitoire, après toutes les tentatives"""
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Indique si une erreur d'analyse justifie une nouvelle tentative
+    
+    Seuls les 408/429/5xx et les erreurs réseau sont transitoires. Les
+    autres réponses HTTP (document invalide, authentification, quota F0
+    épuisé...) et toute autre exception (erreur de programmation comprise)
+    sont définitives.
+    """
+    if isinstance(error, HttpResponseError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, TRANSIENT_ERRORS)
 
 
 class AzureOCRService:
-    """Service d'OCR utilisant Azure Form Recognizer"""
+    """Service d'OCR asynchrone utilisant Azure Form Recognizer"""
     
     def __init__(self):
         self.client: Optional[DocumentAnalysisClient] = None
+        self.cache: Optional[OCRCache] = None
+        self.rate_limiter: Optional[AdaptiveRateLimiter] = None
+        self.set_rate_limit(settings.ocr_rate_limit_tps, settings.ocr_rate_limit_min_tps)
+        
+        if settings.ocr_cache_enabled:
+            self.cache = OCRCache(
+                folder=Path(settings.ocr_cache_folder),
+                max_size_bytes=settings.ocr_cache_max_size_mb * 1024 * 1024
+            )
+    
+    def set_rate_limit(self, max_rate: float, min_rate: float):
+        """
+        Crée le limiteur partagé par tous les appels OCR du processus
+        
+        Args:
+            max_rate: Débit maximal (appels d'analyse/s), 0 pour ne pas limiter
+            min_rate: Débit plancher après des 429 répétés
+        """
+        self.rate_limiter = None
+        if max_rate > 0:
+            self.rate_limiter = AdaptiveRateLimiter(max_rate=max_rate, min_rate=min_rate)
     
     def connect(self):
-        """Initialise le client Azure Form Recognizer"""
+        """Initialise le client asynchrone Azure Form Recognizer"""
         try:
             logger.info("Initialisation Azure Document Intelligence...")
             
             self.client = DocumentAnalysisClient(
                 endpoint=settings.azure_document_intelligence_endpoint,
-                credential=AzureKeyCredential(settings.azure_document_intelligence_key)
+                credential=AzureKeyCredential(settings.azure_document_intelligence_key),
+                raw_response_hook=self._observe_response
             )
             
             logger.success("✓ Client Azure Document Intelligence initialisé")
@@ -33,11 +92,62 @@ class AzureOCRService:
             logger.error(f"Erreur initialisation Azure Document Intelligence: {e}")
             raise
     
+    async def close(self):
+        """Ferme le client Azure et sa session HTTP"""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            logger.info("Client Azure Document Intelligence fermé")
+    
+    def _observe_response(self, response):
+        """
+        Transmet au limiteur chaque réponse HTTP d'Azure
+        
+        Appelé pour chaque tentative, y compris celles relancées par le SDK :
+        les 429 réduisent le débit, les soumissions acceptées l'augmentent.
+        """
+        if not self.rate_limiter:
+            return
+        
+        http_response = response.http_response
+        if http_response.status_code == 429:
+            self.rate_limiter.on_throttle(parse_retry_after(http_response.headers))
+        elif http_response.status_code < 400 and response.http_request.method == "POST":
+            self.rate_limiter.on_success()
+    
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        retry=retry_if_exception(is_retryable_error),
+        stop=stop_after_attempt(settings.ocr_max_attempts),
+        wait=wait_exponential(multiplier=1, min=4, max=30),
+        reraise=True
     )
-    def extract_text_from_file(self, file_path: Path) -> str:
+    async def _analyze_document(self, document: Union[bytes, IO[bytes]]):
+        """
+        Soumet un document à Azure et attend le résultat sans bloquer la boucle
+        
+        Chaque soumission attend l'autorisation du limiteur de débit. Les
+        erreurs transitoires sont propagées pour que tenacity relance
+        l'appel (attente asynchrone entre les tentatives).
+        
+        Args:
+            document: Contenu binaire du document, ou tampon (relu depuis le
+                début à chaque tentative)
+        
+        Returns:
+            Résultat de l'analyse Azure
+        """
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        
+        if hasattr(document, "seek"):
+            document.seek(0)
+        poller = await self.client.begin_analyze_document(
+            model_id=OCR_MODEL_ID,
+            document=document
+        )
+        return await poller.result()
+    
+    async def extract_text_from_file(self, file_path: Path) -> str:
         """
         Extrait le texte d'un document PDF ou image
         
@@ -47,43 +157,86 @@ class AzureOCRService:
         Returns:
             Texte extrait du document
         """
+        if not file_path.exists():
+            logger.error(f"Fichier introuvable: {file_path}")
+            return ""
+        
+        # Lecture du fichier
+        document_bytes = await asyncio.to_thread(file_path.read_bytes)
+        return await self.extract_text(document_bytes, file_path.name)
+    
+    async def extract_text(self, document: Union[bytes, IO[bytes]], name: str) -> str:
+        """
+        Extrait le texte d'un document déjà chargé (octets ou tampon)
+        
+        Évite l'écriture puis la relecture d'un fichier temporaire entre le
+        téléchargement et l'OCR.
+        
+        Args:
+            document: Contenu binaire du document, ou tampon binaire
+            name: Nom du document (journalisation)
+        
+        Returns:
+            Texte extrait du document ("" si le document ne peut pas être analysé)
+        
+        Raises:
+            OCRTransientError: Service indisponible ou limité après toutes les
+                tentatives ; le document doit être retraité plus tard
+        """
         try:
-            logger.info(f"Extraction OCR: {file_path.name}")
+            logger.info(f"Extraction OCR: {name}")
             
-            if not file_path.exists():
-                logger.error(f"Fichier introuvable: {file_path}")
-                return ""
+            # Consultation du cache avant tout appel à Azure (empreinte et
+            # accès disque hors de la boucle d'événements)
+            cache_key = None
+            if self.cache:
+                cache_key = await asyncio.to_thread(OCRCache.make_key, document, OCR_MODEL_ID)
+                cached_text = await asyncio.to_thread(self.cache.get, cache_key)
+                if cached_text is not None:
+                    logger.info(f"✓ OCR en cache: {name}")
+                    return cached_text
             
-            # Lecture du fichier
-            with open(file_path, "rb") as f:
-                document_bytes = f.read()
+            logger.debug(f"Analyse en cours pour {name}...")
             
             # Lancement de l'analyse avec le modèle "prebuilt-read"
             # C'est le meilleur modèle pour l'extraction de texte générale  
-            poller = self.client.begin_analyze_document(
-                model_id="prebuilt-read",
-                document=document_bytes
-            )
-            
-            logger.debug(f"Analyse en cours pour {file_path.name}...")
-            
-            # Attente du résultat (peut prendre quelques secondes)
-            result = poller.result()
+            result = await self._analyze_document(document)
             
             # Extraction du texte
             extracted_text = self._extract_text_from_result(result)
             
+            if cache_key:
+                await asyncio.to_thread(self.cache.put, cache_key, extracted_text)
+            
             logger.success(
-                f"✓ OCR terminé: {file_path.name} "
+                f"✓ OCR terminé: {name} "
                 f"({len(extracted_text)} caractères extraits)"
             )
             
             return extracted_text
             
         except Exception as e:
-            logger.error(f"Erreur extraction OCR {file_path.name}: {e}")
+            if is_retryable_error(e):
+                logger.error(
+                    f"OCR indisponible pour {name} après "
+                    f"{settings.ocr_max_attempts} tentatives: {e}"
+                )
+                raise OCRTransientError(f"{name}: {e}") from e
+            logger.error(f"Erreur extraction OCR {name}: {e}")
             return ""
     
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du limiteur de débit (vides si désactivé)"""
+        if not self.rate_limiter:
+            return {}
+        return self.rate_limiter.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache OCR (vides si désactivé)"""
+        if not self.cache:
+            return {"hits": 0, "misses": 0}
+        return self.cache.get_stats()
+    
     def _extract_text_from_result(self, result) -> str:
         """
         Extrait le texte structuré du résultat d'analyse
@@ -130,15 +283,15 @@ class AzureOCRService:
             
             # Lancement de l'analyse depuis l'URL
             # Note: Cette méthode n'est plus utilisée, on télécharge d'abord les fichiers
-            poller = self.client.begin_analyze_document_from_url(
-                model_id="prebuilt-read",
+            poller = await self.client.begin_analyze_document_from_url(
+                model_id=OCR_MODEL_ID,
                 document_url=url
             )
             
             logger.debug("Analyse en cours depuis URL...")
             
             # Attente du résultat
-            result = poller.result()
+            result = await poller.result()
             
             # Extraction du texte
             extracted_text = self._extract_text_from_result(result)
@@ -0,0 +1,182 @@
+"""
+Cache disque des résultats OCR, adressé par le contenu des documents
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, IO, Union
+from src.logger import app_logger as logger
+
+
+# Intervalle de recalcul de la taille du cache depuis le disque (secondes)
+SIZE_REFRESH_INTERVAL = 60.0
+
+
+class OCRCache:
+    """
+    Cache persistant des textes OCR avec éviction LRU
+    
+    Chaque entrée est un fichier texte nommé d'après le modèle Azure et le
+    SHA-256 du document. La date de modification sert d'horodatage d'accès
+    pour l'éviction des entrées les moins récemment utilisées.
+    
+    Les méthodes font des accès disque bloquants : AzureOCRService les
+    appelle via asyncio.to_thread, d'où le verrou sur la taille totale.
+    Plusieurs processus (main.py --workers) peuvent partager le dossier :
+    chaque écriture passe par un fichier temporaire unique, et la taille
+    totale, tenue à jour par processus, est recalculée depuis le disque
+    toutes les SIZE_REFRESH_INTERVAL secondes et avant chaque éviction.
+    La limite peut donc être dépassée brièvement par les écritures des
+    autres processus.
+    """
+    
+    def __init__(self, folder: Path, max_size_bytes: int):
+        self.folder = Path(folder)
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_size: Optional[int] = None
+        self._size_checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(document: Union[bytes, IO[bytes]], model_id: str) -> str:
+        """
+        Calcule la clé de cache d'un document
+        
+        Args:
+            document: Contenu binaire du document, ou tampon lu par blocs
+                puis remis au début
+            model_id: Identifiant du modèle Azure utilisé
+        
+        Returns:
+            Clé unique (modèle + empreinte SHA-256)
+        """
+        if isinstance(document, (bytes, bytearray)):
+            digest = hashlib.sha256(document)
+        else:
+            digest = hashlib.sha256()
+            document.seek(0)
+            for block in iter(lambda: document.read(65536), b""):
+                digest.update(block)
+            document.seek(0)
+        return f"{model_id}-{digest.hexdigest()}"
+    
+    def _path(self, key: str) -> Path:
+        return self.folder / f"{key}.txt"
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Récupère un texte OCR depuis le cache
+        
+        Args:
+            key: Clé calculée par make_key
+        
+        Returns:
+            Texte en cache, ou None si absent
+        """
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError as e:
+            logger.warning(f"Lecture cache OCR impossible ({key}): {e}")
+            self.misses += 1
+            return None
+        
+        # Marque l'entrée comme récemment utilisée
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return text
+    
+    def put(self, key: str, text: str):
+        """
+        Enregistre un texte OCR dans le cache puis applique l'éviction
+        
+        Args:
+            key: Clé calculée par make_key
+            text: Texte extrait à mémoriser
+        """
+        tmp_name = None
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            
+            # Fichier temporaire unique : les écritures concurrentes d'un
+            # même document (tâches ou processus) ne se chevauchent pas
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.folder,
+                suffix=".tmp",
+                delete=False
+            ) as tmp_file:
+                tmp_name = tmp_file.name
+                tmp_file.write(text)
+            
+            with self._lock:
+                total_size = self._current_size()
+                previous_size = path.stat().st_size if path.exists() else 0
+                os.replace(tmp_name, path)
+                tmp_name = None
+                
+                self._total_size = total_size - previous_size + path.stat().st_size
+                self._evict()
+        
+        except OSError as e:
+            logger.warning(f"Écriture cache OCR impossible ({key}): {e}")
+        finally:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+    
+    def _scan(self):
+        """Entrées du cache : (date d'accès, taille, chemin)"""
+        entries = []
+        for entry in self.folder.glob("*.txt"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # évincée par un autre processus
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+    
+    def _current_size(self) -> int:
+        """Taille totale du cache, recalculée depuis le disque périodiquement"""
+        now = time.monotonic()
+        if self._total_size is None or now - self._size_checked_at >= SIZE_REFRESH_INTERVAL:
+            self._total_size = sum(size for _, size, _ in self._scan())
+            self._size_checked_at = now
+        return self._total_size
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de la limite"""
+        if self._total_size <= self.max_size_bytes:
+            return
+        
+        # Taille réelle, écritures des autres processus comprises
+        entries = sorted(self._scan())
+        self._total_size = sum(size for _, size, _ in entries)
+        self._size_checked_at = time.monotonic()
+        
+        evicted = 0
+        for _, size, entry in entries:
+            if self._total_size <= self.max_size_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            self._total_size -= size
+            evicted += 1
+        
+        logger.debug(f"Cache OCR: {evicted} entrée(s) évincée(s)")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de succès/échecs du cache"""
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,145 @@
+"""
+Limitation adaptative du débit des appels Azure Document Intelligence
+"""
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Mapping
+from src.logger import app_logger as logger
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Lit le délai d'attente demandé par le service après un 429
+    
+    Args:
+        headers: En-têtes de la réponse (retry-after-ms, x-ms-retry-after-ms
+            ou Retry-After en secondes ou date HTTP)
+    
+    Returns:
+        Délai en secondes, ou None si absent ou illisible
+    """
+    if not headers:
+        return None
+    
+    for name in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(0.0, float(value) / 1000)
+            except ValueError:
+                pass
+    
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Seau à jetons partagé, à débit ajusté en AIMD
+    
+    Chaque appel consomme un jeton ; les jetons se renouvellent au débit
+    courant, plafonné à max_rate (débit autorisé par le niveau tarifaire
+    Azure). Chaque succès augmente le débit de increase_step (additif),
+    chaque 429 le multiplie par decrease_factor (multiplicatif) et suspend
+    les appels pendant la durée Retry-After. Les 429 d'une même rafale ne
+    réduisent le débit qu'une fois (cooldown secondes).
+    """
+    
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 0.5,
+        increase_step: float = 0.1,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        
+        self.rate = max_rate
+        self.tokens = self._capacity()
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = float("-inf")
+        
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _capacity(self) -> float:
+        """Rafale autorisée : une seconde de débit courant, au moins un appel"""
+        return max(1.0, self.rate)
+    
+    def _refill(self, now: float):
+        self.tokens = min(self._capacity(), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self):
+        """Attend qu'un appel soit autorisé (jeton disponible, hors suspension)"""
+        async with self._lock:
+            start = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+            
+            self.acquired += 1
+            self.waited += time.monotonic() - start
+    
+    def on_success(self):
+        """Augmentation additive du débit après un appel accepté"""
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Réduction multiplicative du débit après un 429
+        
+        Args:
+            retry_after: Délai demandé par le service (secondes)
+        """
+        now = time.monotonic()
+        self.throttled += 1
+        self._refill(now)
+        self.tokens = 0.0
+        
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+        
+        if now - self.last_decrease >= self.cooldown:
+            self.last_decrease = now
+            previous = self.rate
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            logger.warning(
+                f"⏳ Azure OCR limité (429): débit {previous:.2f} -> {self.rate:.2f} appels/s"
+                + (f", reprise dans {retry_after:.1f}s" if retry_after else "")
+            )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs du limiteur, pour le résumé du traitement"""
+        return {
+            "rate": round(self.rate, 2),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited, 1)
+        }
@@ -3,12 +3,22 @@ Client Supabase pour récupérer les URLs des documents
 """
 import httpx
 import aiohttp
-from typing import Optional, Dict, Any
+import tempfile
+from typing import Optional, Dict, Any, IO, Iterator, List, Tuple
 from pathlib import Path
 from src.config import settings
 from src.logger import app_logger as logger
 
 
+# Correspondance types Supabase -> champs du modèle Documents
+DOCUMENT_TYPE_MAPPING = {
+    "cv": "cv",
+    "cover_letter": "cover_letter",
+    "diploma": "diplome",
+    "certificate": "certificats"
+}
+
+
 class SupabaseConfig:
     """Configuration Supabase simple"""
     def __init__(self):
@@ -20,17 +30,67 @@ class SupabaseClient:
     
     def __init__(self):
         self.client = SupabaseConfig()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.connection_stats = {"new": 0, "reused": 0}
     
     def connect(self):
-        """Initialise la connexion Supabase"""
+        """Initialise la connexion Supabase et le pool HTTP partagé"""
         try:
             logger.info("Configuration Supabase...")
+            self._get_session()
             logger.success("✓ Configuration Supabase prête")
             
         except Exception as e:
             logger.error(f"Erreur configuration Supabase: {e}")
             raise
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Retourne la session HTTP partagée, créée à la demande
+        
+        Le connecteur garde les connexions ouvertes (keep-alive) et met en
+        cache la résolution DNS pour éviter les poignées de main TCP/TLS
+        répétées vers l'hôte Supabase.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.supabase_pool_size,
+                limit_per_host=settings.supabase_pool_size,
+                keepalive_timeout=settings.supabase_keepalive_timeout,
+                ttl_dns_cache=settings.supabase_dns_cache_ttl
+            )
+            
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_connection_created)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+            
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=60),
+                trace_configs=[trace_config]
+            )
+        
+        return self.session
+    
+    async def _on_connection_created(self, session, trace_config_ctx, params):
+        """Compte les nouvelles connexions ouvertes"""
+        self.connection_stats["new"] += 1
+    
+    async def _on_connection_reused(self, session, trace_config_ctx, params):
+        """Compte les connexions réutilisées depuis le pool"""
+        self.connection_stats["reused"] += 1
+    
+    async def close(self):
+        """Ferme la session HTTP partagée"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info(
+                f"Session Supabase fermée (connexions nouvelles: "
+                f"{self.connection_stats['new']}, réutilisées: "
+                f"{self.connection_stats['reused']})"
+            )
+        self.session = None
+    
     async def download_file(self, url: str, destination: Path) -> bool:
         """
         Télécharge un fichier depuis une URL Supabase
@@ -48,15 +108,15 @@ class SupabaseClient:
             # Créer le répertoire parent si nécessaire
             destination.parent.mkdir(parents=True, exist_ok=True)
             
-            # Téléchargement asynchrone avec aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                    response.raise_for_status()
+            # Téléchargement asynchrone via la session partagée
+            session = self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
                     
-                    # Écriture du fichier
-                    with open(destination, 'wb') as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            f.write(chunk)
+                # Écriture du fichier
+                with open(destination, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(8192):
+                        f.write(chunk)
             
             logger.success(f"✓ Fichier téléchargé: {destination.name}")
             return True
@@ -65,21 +125,51 @@ class SupabaseClient:
             logger.error(f"Erreur téléchargement {url}: {e}")
             return False
     
-    def get_document_urls_from_candidate(
+    async def download_to_buffer(self, url: str, max_memory_size: int) -> Optional[IO[bytes]]:
+        """
+        Télécharge un fichier sans l'écrire dans le dossier temporaire
+        
+        Le contenu est gardé en mémoire jusqu'à max_memory_size octets, puis
+        déborde dans un fichier anonyme supprimé à la fermeture du tampon.
+        
+        Args:
+            url: URL du fichier à télécharger
+            max_memory_size: Taille maximale gardée en mémoire (octets)
+        
+        Returns:
+            Tampon positionné au début (à fermer par l'appelant), ou None en cas d'échec
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+        try:
+            logger.info(f"Téléchargement: {url}")
+            
+            session = self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(65536):
+                    buffer.write(chunk)
+            
+            buffer.seek(0)
+            return buffer
+        
+        except Exception as e:
+            buffer.close()
+            logger.error(f"Erreur téléchargement {url}: {e}")
+            return None
+    
+    def _iter_candidate_documents(
         self,
         candidate_data: Dict[str, Any]
-    ) -> Dict[str, str]:
+    ) -> Iterator[Tuple[str, Dict[str, Any], str]]:
         """
-        Extrait les URLs des documents d'un candidat depuis les données JSON
+        Parcourt les documents exploitables d'un candidat
         
         Args:
             candidate_data: Données JSON du candidat
             
-        Returns:
-            Dictionnaire avec les URLs complètes des documents
+        Yields:
+            Tuples (clé du document, entrée JSON brute, URL complète)
         """
-        urls = {}
-        
         # Le bucket Supabase pour les documents candidats
         BUCKET_NAME = settings.supabase_bucket_name
         
@@ -92,21 +182,63 @@ class SupabaseClient:
                 if not doc_type or not relative_url:
                     continue
                 
+                # Mapper les types anglais vers les clés attendues
+                doc_key = DOCUMENT_TYPE_MAPPING.get(doc_type)
+                if not doc_key:
+                    continue
+                
                 # Construire l'URL complète Supabase
                 # Format: https://{project_id}.supabase.co/storage/v1/object/public/{bucket}/{path}
                 full_url = f"{self.client.supabase_url}/storage/v1/object/public/{BUCKET_NAME}/{relative_url}"
                 
-                # Mapper les types anglais vers les clés attendues
-                if doc_type == "cv":
-                    urls["cv"] = full_url
-                elif doc_type == "cover_letter":
-                    urls["cover_letter"] = full_url
-                elif doc_type == "diploma":
-                    urls["diplome"] = full_url
-                elif doc_type == "certificate":
-                    urls["certificats"] = full_url
+                yield doc_key, doc, full_url
+    
+    def get_document_urls_from_candidate(
+        self,
+        candidate_data: Dict[str, Any]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extrait les URLs des documents d'un candidat depuis les données JSON
+        
+        Un candidat peut déposer plusieurs documents du même type (ex: BAC et
+        Bachelor comme diplômes) : tous sont conservés, dans l'ordre de l'export.
         
-        return urls
+        Args:
+            candidate_data: Données JSON du candidat
+            
+        Returns:
+            Dictionnaire clé du document -> liste [{id, nom_fichier, url}]
+        """
+        documents: Dict[str, List[Dict[str, Any]]] = {}
+        for doc_key, doc, full_url in self._iter_candidate_documents(candidate_data):
+            documents.setdefault(doc_key, []).append({
+                "id": doc.get("id"),
+                "nom_fichier": doc.get("nom_fichier"),
+                "url": full_url
+            })
+        return documents
+    
+    def get_document_metadata_from_candidate(
+        self,
+        candidate_data: Dict[str, Any]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extrait les métadonnées identifiant la version de chaque document
+        
+        Args:
+            candidate_data: Données JSON du candidat
+            
+        Returns:
+            Dictionnaire clé du document -> liste [{id, taille, date_upload}]
+        """
+        metadata: Dict[str, List[Dict[str, Any]]] = {}
+        for doc_key, doc, _ in self._iter_candidate_documents(candidate_data):
+            metadata.setdefault(doc_key, []).append({
+                "id": doc.get("id"),
+                "taille": doc.get("taille"),
+                "date_upload": doc.get("date_upload")
+            })
+        return metadata
 
 
 # Instance globale
@@ -58,6 +58,7 @@ async def test_single_candidate():
         
         # Traiter ce candidat
         await candidature_processor.process_single_candidature_from_data(candidate_data)
+        await candidature_processor._close_services()
         
         logger.info("")
         logger.info("=" * 80)
@@ -14,6 +14,16 @@ os.environ["SUPABASE_URL"] = "https://test.supabase.co"
 os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "test_key"
 
 
+def pytest_collection_modifyitems(config, items):
+    """Ignore les tests lents (benchmarks) sauf avec -m slow ou RUN_SLOW_TESTS=1"""
+    if "slow" in (config.getoption("-m") or "") or os.environ.get("RUN_SLOW_TESTS") == "1":
+        return
+    skip_slow = pytest.mark.skip(reason="Test lent : -m slow ou RUN_SLOW_TESTS=1 pour l'exécuter")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 @pytest.fixture
 def sample_candidature_data():
     """Fixture avec des données de candidature exemple"""
@@ -49,10 +59,13 @@ def sample_candidature_data():
             "paradigme": ["Réponse P1", "Réponse P2", "Réponse P3"]
         },
         "documents": {
-            "cv": "Texte du CV extrait...",
-            "cover_letter": "Texte de la lettre de motivation...",
-            "diplome": "Texte du diplôme...",
-            "certificats": "Texte des certificats..."
+            "cv": [{"id": "doc-cv", "nom_fichier": "CV.pdf", "texte": "Texte du CV extrait..."}],
+            "cover_letter": [{"id": "doc-lm", "nom_fichier": "LM.pdf", "texte": "Texte de la lettre de motivation..."}],
+            "diplome": [
+                {"id": "doc-bac", "nom_fichier": "BAC.pdf", "texte": "Texte du BAC..."},
+                {"id": "doc-licence", "nom_fichier": "Licence.pdf", "texte": "Texte de la licence..."}
+            ],
+            "certificats": [{"id": "doc-cert", "nom_fichier": "Cert.pdf", "texte": "Texte des certificats..."}]
         }
     }
 
@@ -1,10 +1,11 @@
 """
 Tests d'intégration pour l'API FastAPI
 """
+import json
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
-from src.api.app import app
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.api.app import app, response_cache, health_monitor
 
 
 @pytest.fixture
@@ -15,11 +16,26 @@ def client():
 
 @pytest.fixture
 def mock_mongodb():
-    """Mock du client MongoDB"""
-    with patch("src.api.app.mongodb_client") as mock:
+    """Mock du client MongoDB asynchrone"""
+    with patch("src.api.app.async_mongodb_client", new_callable=AsyncMock) as mock:
+        mock.get_collection_version.return_value = 0
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Isole le cache de réponses entre les tests"""
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+async def _aiter(items):
+    """Itérateur asynchrone simulant un curseur motor"""
+    for item in items:
+        yield item
+
+
 def test_root_endpoint(client):
     """Test du endpoint racine"""
     response = client.get("/")
@@ -30,6 +46,46 @@ def test_root_endpoint(client):
     assert "endpoints" in data
 
 
+def test_liveness(client):
+    """Test de la sonde de vivacité (sans accès à la base)"""
+    response = client.get("/health/live")
+    
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_uses_cached_ping(client, mock_mongodb):
+    """Test que la sonde de disponibilité ne lit aucun document"""
+    mock_mongodb.get_pool_stats = MagicMock(return_value={"open": 2, "in_use": 0})
+    with patch.object(health_monitor, "ping", AsyncMock(return_value=0.003)):
+        await health_monitor.check()
+    
+    response = client.get("/health/ready")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["ping_latency_ms"] == 3.0
+    assert data["pool"] == {"open": 2, "in_use": 0}
+    assert client.get("/health").json()["status"] == "healthy"
+    mock_mongodb.ping.assert_not_called()
+    mock_mongodb.collection.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_readiness_unavailable(client, mock_mongodb):
+    """Test du 503 lorsque le dernier ping a échoué"""
+    mock_mongodb.get_pool_stats = MagicMock(return_value={})
+    with patch.object(health_monitor, "ping", AsyncMock(side_effect=ConnectionError("down"))):
+        await health_monitor.check()
+    
+    response = client.get("/health/ready")
+    
+    assert response.status_code == 503
+    assert response.json()["last_error"] == "down"
+
+
 def test_get_all_candidatures_success(client, mock_mongodb, sample_candidature_data):
     """Test de récupération de toutes les candidatures"""
     # Configuration du mock
@@ -70,7 +126,8 @@ def test_search_candidatures_by_first_name(client, mock_mongodb, sample_candidat
     # Vérifier que la méthode a été appelée avec les bons paramètres
     mock_mongodb.search_candidatures.assert_called_once_with(
         first_name="Jean",
-        last_name=None
+        last_name=None,
+        expand_offre=False
     )
 
 
@@ -96,6 +153,110 @@ def test_search_candidatures_by_both(client, mock_mongodb, sample_candidature_da
     assert len(data) == 1
 
 
+def test_search_candidatures_blank_names(client, mock_mongodb):
+    """Test qu'une recherche sur des noms faits d'espaces est refusée"""
+    response = client.get("/candidatures/search?first_name=%20%20&last_name=%20")
+    
+    assert response.status_code == 400
+    mock_mongodb.search_candidatures.assert_not_called()
+
+
+def test_fulltext_search(client, mock_mongodb):
+    """Test de la recherche plein texte"""
+    mock_mongodb.fulltext_search.return_value = [{
+        "_id": "507f1f77bcf86cd799439011",
+        "application_id": "app-1",
+        "first_name": "Jean",
+        "last_name": "Dupont",
+        "score": 2.1,
+        "snippets": [{"field": "cv", "text": "<mark>Comptable</mark> confirmé"}]
+    }]
+    
+    response = client.get("/candidatures/fulltext?q=comptable&limit=5")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["_id"] == "507f1f77bcf86cd799439011"
+    assert data[0]["snippets"][0]["field"] == "cv"
+    mock_mongodb.fulltext_search.assert_called_once_with("comptable", limit=5)
+
+
+def test_fulltext_search_requires_query(client, mock_mongodb):
+    """Test de la recherche plein texte sans termes"""
+    response = client.get("/candidatures/fulltext")
+    
+    assert response.status_code == 422
+
+
+def test_get_all_candidatures_served_from_cache(client, mock_mongodb, sample_candidature_data):
+    """Test qu'une requête identique ne relit pas MongoDB"""
+    mock_mongodb.get_all_candidatures.return_value = [sample_candidature_data]
+    
+    first = client.get("/candidatures?limit=10&fields=last_name,first_name")
+    second = client.get("/candidatures?fields=first_name,last_name&limit=10")
+    
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert first.headers["ETag"] == second.headers["ETag"]
+    mock_mongodb.get_all_candidatures.assert_called_once()
+
+
+def test_get_all_candidatures_not_modified(client, mock_mongodb, sample_candidature_data):
+    """Test du 304 lorsque le client possède déjà la réponse"""
+    mock_mongodb.get_all_candidatures.return_value = [sample_candidature_data]
+    etag = client.get("/candidatures").headers["ETag"]
+    
+    response = client.get("/candidatures", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_cache_invalidated_by_collection_version(client, mock_mongodb, sample_candidature_data):
+    """Test qu'une écriture (nouvelle version) invalide le cache"""
+    mock_mongodb.search_candidatures.return_value = [sample_candidature_data]
+    client.get("/candidatures/search?first_name=Jean")
+    
+    mock_mongodb.get_collection_version.return_value = 1
+    response_cache._version_checked_at = 0.0
+    response = client.get("/candidatures/search?first_name=JEAN")
+    
+    assert response.headers["X-Cache"] == "MISS"
+    assert mock_mongodb.search_candidatures.call_count == 2
+
+
+def test_get_all_candidatures_expand_offre(client, mock_mongodb, sample_candidature_data):
+    """Test de l'inclusion de l'offre complète à la demande"""
+    mock_mongodb.get_all_candidatures.return_value = [sample_candidature_data]
+    
+    response = client.get("/candidatures?expand_offre=true")
+    
+    assert response.status_code == 200
+    assert mock_mongodb.get_all_candidatures.call_args.kwargs["expand_offre"] is True
+
+
+def test_legacy_documents_returned_as_lists(client, mock_mongodb, sample_candidature_data):
+    """Test que les documents à un seul texte par type sont publiés au format liste"""
+    legacy = {
+        **sample_candidature_data,
+        "_id": "1",
+        "documents": {"cv": "Texte du CV", "cover_letter": None, "diplome": [], "certificats": []}
+    }
+    
+    for validate in (False, True):
+        response_cache.clear()
+        mock_mongodb.get_all_candidatures.return_value = [json.loads(json.dumps(legacy))]
+        with patch("src.api.app.settings.api_validate_responses", validate):
+            response = client.get("/candidatures")
+        
+        assert response.status_code == 200
+        documents = response.json()[0]["documents"]
+        assert documents["cv"][0]["texte"] == "Texte du CV"
+        assert documents["cover_letter"] == []
+
+
 def test_search_candidatures_no_params(client, mock_mongodb):
     """Test de recherche sans paramètres (doit échouer)"""
     response = client.get("/candidatures/search")
@@ -115,3 +276,132 @@ def test_search_candidatures_not_found(client, mock_mongodb):
     data = response.json()
     assert len(data) == 0
 
+
+
+def test_get_all_candidatures_pagination(client, mock_mongodb, sample_candidature_data):
+    """Test de la pagination par curseur"""
+    page = [
+        {**sample_candidature_data, "_id": "6718f0c2a1b2c3d4e5f60701"},
+        {**sample_candidature_data, "_id": "6718f0c2a1b2c3d4e5f60702"}
+    ]
+    mock_mongodb.get_all_candidatures.return_value = page
+    
+    response = client.get("/candidatures?limit=2&fields=first_name,last_name")
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Next-Cursor"] == "6718f0c2a1b2c3d4e5f60702"
+    assert "after=6718f0c2a1b2c3d4e5f60702" in response.headers["Link"]
+    mock_mongodb.get_all_candidatures.assert_called_once_with(
+        limit=2,
+        after=None,
+        fields=["first_name", "last_name"],
+        expand_offre=False
+    )
+
+
+def test_get_all_candidatures_last_page(client, mock_mongodb, sample_candidature_data):
+    """Test qu'aucun curseur n'est renvoyé sur la dernière page"""
+    mock_mongodb.get_all_candidatures.return_value = [sample_candidature_data]
+    
+    response = client.get("/candidatures?limit=2&after=6718f0c2a1b2c3d4e5f60702")
+    
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_all_candidatures_without_limit_returns_everything(client, mock_mongodb, sample_candidature_data):
+    """Test que sans paramètre de pagination la liste n'est pas tronquée"""
+    mock_mongodb.get_all_candidatures.return_value = [sample_candidature_data]
+    
+    response = client.get("/candidatures")
+    
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    assert mock_mongodb.get_all_candidatures.call_args.kwargs["limit"] is None
+
+
+def test_get_all_candidatures_paginate_envelope(client, mock_mongodb, sample_candidature_data):
+    """Test du curseur de la page suivante dans le corps de la réponse"""
+    mock_mongodb.get_all_candidatures.return_value = [
+        {**sample_candidature_data, "_id": "6718f0c2a1b2c3d4e5f60701"},
+        {**sample_candidature_data, "_id": "6718f0c2a1b2c3d4e5f60702"}
+    ]
+    
+    for validate in (False, True):
+        response_cache.clear()
+        with patch("src.api.app.settings.api_validate_responses", validate):
+            response = client.get("/candidatures?paginate=true&limit=2")
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["_id"] for item in body["items"]] == [
+            "6718f0c2a1b2c3d4e5f60701", "6718f0c2a1b2c3d4e5f60702"
+        ]
+        assert body["next"] == "6718f0c2a1b2c3d4e5f60702"
+
+
+def test_get_all_candidatures_paginate_default_page_size(client, mock_mongodb):
+    """Test de la taille de page par défaut et de la fin de liste"""
+    mock_mongodb.get_all_candidatures.return_value = []
+    
+    response = client.get("/candidatures?paginate=true")
+    
+    assert response.json() == {"items": [], "next": None}
+    assert mock_mongodb.get_all_candidatures.call_args.kwargs["limit"] == 100
+
+
+def test_get_all_candidatures_rejects_id_exclusion(client, mock_mongodb):
+    """Test que _id, curseur de pagination, ne peut pas être exclu"""
+    response = client.get("/candidatures?limit=2&fields=-_id")
+    
+    assert response.status_code == 400
+    mock_mongodb.get_all_candidatures.assert_not_called()
+
+
+def test_get_all_candidatures_invalid_cursor(client, mock_mongodb):
+    """Test avec un curseur invalide"""
+    response = client.get("/candidatures?after=pas-un-id")
+    
+    assert response.status_code == 400
+    mock_mongodb.get_all_candidatures.assert_not_called()
+
+
+def test_export_candidatures_ndjson(client, mock_mongodb, sample_candidature_data):
+    """Test de l'export NDJSON en flux"""
+    mock_mongodb.iter_candidatures = MagicMock(return_value=_aiter([
+        {**sample_candidature_data, "_id": "1"},
+        {**sample_candidature_data, "_id": "2", "first_name": "Élise"}
+    ]))
+    
+    response = client.get("/candidatures/export?fields=-documents")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["_id"] for line in lines] == ["1", "2"]
+    assert lines[1]["first_name"] == "Élise"
+    assert mock_mongodb.iter_candidatures.call_args.kwargs["fields"] == ["-documents"]
+
+
+def test_export_candidatures_expand_offre(client, mock_mongodb, sample_candidature_data):
+    """Test que l'export transmet expand_offre au parcours par lots"""
+    mock_mongodb.iter_candidatures = MagicMock(return_value=_aiter([sample_candidature_data]))
+    
+    response = client.get("/candidatures/export?expand_offre=true")
+    
+    assert response.status_code == 200
+    assert json.loads(response.text.strip())["offre"]["questions_mtp"]["metier"][0] == "Question M1"
+    assert mock_mongodb.iter_candidatures.call_args.kwargs["expand_offre"] is True
+
+
+def test_export_candidatures_gzip(client, mock_mongodb, sample_candidature_data):
+    """Test de l'export NDJSON compressé"""
+    mock_mongodb.iter_candidatures = MagicMock(return_value=_aiter([sample_candidature_data]))
+    
+    response = client.get("/candidatures/export?gzip=true")
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx décompresse automatiquement le corps
+    assert json.loads(response.text.strip())["first_name"] == "Jean"
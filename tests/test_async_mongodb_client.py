@@ -0,0 +1,157 @@
+"""
+Tests pour le client MongoDB asynchrone (motor)
+"""
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from bson import ObjectId
+from src.database.async_mongodb_client import AsyncMongoDBClient
+
+
+@pytest.fixture
+def async_client():
+    """Fixture pour le client asynchrone avec une collection simulée"""
+    client = AsyncMongoDBClient()
+    client.collection = MagicMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_all_candidatures_awaits_cursor(async_client):
+    """Test que la page est lue via le curseur asynchrone"""
+    last_id = ObjectId()
+    cursor = async_client.collection.find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(return_value=[{"_id": ObjectId(), "first_name": "Jean"}])
+    
+    page = await async_client.get_all_candidatures(limit=5, after=str(last_id))
+    
+    async_client.collection.find.assert_called_once_with({"_id": {"$gt": last_id}}, None)
+    assert page[0]["first_name"] == "Jean"
+    assert isinstance(page[0]["_id"], str)
+
+
+@pytest.mark.asyncio
+async def test_search_candidatures(async_client):
+    """Test de la recherche asynchrone par prénom"""
+    cursor = async_client.collection.find.return_value
+    cursor.to_list = AsyncMock(return_value=[{"_id": ObjectId(), "first_name": "Jean"}])
+    
+    results = await async_client.search_candidatures(first_name="Jean")
+    
+    assert len(results) == 1
+    assert async_client.collection.find.call_args.args[0] == {
+        "first_name_normalized": {"$regex": "^jean"}
+    }
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_text_index(async_client):
+    """Test de la recherche plein texte via l'index $text"""
+    cursor = async_client.collection.find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(return_value=[{
+        "_id": ObjectId(),
+        "application_id": "app-1",
+        "first_name": "Jean",
+        "score": 1.5,
+        "documents": {"cv": "Comptable confirmé"}
+    }])
+    
+    results = await async_client.fulltext_search("comptable", limit=5)
+    
+    assert async_client.collection.find.call_args.args[0] == {"$text": {"$search": "comptable"}}
+    assert results[0]["application_id"] == "app-1"
+    assert results[0]["snippets"] == [{"field": "cv", "text": "<mark>Comptable</mark> confirmé"}]
+    assert "documents" not in results[0]
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_inverted_index(async_client, monkeypatch):
+    """Test de la recherche plein texte via l'index inversé"""
+    monkeypatch.setattr("src.database.async_mongodb_client.settings.fulltext_backend", "inverted")
+    async_client.terms = MagicMock()
+    async_client.terms.find.return_value.to_list = AsyncMock(return_value=[
+        {"term": "comptable", "application_id": "app-1", "tf": 1},
+        {"term": "comptable", "application_id": "app-2", "tf": 4}
+    ])
+    async_client.collection.estimated_document_count = AsyncMock(return_value=10)
+    async_client.collection.find.return_value.to_list = AsyncMock(return_value=[
+        {"_id": ObjectId(), "application_id": "app-1", "documents": {}},
+        {"_id": ObjectId(), "application_id": "app-2", "documents": {}}
+    ])
+    
+    results = await async_client.fulltext_search("Comptable")
+    
+    assert async_client.terms.find.call_args.args[0] == {"term": {"$in": ["comptable"]}}
+    assert [result["application_id"] for result in results] == ["app-2", "app-1"]
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_without_terms(async_client):
+    """Test qu'une requête composée de mots vides ne touche pas la base"""
+    assert await async_client.fulltext_search("de la") == []
+    async_client.collection.find.assert_not_called()
+
+
+def test_pool_stats_listener_counts_connections(async_client):
+    """Test des compteurs du pool de connexions"""
+    listener = async_client.pool_listener
+    listener.connection_created(None)
+    listener.connection_created(None)
+    listener.connection_checked_out(None)
+    listener.connection_closed(None)
+    
+    stats = async_client.get_pool_stats()
+    
+    assert stats == {"open": 1, "in_use": 1, "created": 2, "checkout_failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_inline_offres_single_lookup(async_client):
+    """Test que les offres d'une page sont lues en une requête et fusionnées"""
+    async_client.offres = MagicMock()
+    async_client.offres.find.return_value.to_list = AsyncMock(return_value=[
+        {"_id": "job-1", "intitule": "Comptable", "missions_principales": "<p>Missions</p>"}
+    ])
+    candidatures = [
+        {"_id": "a", "offre_id": "job-1", "offre": {"intitule": "Comptable", "date_publication": "2025-10-01"}},
+        {"_id": "b", "offre_id": "job-1", "offre": {"intitule": "Comptable", "date_publication": "2025-10-02"}},
+        {"_id": "c", "offre": {"intitule": "Ancienne offre copiée"}}
+    ]
+    
+    await async_client.inline_offres(candidatures)
+    
+    async_client.offres.find.assert_called_once_with({"_id": {"$in": ["job-1"]}})
+    assert candidatures[0]["offre"]["missions_principales"] == "<p>Missions</p>"
+    assert candidatures[1]["offre"]["date_publication"] == "2025-10-02"
+    assert candidatures[2]["offre"] == {"intitule": "Ancienne offre copiée"}
+
+
+def test_projection_keeps_offre_id_when_expanding(async_client):
+    """Test que la projection conserve offre_id pour la jointure"""
+    assert AsyncMongoDBClient._projection(["first_name"], True) == {"first_name": 1, "offre_id": 1}
+    assert AsyncMongoDBClient._projection(["-documents"], True) == {"documents": 0}
+    assert AsyncMongoDBClient._projection(None, True) is None
+
+
+@pytest.mark.asyncio
+async def test_iter_candidatures_expands_offres_per_batch(async_client):
+    """Test que l'export lit les offres une fois par lot de candidatures"""
+    cursor = async_client.collection.find.return_value.sort.return_value
+    cursor.__aiter__.return_value = [
+        {"_id": ObjectId(), "offre_id": f"job-{i}", "offre": {"intitule": f"Poste {i}"}}
+        for i in range(3)
+    ]
+    cursor.close = AsyncMock()
+    async_client.offres = MagicMock()
+    async_client.offres.find.return_value.to_list = AsyncMock(side_effect=[
+        [{"_id": "job-0", "missions_principales": "M0"},
+         {"_id": "job-1", "missions_principales": "M1"}],
+        [{"_id": "job-2", "missions_principales": "M2"}]
+    ])
+    
+    exported = [c async for c in async_client.iter_candidatures(batch_size=2, expand_offre=True)]
+    
+    assert [c["offre"]["missions_principales"] for c in exported] == ["M0", "M1", "M2"]
+    assert async_client.offres.find.call_count == 2
+    first_lookup = async_client.offres.find.call_args_list[0].args[0]
+    assert sorted(first_lookup["_id"]["$in"]) == ["job-0", "job-1"]
+    cursor.close.assert_awaited_once()
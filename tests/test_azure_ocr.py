@@ -0,0 +1,164 @@
+"""
+Tests pour le service OCR Azure
+"""
+import asyncio
+import io
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+from tenacity import wait_none
+from src.services.azure_ocr import AzureOCRService, OCRTransientError, is_retryable_error
+from src.services.ocr_cache import OCRCache
+
+
+@pytest.fixture
+def ocr_service(tmp_path):
+    """Fixture pour le service OCR avec un client Azure simulé"""
+    service = AzureOCRService()
+    service.client = MagicMock()
+    service.cache = OCRCache(tmp_path / "cache", max_size_bytes=1024 * 1024)
+    return service
+
+
+def _mock_poller(content: str):
+    """Construit un poller asynchrone retournant un résultat avec contenu"""
+    poller = MagicMock()
+    poller.result = AsyncMock(return_value=MagicMock(content=content))
+    return poller
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_file(ocr_service, tmp_path):
+    """Test d'extraction asynchrone depuis un fichier"""
+    file_path = tmp_path / "cv.pdf"
+    file_path.write_bytes(b"%PDF-1.4 contenu")
+    ocr_service.client.begin_analyze_document = AsyncMock(
+        return_value=_mock_poller("Texte du CV")
+    )
+    
+    text = await ocr_service.extract_text_from_file(file_path)
+    
+    assert text == "Texte du CV"
+    ocr_service.client.begin_analyze_document.assert_awaited_once_with(
+        model_id="prebuilt-read",
+        document=b"%PDF-1.4 contenu"
+    )
+
+
+@pytest.mark.asyncio
+async def test_extract_text_missing_file(ocr_service, tmp_path):
+    """Test avec un fichier inexistant"""
+    text = await ocr_service.extract_text_from_file(tmp_path / "absent.pdf")
+    
+    assert text == ""
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_retries(ocr_service):
+    """Test que les erreurs transitoires déclenchent une nouvelle tentative"""
+    ocr_service.client.begin_analyze_document = AsyncMock(
+        side_effect=[ServiceResponseError("timeout"), _mock_poller("OK")]
+    )
+    analyze = AzureOCRService._analyze_document.retry_with(wait=wait_none())
+    
+    result = await analyze(ocr_service, b"data")
+    
+    assert result.content == "OK"
+    assert ocr_service.client.begin_analyze_document.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_extract_text_uses_cache(ocr_service, tmp_path):
+    """Test qu'un document inchangé n'est analysé qu'une seule fois"""
+    file_path = tmp_path / "cv.pdf"
+    file_path.write_bytes(b"%PDF-1.4 contenu")
+    ocr_service.client.begin_analyze_document = AsyncMock(
+        return_value=_mock_poller("Texte du CV")
+    )
+    
+    first = await ocr_service.extract_text_from_file(file_path)
+    second = await ocr_service.extract_text_from_file(file_path)
+    
+    assert first == second == "Texte du CV"
+    assert ocr_service.client.begin_analyze_document.await_count == 1
+    assert ocr_service.get_cache_stats() == {"hits": 1, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_buffer(ocr_service):
+    """Test d'extraction depuis un tampon, sans fichier sur disque"""
+    buffer = io.BytesIO(b"%PDF-1.4 contenu")
+    ocr_service.client.begin_analyze_document = AsyncMock(
+        return_value=_mock_poller("Texte du CV")
+    )
+    
+    text = await ocr_service.extract_text(buffer, "cv.pdf")
+    cached = await ocr_service.extract_text(b"%PDF-1.4 contenu", "cv.pdf")
+    
+    assert text == cached == "Texte du CV"
+    ocr_service.client.begin_analyze_document.assert_awaited_once_with(
+        model_id="prebuilt-read",
+        document=buffer
+    )
+    assert buffer.tell() == 0
+
+
+def _http_error(status_code: int) -> HttpResponseError:
+    """Erreur HTTP Azure avec le statut donné"""
+    error = HttpResponseError(message=f"HTTP {status_code}")
+    error.status_code = status_code
+    return error
+
+
+@pytest.mark.asyncio
+async def test_extract_text_propagates_throttling(ocr_service):
+    """Test qu'un 429 persistant est propagé au lieu d'un texte vide"""
+    ocr_service.client.begin_analyze_document = AsyncMock(side_effect=_http_error(429))
+    analyze = AzureOCRService._analyze_document.retry_with(wait=wait_none())
+    
+    with patch.object(AzureOCRService, "_analyze_document", analyze), \
+            pytest.raises(OCRTransientError):
+        await ocr_service.extract_text(b"%PDF-1.4 contenu", "cv.pdf")
+    
+    assert ocr_service.client.begin_analyze_document.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_extract_text_invalid_document_not_retried(ocr_service):
+    """Test qu'un document refusé par Azure n'est pas relancé"""
+    ocr_service.client.begin_analyze_document = AsyncMock(side_effect=_http_error(400))
+    
+    text = await ocr_service.extract_text(b"pas un pdf", "cv.pdf")
+    
+    assert text == ""
+    assert ocr_service.client.begin_analyze_document.await_count == 1
+
+
+def test_observe_response_feeds_rate_limiter(ocr_service):
+    """Test que les réponses Azure ajustent le limiteur partagé"""
+    limiter = ocr_service.rate_limiter
+    throttled = MagicMock()
+    throttled.http_response.status_code = 429
+    throttled.http_response.headers = {"retry-after": "2"}
+    
+    ocr_service._observe_response(throttled)
+    assert limiter.rate == limiter.max_rate / 2
+    assert limiter.blocked_until > 0
+    
+    accepted = MagicMock()
+    accepted.http_response.status_code = 202
+    accepted.http_request.method = "POST"
+    ocr_service._observe_response(accepted)
+    assert limiter.rate == limiter.max_rate / 2 + limiter.increase_step
+
+
+def test_is_retryable_error_whitelist():
+    """Test que seules les erreurs réseau et les 408/429/5xx sont relancées"""
+    assert is_retryable_error(_http_error(429))
+    assert is_retryable_error(_http_error(503))
+    assert is_retryable_error(ServiceRequestError("connexion refusée"))
+    assert is_retryable_error(asyncio.TimeoutError())
+    
+    assert not is_retryable_error(_http_error(400))
+    assert not is_retryable_error(AttributeError("bug"))
+    assert not is_retryable_error(KeyError("content"))
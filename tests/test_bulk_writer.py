@@ -0,0 +1,111 @@
+"""
+Tests pour l'écriture groupée des candidatures
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from pymongo.errors import BulkWriteError
+from src.database.bulk_writer import CandidatureBulkWriter
+
+
+def _bulk_result(upserted_ids, matched_count=0):
+    """Construit un résultat bulk_write simulé"""
+    result = MagicMock()
+    result.upserted_ids = upserted_ids
+    result.matched_count = matched_count
+    return result
+
+
+@pytest.mark.asyncio
+async def test_upserts_sent_in_one_batch():
+    """Test que les upserts d'un lot complet partent en un seul bulk_write"""
+    collection = MagicMock()
+    collection.bulk_write.return_value = _bulk_result({0: "id-a", 2: "id-c"}, matched_count=1)
+    writer = CandidatureBulkWriter(collection, batch_size=3, flush_interval=60)
+    
+    results = await asyncio.gather(
+        writer.upsert({"application_id": "a"}, {"first_name": "A"}),
+        writer.upsert({"application_id": "b"}, {"first_name": "B"}),
+        writer.upsert({"application_id": "c"}, {"first_name": "C"})
+    )
+    
+    assert results == ["id-a", None, "id-c"]
+    collection.bulk_write.assert_called_once()
+    operations = collection.bulk_write.call_args.args[0]
+    assert len(operations) == 3
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert writer.stats["upserted"] == 2
+    assert writer.stats["matched"] == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_flushed_by_interval():
+    """Test qu'un lot incomplet est envoyé après l'intervalle"""
+    collection = MagicMock()
+    collection.bulk_write.return_value = _bulk_result({0: "id-a"})
+    writer = CandidatureBulkWriter(collection, batch_size=50, flush_interval=0.01)
+    writer.start()
+    
+    try:
+        result = await asyncio.wait_for(
+            writer.upsert({"application_id": "a"}, {"first_name": "A"}),
+            timeout=1
+        )
+    finally:
+        await writer.close()
+    
+    assert result == "id-a"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_filters_deduplicated():
+    """Test que deux upserts du même candidat ne donnent qu'une opération"""
+    collection = MagicMock()
+    collection.bulk_write.return_value = _bulk_result({0: "id-a"})
+    writer = CandidatureBulkWriter(collection, batch_size=2, flush_interval=60)
+    
+    results = await asyncio.gather(
+        writer.upsert({"application_id": "a"}, {"first_name": "Ancien"}),
+        writer.upsert({"application_id": "a"}, {"first_name": "Nouveau"})
+    )
+    
+    operations = collection.bulk_write.call_args.args[0]
+    assert len(operations) == 1
+    assert operations[0]._doc == {"$set": {"first_name": "Nouveau"}}
+    assert results == ["id-a", "id-a"]
+
+
+@pytest.mark.asyncio
+async def test_write_errors_propagated_per_operation():
+    """Test que seules les opérations en erreur échouent"""
+    collection = MagicMock()
+    collection.bulk_write.side_effect = BulkWriteError({
+        "upserted": [{"index": 0, "_id": "id-a"}],
+        "nMatched": 0,
+        "writeErrors": [{"index": 1, "errmsg": "quota dépassé"}]
+    })
+    writer = CandidatureBulkWriter(collection, batch_size=2, flush_interval=60)
+    
+    results = await asyncio.gather(
+        writer.upsert({"application_id": "a"}, {}),
+        writer.upsert({"application_id": "b"}, {}),
+        return_exceptions=True
+    )
+    
+    assert results[0] == "id-a"
+    assert isinstance(results[1], RuntimeError)
+    assert writer.stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_on_flush_called_after_successful_batch():
+    """Test du rappel après écriture (invalidation du cache de l'API)"""
+    collection = MagicMock()
+    collection.bulk_write.return_value = _bulk_result({0: "id-a"})
+    on_flush = MagicMock()
+    writer = CandidatureBulkWriter(collection, batch_size=1, flush_interval=60, on_flush=on_flush)
+    
+    await writer.upsert({"application_id": "a"}, {"first_name": "A"})
+    await writer.flush()
+    
+    on_flush.assert_called_once()
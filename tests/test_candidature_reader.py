@@ -0,0 +1,68 @@
+"""
+Tests pour la lecture en flux des exports de candidatures
+"""
+import json
+import pytest
+from src.processor import candidature_reader
+from src.processor.candidature_reader import iter_candidatures
+
+
+CANDIDATS = [
+    {"first_name": "Teddy Osée ", "documents": [{"type": "cv", "url": "a/cv.pdf"}]},
+    {"first_name": "Jean", "job_description": "<p>Texte avec ] et , et \\\"</p>"},
+    {"first_name": "Alice", "reponses_mtp_candidat": {"metier": ["[{x}]"]}}
+]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Force des blocs minuscules pour couvrir les coupures en plein élément"""
+    monkeypatch.setattr(candidature_reader, "CHUNK_SIZE", 5)
+
+
+def test_iter_json_array(tmp_path, small_chunks):
+    """Test de lecture d'un tableau JSON"""
+    json_file = tmp_path / "export.json"
+    json_file.write_text(json.dumps(CANDIDATS, indent=2, ensure_ascii=False), encoding="utf-8")
+    
+    assert list(iter_candidatures(json_file)) == CANDIDATS
+
+
+def test_iter_json_lines(tmp_path, small_chunks):
+    """Test de lecture d'un fichier JSONL"""
+    json_file = tmp_path / "export.jsonl"
+    json_file.write_text(
+        "\n".join(json.dumps(c, ensure_ascii=False) for c in CANDIDATS) + "\n\n",
+        encoding="utf-8"
+    )
+    
+    assert list(iter_candidatures(json_file)) == CANDIDATS
+
+
+def test_iter_is_lazy(tmp_path):
+    """Test que le premier candidat est disponible avant la fin du fichier"""
+    json_file = tmp_path / "export.json"
+    json_file.write_text('[{"first_name": "Jean"}, {"first_name": ', encoding="utf-8")
+    
+    iterator = iter_candidatures(json_file)
+    
+    assert next(iterator) == {"first_name": "Jean"}
+    with pytest.raises(json.JSONDecodeError):
+        next(iterator)
+
+
+def test_iter_empty_array(tmp_path):
+    """Test d'un tableau vide"""
+    json_file = tmp_path / "export.json"
+    json_file.write_text("  [ ]  ", encoding="utf-8")
+    
+    assert list(iter_candidatures(json_file)) == []
+
+
+def test_iter_invalid_format(tmp_path):
+    """Test d'un fichier qui n'est ni un tableau ni du JSONL"""
+    json_file = tmp_path / "export.json"
+    json_file.write_text('"texte"', encoding="utf-8")
+    
+    with pytest.raises(ValueError):
+        list(iter_candidatures(json_file))
@@ -0,0 +1,106 @@
+"""
+Tests pour la compression des réponses de l'API
+"""
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from src.api.compression import CompressionMiddleware, negotiate_encoding, brotli
+
+
+LARGE_TEXT = "Texte OCR du CV, très répétitif et donc compressible. " * 200
+
+
+@pytest.fixture
+def client():
+    """Application minimale avec le middleware de compression"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, gzip_level=6)
+    
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_TEXT)
+    
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+    
+    @app.get("/encoded")
+    async def encoded():
+        return PlainTextResponse(
+            gzip.compress(LARGE_TEXT.encode()),
+            headers={"Content-Encoding": "gzip"}
+        )
+    
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(50):
+                yield f'{{"ligne": {i}, "texte": "{LARGE_TEXT[:200]}"}}\n'.encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    """Test de la négociation Accept-Encoding"""
+    assert negotiate_encoding("gzip, deflate", brotli_available=False) == "gzip"
+    assert negotiate_encoding("gzip, br", brotli_available=True) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", brotli_available=True) == "gzip"
+    assert negotiate_encoding("br", brotli_available=False) is None
+    assert negotiate_encoding("*", brotli_available=False) == "gzip"
+    assert negotiate_encoding("gzip;q=0", brotli_available=False) is None
+    assert negotiate_encoding("", brotli_available=True) is None
+
+
+def test_large_response_gzipped(client):
+    """Test de la compression d'une réponse volumineuse"""
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LARGE_TEXT.encode()) / 5
+    assert response.text == LARGE_TEXT
+
+
+def test_small_response_not_compressed(client):
+    """Test du seuil minimal de compression"""
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_identity_when_not_accepted(client):
+    """Test sans Accept-Encoding compatible"""
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE_TEXT
+
+
+def test_already_encoded_response_not_recompressed(client):
+    """Test qu'une réponse déjà gzip n'est pas compressée deux fois"""
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == LARGE_TEXT
+
+
+def test_streaming_response_compressed_by_chunk(client):
+    """Test de la compression d'un flux NDJSON"""
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 50
+
+
+@pytest.mark.skipif(brotli is None, reason="Module brotli non installé")
+def test_large_response_brotli(client):
+    """Test de la compression Brotli"""
+    response = client.get("/large", headers={"Accept-Encoding": "br"})
+    
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == LARGE_TEXT
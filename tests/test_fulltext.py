@@ -0,0 +1,86 @@
+"""
+Tests pour la recherche plein texte (tokenisation, classement, extraits)
+"""
+from src.database.fulltext import tokenize, build_postings, rank_postings, make_snippets
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    """Test de la normalisation des termes"""
+    assert tokenize("Ingénieur en Électricité, 5 ans d'expérience") == [
+        "ingenieur", "electricite", "ans", "experience"
+    ]
+    assert tokenize(None) == []
+
+
+def test_build_postings_counts_terms_across_documents():
+    """Test des entrées de l'index inversé d'une candidature"""
+    postings = build_postings("app-1", {
+        "cv": "Comptable confirmé",
+        "cover_letter": "Poste de comptable",
+        "diplome": None
+    })
+    
+    by_term = {posting["term"]: posting for posting in postings}
+    assert by_term["comptable"] == {"term": "comptable", "application_id": "app-1", "tf": 2}
+    assert by_term["poste"]["tf"] == 1
+
+
+def test_rank_postings_prefers_rare_and_frequent_terms():
+    """Test du classement TF-IDF"""
+    postings = [
+        {"term": "comptable", "application_id": "app-1", "tf": 1},
+        {"term": "comptable", "application_id": "app-2", "tf": 3},
+        {"term": "audit", "application_id": "app-1", "tf": 1}
+    ]
+    
+    ranked = rank_postings(postings, total_documents=10, limit=10)
+    
+    assert [item["application_id"] for item in ranked] == ["app-1", "app-2"]
+    assert rank_postings(postings, total_documents=10, limit=1)[0]["application_id"] == "app-1"
+
+
+def test_make_snippets_highlights_terms():
+    """Test des extraits surlignés"""
+    documents = {
+        "cv": "Expérience : " + "x " * 50 + "Ingénieur électricité chez SEEG " + "y " * 50,
+        "cover_letter": "Sans rapport"
+    }
+    
+    snippets = make_snippets(documents, ["electricite"])
+    
+    assert len(snippets) == 1
+    assert snippets[0]["field"] == "cv"
+    assert "<mark>électricité</mark>" in snippets[0]["text"]
+    assert snippets[0]["text"].startswith("…")
+    assert snippets[0]["text"].endswith("…")
+
+
+def test_document_lists_indexed_and_highlighted():
+    """Test que tous les documents d'un même type sont indexés"""
+    documents = {
+        "diplome": [
+            {"id": "d1", "nom_fichier": "BAC.pdf", "texte": "Baccalauréat série C"},
+            {"id": "d2", "nom_fichier": "Bachelor.pdf", "texte": "Bachelor comptabilité"}
+        ],
+        "cv": [{"id": "d3", "nom_fichier": "CV.pdf", "texte": None}]
+    }
+    
+    terms = {posting["term"] for posting in build_postings("app-1", documents)}
+    snippets = make_snippets(documents, ["comptabilite"])
+    
+    assert {"baccalaureat", "bachelor", "comptabilite"} <= terms
+    assert snippets == [{"field": "diplome", "text": "Bachelor <mark>comptabilité</mark>"}]
+
+
+def test_make_snippets_escapes_html():
+    """Test que le balisage présent dans le texte OCR est échappé"""
+    documents = {
+        "cv": [{"id": "d1", "nom_fichier": "CV.pdf",
+                "texte": "Technicien <img src=x onerror=alert(1)> réseau & télécoms"}]
+    }
+    
+    snippets = make_snippets(documents, ["reseau"])
+    
+    assert snippets[0]["text"] == (
+        "Technicien &lt;img src=x onerror=alert(1)&gt; <mark>réseau</mark> &amp; télécoms"
+    )
@@ -0,0 +1,54 @@
+"""
+Tests pour la surveillance de la base (sondes de santé)
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from src.api.health import HealthMonitor
+
+
+@pytest.mark.asyncio
+async def test_check_records_latency():
+    """Test d'un ping réussi"""
+    monitor = HealthMonitor(ping=AsyncMock(return_value=0.0042), interval=10)
+    
+    assert await monitor.check() is True
+    assert monitor.is_ready()
+    snapshot = monitor.snapshot()
+    assert snapshot["ping_ok"] is True
+    assert snapshot["ping_latency_ms"] == 4.2
+    assert snapshot["last_error"] is None
+
+
+@pytest.mark.asyncio
+async def test_check_failure_not_ready():
+    """Test d'un ping en échec"""
+    monitor = HealthMonitor(ping=AsyncMock(side_effect=ConnectionError("timeout")), interval=10)
+    
+    assert await monitor.check() is False
+    assert not monitor.is_ready()
+    assert monitor.snapshot()["last_error"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_stale_result_not_ready():
+    """Test qu'un ping trop ancien n'est plus considéré comme disponible"""
+    monitor = HealthMonitor(ping=AsyncMock(return_value=0.001), interval=10)
+    await monitor.check()
+    monitor.last_check -= 31
+    
+    assert not monitor.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_background_refresh():
+    """Test du rafraîchissement périodique en arrière-plan"""
+    ping = AsyncMock(return_value=0.001)
+    monitor = HealthMonitor(ping=ping, interval=0.01)
+    
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    
+    assert ping.await_count >= 2
+    assert monitor.is_ready()
@@ -0,0 +1,96 @@
+"""
+Tests pour la file de travail persistante du traitement par lots
+"""
+import pytest
+from src.processor.job_queue import JobQueue, PENDING, DOWNLOADED, OCR_DONE, STORED, FAILED
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """File de travail dans un fichier temporaire"""
+    job_queue = JobQueue(tmp_path / "jobs.db")
+    yield job_queue
+    job_queue.close()
+
+
+def _candidats(*ids):
+    return [{"application_id": app_id, "first_name": app_id.upper()} for app_id in ids]
+
+
+def test_sync_keeps_state_of_unchanged_candidates(queue):
+    """Test qu'un nouvel export ne remet en attente que les candidatures modifiées"""
+    queue.sync(_candidats("a", "b", "c"))
+    queue.mark_candidate("a", STORED)
+    queue.mark_candidate("b", FAILED, error="429")
+    
+    modified = _candidats("a", "b", "c", "d")
+    modified[2]["first_name"] = "Modifié"
+    counts = queue.sync(modified)
+    
+    assert counts == {"added": 1, "changed": 1, "unchanged": 2}
+    assert [c["_job_key"] for c in queue.iter_candidates()] == ["c", "d"]
+    assert [c["_job_key"] for c in queue.iter_candidates(retry_failed=True)] == ["b"]
+    assert queue.get_counts()["candidates"] == {
+        PENDING: 2, DOWNLOADED: 0, OCR_DONE: 0, STORED: 1, FAILED: 1
+    }
+
+
+def test_iter_candidates_follows_export_and_drops_removed(queue, monkeypatch):
+    """Test de l'ordre de reprise (par pages) et de l'oubli des candidatures retirées"""
+    monkeypatch.setattr("src.processor.job_queue.PAGE_SIZE", 2)
+    queue.sync(_candidats("a", "b", "c", "d", "e"))
+    queue.sync(_candidats("e", "c", "a", "x"))
+    
+    resumed = list(queue.iter_candidates())
+    
+    assert [c["_job_key"] for c in resumed] == ["e", "c", "a", "x"]
+    assert resumed[0]["first_name"] == "E"
+
+
+def test_candidate_without_application_id_keyed_by_position(queue):
+    """Test de la clé de repli sans application_id"""
+    queue.sync([{"first_name": "Jean"}, {"first_name": "Marie"}])
+    
+    assert [c["_job_key"] for c in queue.iter_candidates()] == ["#1", "#2"]
+
+
+def test_document_texts_kept_until_candidate_stored(queue):
+    """Test que les textes OCR survivent à une interruption puis sont libérés"""
+    queue.sync(_candidats("a"))
+    queue.mark_document("a", "d1", DOWNLOADED)
+    queue.mark_document("a", "d1", OCR_DONE, texte="Texte CV")
+    queue.mark_document("a", "d2", DOWNLOADED)
+    
+    assert queue.get_document_texts("a") == {"d1": "Texte CV"}
+    
+    assert queue.mark_candidate("a", STORED) == STORED
+    
+    assert queue.get_document_texts("a") == {}
+    assert queue.get_counts()["documents"][STORED] == 2
+
+
+def test_candidate_with_failed_document_kept_for_retry(queue):
+    """Test qu'un document en échec empêche l'état stored et reste à reprendre"""
+    queue.sync(_candidats("a"))
+    queue.mark_document("a", "d1", OCR_DONE, texte="Texte CV")
+    queue.mark_document("a", "d2", FAILED, error="Aucun texte extrait")
+    
+    assert queue.mark_candidate("a", STORED) == FAILED
+    
+    counts = queue.get_counts()
+    assert counts["candidates"][FAILED] == 1
+    assert counts["documents"][FAILED] == 1
+    assert queue.get_document_texts("a") == {"d1": "Texte CV"}
+    assert [c["application_id"] for c in queue.iter_candidates(retry_failed=True)] == ["a"]
+
+
+def test_failures_count_attempts(queue):
+    """Test du compteur de tentatives des candidatures en échec"""
+    queue.sync(_candidats("a"))
+    queue.mark_candidate("a", FAILED, error="timeout")
+    queue.mark_candidate("a", FAILED, error="429")
+    
+    row = queue.connection.execute(
+        "SELECT attempts, error FROM candidates WHERE key = 'a'"
+    ).fetchone()
+    assert (row["attempts"], row["error"]) == (2, "429")
@@ -0,0 +1,90 @@
+"""
+Tests pour la migration directe vers Cosmos DB
+"""
+import json
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from migrate_direct_to_cosmos import migrate_direct_to_cosmos
+from src.database.mongodb_client import mongodb_client
+
+
+LOCAL = "mongodb://local"
+COSMOS = "mongodb://cosmos"
+
+
+class FakeMongoClient:
+    """Client MongoDB factice : une collection MagicMock distincte par nom"""
+    
+    def __init__(self, connection_string, *args, **kwargs):
+        self.connection_string = connection_string
+        self.admin = MagicMock()
+        self.databases = {}
+    
+    def __getitem__(self, name):
+        return self.databases.setdefault(name, FakeDatabase())
+    
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+    
+    def __getitem__(self, name):
+        if name not in self.collections:
+            collection = MagicMock()
+            collection.find_one.return_value = None
+            collection.count_documents.return_value = 0
+            self.collections[name] = collection
+        return self.collections[name]
+
+
+@pytest.mark.asyncio
+async def test_migration_writes_every_collection_to_cosmos(tmp_path, monkeypatch):
+    """Test que candidatures, offres, index plein texte et versions vont dans Cosmos DB"""
+    data_folder = tmp_path / "data"
+    data_folder.mkdir()
+    (data_folder / "Donnees_candidatures_SEEG.json").write_text(json.dumps([
+        {"application_id": "app-1", "first_name": "Jean", "last_name": "Dupont",
+         "job_id": "job-1", "job_title": "Comptable", "job_description": "<p>Long</p>",
+         "documents": []}
+    ]), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    for name, value in vars(mongodb_client).items():
+        monkeypatch.setattr(mongodb_client, name, value)
+    
+    clients = {}
+    
+    def make_client(connection_string, *args, **kwargs):
+        clients[connection_string] = FakeMongoClient(connection_string)
+        return clients[connection_string]
+    
+    with patch("src.database.mongodb_client.MongoClient", side_effect=make_client), \
+            patch("src.database.mongodb_client.build_connection_string", return_value=LOCAL), \
+            patch("src.database.mongodb_client.settings.fulltext_backend", "inverted"), \
+            patch("src.processor.candidature_processor.settings.fulltext_backend", "inverted"), \
+            patch("src.processor.candidature_processor.supabase_client") as mock_supabase, \
+            patch("src.processor.candidature_processor.azure_ocr_service") as mock_ocr, \
+            patch.object(mongodb_client, "_create_indexes_in_background"):
+        mock_supabase.get_document_urls_from_candidate.return_value = {}
+        mock_supabase.get_document_metadata_from_candidate.return_value = {}
+        mock_supabase.close = AsyncMock()
+        mock_ocr.close = AsyncMock()
+        
+        assert await migrate_direct_to_cosmos(COSMOS) is True
+    
+    cosmos = clients[COSMOS]["SEEG-AI"].collections
+    local = clients[LOCAL]["SEEG-AI"].collections
+    
+    cosmos["candidats"].find_one_and_update.assert_called_once()
+    cosmos["offres"].update_one.assert_called_once()
+    assert cosmos["offres"].update_one.call_args.args[0] == {"_id": "job-1"}
+    cosmos["candidats_terms"].delete_many.assert_called_once_with({"application_id": "app-1"})
+    cosmos["meta"].update_one.assert_called()
+    
+    for name in ("candidats", "offres", "candidats_terms", "meta"):
+        assert not local.get(name, MagicMock()).method_calls
+    
+    # La connexion locale est restaurée après la migration
+    assert mongodb_client.client is clients[LOCAL]
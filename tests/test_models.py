@@ -12,7 +12,8 @@ def test_candidature_creation(sample_candidature_data):
     assert candidature.first_name == "Jean"
     assert candidature.last_name == "Dupont"
     assert candidature.offre.intitule == "Développeur Python Senior"
-    assert candidature.documents.cv == "Texte du CV extrait..."
+    assert candidature.documents.cv[0].texte == "Texte du CV extrait..."
+    assert [d.nom_fichier for d in candidature.documents.diplome] == ["BAC.pdf", "Licence.pdf"]
 
 
 def test_candidature_with_minimal_data():
@@ -41,10 +42,19 @@ def test_documents_optional_fields():
     """Test que les champs documents sont optionnels"""
     docs = Documents()
     
-    assert docs.cv is None
-    assert docs.cover_letter is None
-    assert docs.diplome is None
-    assert docs.certificats is None
+    assert docs.cv == []
+    assert docs.cover_letter == []
+    assert docs.diplome == []
+    assert docs.certificats == []
+
+
+def test_documents_single_text_format():
+    """Test de lecture des candidatures enregistrées avec un texte par type"""
+    docs = Documents(cv="Ancien texte CV", diplome=None)
+    
+    assert docs.cv[0].texte == "Ancien texte CV"
+    assert docs.cv[0].id is None
+    assert docs.diplome == []
 
 
 def test_candidature_serialization(sample_candidature_data):
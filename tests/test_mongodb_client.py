@@ -0,0 +1,202 @@
+"""
+Tests pour le client MongoDB
+"""
+import pytest
+from collections import defaultdict
+from unittest.mock import MagicMock
+from bson import ObjectId
+from pymongo import ReturnDocument
+from src.database.mongodb_client import MongoDBClient, normalize_name
+from src.database.indexes import diff_indexes
+from src.models import Candidature, Offre
+from manage_indexes import build_maintenance_client
+
+
+@pytest.fixture
+def mongo_client():
+    """Fixture pour le client MongoDB avec une collection simulée"""
+    client = MongoDBClient()
+    client.collection = MagicMock()
+    return client
+
+
+def test_upsert_new_candidature_single_round_trip(mongo_client):
+    """Test qu'une insertion retourne l'ID sans lecture supplémentaire"""
+    mongo_client.collection.find_one_and_update.return_value = None
+    
+    candidat_id = mongo_client.insert_or_update_candidature(
+        Candidature(first_name="Jean", last_name="Dupont"),
+        application_id="app-1"
+    )
+    
+    call = mongo_client.collection.find_one_and_update.call_args
+    assert call.args[0] == {"application_id": "app-1"}
+    assert call.kwargs["projection"] == {"_id": 1}
+    assert call.kwargs["upsert"] is True
+    assert call.kwargs["return_document"] == ReturnDocument.BEFORE
+    assert candidat_id == str(call.args[1]["$setOnInsert"]["_id"])
+    mongo_client.collection.find_one.assert_not_called()
+
+
+def test_upsert_existing_candidature_returns_existing_id(mongo_client):
+    """Test qu'une mise à jour retourne l'ID existant sans find_one"""
+    existing_id = ObjectId()
+    mongo_client.collection.find_one_and_update.return_value = {"_id": existing_id}
+    
+    candidat_id = mongo_client.insert_or_update_candidature(
+        Candidature(first_name="Jean", last_name="Dupont"),
+        application_id="app-1"
+    )
+    
+    assert candidat_id == str(existing_id)
+    mongo_client.collection.find_one.assert_not_called()
+
+
+def test_create_indexes_unique_application_id(mongo_client):
+    """Test de la création de l'index unique sur application_id"""
+    mongo_client._create_indexes()
+    
+    models = mongo_client.collection.create_indexes.call_args.args[0]
+    documents = {model.document["name"]: model.document for model in models}
+    assert documents["application_id_1"]["unique"] is True
+    assert "first_name_normalized_1_last_name_normalized_1" in documents
+
+
+def test_diff_indexes(mongo_client):
+    """Test de la comparaison index déclarés / existants"""
+    mongo_client.collection.index_information.return_value = {
+        "_id_": {"key": [("_id", 1)]},
+        "application_id_1": {"key": [("application_id", 1)], "unique": True, "sparse": True},
+        "last_name_normalized_1": {"key": [("last_name_normalized", 1)], "unique": True},
+        "first_name_1": {"key": [("first_name", 1)]}
+    }
+    
+    diff = diff_indexes(mongo_client.collection)
+    
+    assert diff["ok"] == ["application_id_1"]
+    assert diff["mismatched"] == ["last_name_normalized_1"]
+    assert diff["missing"] == [
+        "first_name_normalized_1_last_name_normalized_1",
+        "first_name_1_last_name_1",
+        "documents_text"
+    ]
+    assert diff["extra"] == ["first_name_1"]
+
+
+def test_get_all_candidatures_keyset_page(mongo_client):
+    """Test de la requête paginée par _id avec projection"""
+    last_id = ObjectId()
+    cursor = mongo_client.collection.find.return_value
+    cursor.sort.return_value.limit.return_value = [{"_id": ObjectId(), "first_name": "Jean"}]
+    
+    page = mongo_client.get_all_candidatures(
+        limit=10,
+        after=str(last_id),
+        fields=["-documents"]
+    )
+    
+    mongo_client.collection.find.assert_called_once_with(
+        {"_id": {"$gt": last_id}},
+        {"documents": 0}
+    )
+    cursor.sort.assert_called_once_with("_id", 1)
+    cursor.sort.return_value.limit.assert_called_once_with(10)
+    assert isinstance(page[0]["_id"], str)
+
+
+def test_build_projection():
+    """Test de construction des projections"""
+    assert MongoDBClient.build_projection(None) is None
+    assert MongoDBClient.build_projection(["first_name", "offre.intitule"]) == {
+        "first_name": 1,
+        "offre.intitule": 1
+    }
+    with pytest.raises(ValueError):
+        MongoDBClient.build_projection(["first_name", "-documents"])
+    with pytest.raises(ValueError):
+        MongoDBClient.build_projection(["-_id"])
+
+
+def test_normalize_name():
+    """Test de la normalisation des noms (casse, accents, espaces)"""
+    assert normalize_name("Teddy Osée ") == "teddy osee"
+    assert normalize_name("  LONGO   NGOLO") == "longo ngolo"
+    assert normalize_name(None) == ""
+
+
+def test_upsert_stores_normalized_names(mongo_client):
+    """Test que les noms normalisés sont écrits avec la candidature"""
+    _, document = mongo_client.build_candidature_upsert(
+        Candidature(first_name="Teddy Osée ", last_name="LONGO NGOLO"),
+        application_id="app-1"
+    )
+    
+    assert document["first_name_normalized"] == "teddy osee"
+    assert document["last_name_normalized"] == "longo ngolo"
+
+
+def test_search_query_is_anchored_prefix():
+    """Test que la recherche est un préfixe ancré et échappé"""
+    query = MongoDBClient.build_search_query(first_name="Osée", last_name="Longo (")
+    
+    assert query == {
+        "first_name_normalized": {"$regex": "^osee"},
+        "last_name_normalized": {"$regex": "^longo\\ \\("}
+    }
+
+
+def test_search_query_ignores_blank_names():
+    """Test qu'un nom fait d'espaces ne devient pas un préfixe vide"""
+    query = MongoDBClient.build_search_query(first_name="   ", last_name="Dupont")
+    
+    assert query == {"last_name_normalized": {"$regex": "^dupont"}}
+
+
+def test_upsert_bumps_collection_version(mongo_client):
+    """Test que chaque écriture incrémente le compteur de version"""
+    mongo_client.meta = MagicMock()
+    mongo_client.collection.find_one_and_update.return_value = None
+    
+    mongo_client.insert_or_update_candidature(
+        Candidature(first_name="Jean", last_name="Dupont"),
+        application_id="app-1"
+    )
+    
+    mongo_client.meta.update_one.assert_called_once_with(
+        {"_id": "candidats"},
+        {"$inc": {"version": 1}},
+        upsert=True
+    )
+
+
+@pytest.mark.parametrize("migration, document", [
+    ("backfill_normalized_names", {"_id": 1, "first_name": "Élise", "last_name": "Nzé"}),
+    ("extract_embedded_offres", {"_id": 1, "offre": {"intitule": "Juriste", "reference": "JUR-1"}})
+])
+def test_migrations_bump_collection_version(migration, document):
+    """Test que les migrations de manage_indexes.py invalident le cache de l'API"""
+    databases = defaultdict(lambda: defaultdict(MagicMock))
+    mongo_client = build_maintenance_client(databases, "SEEG-AI", "candidats")
+    mongo_client.collection.find.return_value = [document]
+    mongo_client.collection.bulk_write.return_value.modified_count = 1
+    
+    assert getattr(mongo_client, migration)() == 1
+    
+    mongo_client.meta.update_one.assert_called_once_with(
+        {"_id": "candidats"},
+        {"$inc": {"version": 1}},
+        upsert=True
+    )
+
+
+def test_upsert_offre_excludes_candidate_fields(mongo_client):
+    """Test de l'écriture d'une offre dans sa collection"""
+    mongo_client.offres = MagicMock()
+    
+    mongo_client.upsert_offre("job-1", Offre(intitule="Comptable", date_publication="2025-10-01"))
+    
+    call = mongo_client.offres.update_one.call_args
+    assert call.args[0] == {"_id": "job-1"}
+    assert call.args[1]["$set"]["intitule"] == "Comptable"
+    assert "date_publication" not in call.args[1]["$set"]
+    assert call.kwargs["upsert"] is True
@@ -0,0 +1,94 @@
+"""
+Tests pour le cache disque des résultats OCR
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from src.services import ocr_cache
+from src.services.ocr_cache import OCRCache
+
+
+def test_make_key_depends_on_content_and_model():
+    """Test que la clé dépend du contenu et du modèle"""
+    key = OCRCache.make_key(b"document", "prebuilt-read")
+    
+    assert key.startswith("prebuilt-read-")
+    assert key == OCRCache.make_key(b"document", "prebuilt-read")
+    assert key != OCRCache.make_key(b"document modifie", "prebuilt-read")
+    assert key != OCRCache.make_key(b"document", "prebuilt-layout")
+
+
+def test_make_key_from_buffer():
+    """Test que la clé d'un tampon est celle de son contenu"""
+    buffer = io.BytesIO(b"document")
+    buffer.read(3)
+    
+    assert OCRCache.make_key(buffer, "prebuilt-read") == OCRCache.make_key(b"document", "prebuilt-read")
+    assert buffer.tell() == 0
+
+
+def test_get_put_roundtrip(tmp_path):
+    """Test d'écriture puis lecture d'une entrée"""
+    cache = OCRCache(tmp_path, max_size_bytes=1024)
+    
+    assert cache.get("absent") is None
+    cache.put("cle", "Texte extrait é")
+    
+    assert cache.get("cle") == "Texte extrait é"
+    assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+
+def test_persistence_across_instances(tmp_path):
+    """Test que le cache survit à un redémarrage"""
+    OCRCache(tmp_path, max_size_bytes=1024).put("cle", "texte")
+    
+    assert OCRCache(tmp_path, max_size_bytes=1024).get("cle") == "texte"
+
+
+def test_lru_eviction(tmp_path):
+    """Test que l'entrée la moins récemment utilisée est évincée"""
+    cache = OCRCache(tmp_path, max_size_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    os.utime(tmp_path / "a.txt", (1, 1))
+    os.utime(tmp_path / "b.txt", (2, 2))
+    
+    # Accès à "a" : "b" devient la moins récemment utilisée
+    assert cache.get("a") is not None
+    cache.put("c", "z" * 10)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_concurrent_writes_use_unique_temp_files(tmp_path):
+    """Test que des écritures simultanées d'une même entrée ne se corrompent pas"""
+    cache = OCRCache(tmp_path, max_size_bytes=10 * 1024 * 1024)
+    texts = [str(i) * 50000 for i in range(8)]
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda text: cache.put("cle", text), texts))
+    
+    assert cache.get("cle") in texts
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_eviction_counts_entries_written_by_other_processes(tmp_path, monkeypatch):
+    """Test que l'éviction tient compte de la taille réelle du dossier"""
+    # Taille relue depuis le disque à chaque écriture
+    monkeypatch.setattr(ocr_cache, "SIZE_REFRESH_INTERVAL", 0.0)
+    cache = OCRCache(tmp_path, max_size_bytes=25)
+    cache.put("a", "x" * 10)
+    
+    # Entrées écrites par un autre processus, inconnues de ce cache
+    other = OCRCache(tmp_path, max_size_bytes=25)
+    other.put("b", "y" * 10)
+    os.utime(tmp_path / "a.txt", (1, 1))
+    os.utime(tmp_path / "b.txt", (2, 2))
+    
+    cache.put("c", "z" * 10)
+    
+    assert not (tmp_path / "a.txt").exists()
+    assert (tmp_path / "b.txt").exists()
+    assert (tmp_path / "c.txt").exists()
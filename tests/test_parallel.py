@@ -0,0 +1,87 @@
+"""
+Tests pour le traitement réparti sur plusieurs processus
+"""
+import sqlite3
+from collections import Counter
+from src.processor import job_queue
+from src.processor.job_queue import JobQueue, shard_of
+from src.processor.parallel import merge_summaries
+
+
+def test_shard_of_is_stable_and_balanced():
+    """Test que l'attribution ne dépend que de la clé et répartit uniformément"""
+    keys = [f"app-{i}" for i in range(4000)]
+    shards = [shard_of(key, 4) for key in keys]
+    
+    assert shards == [shard_of(key, 4) for key in keys]
+    assert set(shards) == {0, 1, 2, 3}
+    assert all(800 < count < 1200 for count in Counter(shards).values())
+
+
+def test_iter_candidates_shard_partitions_queue(tmp_path, monkeypatch):
+    """Test que chaque part ne décode que ses candidatures, sans doublon ni oubli"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    candidats = [{"application_id": f"app-{i}"} for i in range(50)] + [{"first_name": "Sans id"}]
+    queue.sync(candidats)
+    
+    decoded = []
+    real_loads = job_queue.json.loads
+    monkeypatch.setattr(job_queue.json, "loads", lambda data: decoded.append(data) or real_loads(data))
+    
+    keys = []
+    for index in range(3):
+        part = [c["_job_key"] for c in queue.iter_candidates(shard=(index, 3))]
+        assert all(shard_of(key, 3) == index for key in part)
+        keys += part
+    queue.close()
+    
+    assert sorted(keys) == sorted([f"app-{i}" for i in range(50)] + ["#51"])
+    assert len(decoded) == len(candidats)
+
+
+def test_queue_created_before_sharding_is_migrated(tmp_path):
+    """Test que les files existantes reçoivent l'empreinte de répartition"""
+    path = tmp_path / "jobs.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE candidates (key TEXT PRIMARY KEY, position INTEGER NOT NULL, "
+        "fingerprint TEXT NOT NULL, data TEXT NOT NULL, state TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, error TEXT, updated_at REAL NOT NULL);"
+        "INSERT INTO candidates VALUES ('app-1', 1, 'x', '{}', 'pending', 0, NULL, 0);"
+    )
+    connection.commit()
+    connection.close()
+    
+    queue = JobQueue(path)
+    parts = [[c["_job_key"] for c in queue.iter_candidates(shard=(index, 2))] for index in range(2)]
+    queue.close()
+    
+    assert parts[shard_of("app-1", 2)] == ["app-1"]
+    assert parts[1 - shard_of("app-1", 2)] == []
+
+
+def test_merge_summaries():
+    """Test du cumul des statistiques des processus"""
+    summaries = [
+        {
+            "total": 10, "processed": 9, "failed": 1,
+            "elapsed_seconds": 5.0, "throughput": 2.0,
+            "ocr_cache": {"hits": 3, "misses": 7},
+            "ocr_rate_limit": {"rate": 7.5, "acquired": 20, "throttled": 1, "waited_seconds": 1.5}
+        },
+        {
+            "total": 5, "processed": 5, "failed": 0,
+            "ocr_cache": {"hits": 1, "misses": 4},
+            "ocr_rate_limit": {"rate": 5.0, "acquired": 8, "throttled": 0, "waited_seconds": 0.5}
+        },
+        None
+    ]
+    
+    merged = merge_summaries(summaries)
+    
+    assert merged["total"] == 15
+    assert merged["processed"] == 14
+    assert merged["failed"] == 1
+    assert merged["ocr_cache"] == {"hits": 4, "misses": 11}
+    assert merged["ocr_rate_limit"] == {"rate": 12.5, "acquired": 28, "throttled": 1, "waited_seconds": 2.0}
+    assert "elapsed_seconds" not in merged
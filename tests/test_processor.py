@@ -3,9 +3,12 @@ Tests pour le processeur de candidatures
 """
 import pytest
 import json
+import asyncio
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
 from src.processor.candidature_processor import CandidatureProcessor
+from src.services.azure_ocr import OCRTransientError
+from src.processor.job_queue import JobQueue, OCR_DONE, FAILED
 from src.models import Candidature
 
 
@@ -63,10 +66,7 @@ async def test_process_documents_empty(processor):
         "Dupont"
     )
     
-    assert documents["cv"] is None
-    assert documents["cover_letter"] is None
-    assert documents["diplome"] is None
-    assert documents["certificats"] is None
+    assert documents == {"cv": [], "cover_letter": [], "diplome": [], "certificats": []}
 
 
 def test_no_json_files_in_data_folder(processor, temp_data_folder):
@@ -75,3 +75,262 @@ def test_no_json_files_in_data_folder(processor, temp_data_folder):
     json_files = list(temp_data_folder.glob("*.json"))
     assert len(json_files) == 0
 
+
+
+@pytest.mark.asyncio
+async def test_process_candidates_bounded_concurrency(processor):
+    """Test que le nombre de candidatures simultanées est borné"""
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def fake_process(candidate_data):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if candidate_data.get("fail"):
+            raise ValueError("échec simulé")
+    
+    candidats = [{"first_name": f"C{i}", "fail": i % 4 == 0} for i in range(10)]
+    
+    with patch("src.processor.candidature_processor.settings") as mock_settings, \
+            patch.object(processor, "process_single_candidature_from_data", side_effect=fake_process):
+        mock_settings.max_concurrent_candidates = 3
+        summary = await processor._process_candidates(candidats)
+    
+    assert max_in_flight == 3
+    assert summary["total"] == 10
+    assert summary["processed"] == 7
+    assert summary["failed"] == 3
+    assert summary["throughput"] > 0
+
+
+@pytest.mark.asyncio
+async def test_process_documents_concurrent(processor):
+    """Test que tous les documents d'un candidat sont traités en parallèle"""
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def fake_single(doc_type, url, first_name, last_name, index, job=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return None if url.endswith("cert.pdf") else f"texte {url.rsplit('/', 1)[-1]}"
+    
+    urls = {
+        "cv": [{"id": "d1", "nom_fichier": "CV.pdf", "url": "https://x/cv.pdf"}],
+        "cover_letter": [{"id": "d2", "nom_fichier": "LM.pdf", "url": "https://x/lm.pdf"}],
+        "diplome": [
+            {"id": "d3", "nom_fichier": "BAC.pdf", "url": "https://x/bac.pdf"},
+            {"id": "d4", "nom_fichier": "Bachelor.pdf", "url": "https://x/bachelor.pdf"}
+        ],
+        "certificats": [{"id": "d5", "nom_fichier": "Cert.pdf", "url": "https://x/cert.pdf"}]
+    }
+    
+    with patch("src.processor.candidature_processor.settings") as mock_settings, \
+            patch.object(processor, "_process_single_document", side_effect=fake_single):
+        mock_settings.max_concurrent_documents = 8
+        documents = await processor._process_documents(urls, "Jean", "Dupont")
+    
+    assert max_in_flight == 5
+    assert documents["cv"] == [{"id": "d1", "nom_fichier": "CV.pdf", "texte": "texte cv.pdf"}]
+    assert documents["cover_letter"][0]["texte"] == "texte lm.pdf"
+    assert documents["diplome"] == [
+        {"id": "d3", "nom_fichier": "BAC.pdf", "texte": "texte bac.pdf"},
+        {"id": "d4", "nom_fichier": "Bachelor.pdf", "texte": "texte bachelor.pdf"}
+    ]
+    assert documents["certificats"] == [{"id": "d5", "nom_fichier": "Cert.pdf", "texte": None}]
+
+
+@pytest.mark.asyncio
+async def test_process_single_candidature_incremental(processor):
+    """Test que seuls les documents nouveaux ou modifiés sont ré-analysés"""
+    candidate_data = {
+        "application_id": "app-1",
+        "first_name": "Jean",
+        "last_name": "Dupont",
+        "documents": [
+            {"id": "d1", "type": "cv", "nom_fichier": "CV.pdf", "url": "a/cv.pdf",
+             "taille": 100, "date_upload": "2025-10-01"},
+            {"id": "d2", "type": "cover_letter", "nom_fichier": "LM.pdf", "url": "a/lm.pdf",
+             "taille": 200, "date_upload": "2025-10-02"},
+            {"id": "d3", "type": "diploma", "nom_fichier": "BAC.pdf", "url": "a/bac.pdf",
+             "taille": 300, "date_upload": "2025-10-01"},
+            {"id": "d4", "type": "diploma", "nom_fichier": "Bachelor.pdf", "url": "a/bachelor.pdf",
+             "taille": 400, "date_upload": "2025-10-03"}
+        ]
+    }
+    previous_state = {
+        "documents": {
+            "cv": [{"id": "d1", "nom_fichier": "CV.pdf", "texte": "Ancien texte CV"}],
+            "cover_letter": [{"id": "d2", "nom_fichier": "LM.pdf", "texte": "Ancienne lettre"}],
+            "diplome": [{"id": "d3", "nom_fichier": "BAC.pdf", "texte": "Texte BAC"}]
+        },
+        "documents_meta": {
+            "cv": [{"id": "d1", "taille": 100, "date_upload": "2025-10-01"}],
+            "cover_letter": [{"id": "d2", "taille": 150, "date_upload": "2025-09-01"}],
+            "diplome": [{"id": "d3", "taille": 300, "date_upload": "2025-10-01"}]
+        }
+    }
+    processed_urls = []
+    
+    async def fake_single(doc_type, url, first_name, last_name, index, job=None):
+        processed_urls.append(url.rsplit("/", 1)[-1])
+        return f"Nouveau {doc_type}"
+    
+    with patch("src.processor.candidature_processor.mongodb_client") as mock_mongo, \
+            patch.object(processor, "_process_single_document", side_effect=fake_single):
+        mock_mongo.get_documents_state.return_value = previous_state
+        
+        await processor.process_single_candidature_from_data(candidate_data)
+    
+    assert sorted(processed_urls) == ["bachelor.pdf", "lm.pdf"]
+    
+    saved = mock_mongo.insert_or_update_candidature.call_args
+    documents = saved.args[0].documents
+    assert documents.cv[0].texte == "Ancien texte CV"
+    assert documents.cover_letter[0].texte == "Nouveau cover_letter"
+    assert [d.texte for d in documents.diplome] == ["Texte BAC", "Nouveau diplome"]
+    assert saved.kwargs["extra_fields"]["documents_meta"]["cover_letter"][0]["taille"] == 200
+
+
+@pytest.mark.asyncio
+async def test_unchanged_documents_single_text_state(processor):
+    """Test qu'un état à un texte par type (sans id par document) est ré-analysé"""
+    previous_state = {
+        "documents": {"cv": "Ancien texte CV"},
+        "documents_meta": {"cv": {"id": "d1", "taille": 100, "date_upload": "2025-10-01"}}
+    }
+    documents_meta = {"cv": [{"id": "d1", "taille": 100, "date_upload": "2025-10-01"}]}
+    
+    with patch("src.processor.candidature_processor.mongodb_client") as mock_mongo:
+        mock_mongo.get_documents_state.return_value = previous_state
+        assert await processor._get_unchanged_documents("app-1", documents_meta) == {}
+
+
+@pytest.mark.asyncio
+async def test_offre_stored_once_and_referenced(processor):
+    """Test que l'offre n'est écrite qu'une fois et résumée dans la candidature"""
+    candidats = [
+        {"application_id": f"app-{i}", "first_name": f"C{i}", "last_name": "X",
+         "job_id": "job-1", "job_title": "Comptable", "job_description": "<p>Long</p>",
+         "date_candidature": f"2025-10-0{i + 1}", "documents": []}
+        for i in range(3)
+    ]
+    
+    with patch("src.processor.candidature_processor.mongodb_client") as mock_mongo:
+        mock_mongo.get_documents_state.return_value = None
+        for candidate_data in candidats:
+            await processor.process_single_candidature_from_data(candidate_data)
+    
+    mock_mongo.upsert_offre.assert_called_once()
+    assert mock_mongo.upsert_offre.call_args.args[0] == "job-1"
+    
+    extra_fields = mock_mongo.insert_or_update_candidature.call_args.kwargs["extra_fields"]
+    assert extra_fields["offre_id"] == "job-1"
+    assert extra_fields["offre"] == {
+        "intitule": "Comptable",
+        "reference": "job-1",
+        "date_publication": "2025-10-03"
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_single_document_in_memory(processor, tmp_path):
+    """Test que le document téléchargé passe à l'OCR sans fichier temporaire"""
+    processor.temp_folder = tmp_path / "temp"
+    buffer = MagicMock()
+    buffer.__enter__.return_value = buffer
+    
+    with patch("src.processor.candidature_processor.settings") as mock_settings, \
+            patch("src.processor.candidature_processor.supabase_client") as mock_supabase, \
+            patch("src.processor.candidature_processor.azure_ocr_service") as mock_ocr:
+        mock_settings.ocr_in_memory = True
+        mock_settings.download_spool_max_mb = 16
+        mock_supabase.download_to_buffer = AsyncMock(return_value=buffer)
+        mock_ocr.extract_text = AsyncMock(return_value="Texte du BAC")
+        
+        text = await processor._process_single_document(
+            "diplome", "https://x/a/bac.pdf", "Jean", "Dupont", 1
+        )
+    
+    assert text == "Texte du BAC"
+    mock_supabase.download_to_buffer.assert_awaited_once_with("https://x/a/bac.pdf", 16 * 1024 * 1024)
+    mock_ocr.extract_text.assert_awaited_once_with(buffer, "bac.pdf")
+    mock_supabase.download_file.assert_not_called()
+    buffer.__exit__.assert_called_once()
+    assert not processor.temp_folder.exists()
+
+
+@pytest.mark.asyncio
+async def test_process_documents_propagates_transient_ocr_error(processor):
+    """Test qu'un OCR limité fait échouer la candidature au lieu d'un texte vide"""
+    completed = []
+    
+    async def fake_single(doc_type, url, first_name, last_name, index, job=None):
+        if doc_type == "cv":
+            raise OCRTransientError("cv.pdf: 429")
+        await asyncio.sleep(0.01)
+        completed.append(doc_type)
+        return "texte"
+    
+    urls = {
+        "cv": [{"id": "d1", "url": "https://x/cv.pdf"}],
+        "diplome": [{"id": "d2", "url": "https://x/bac.pdf"}]
+    }
+    
+    with patch.object(processor, "_process_single_document", side_effect=fake_single), \
+            pytest.raises(OCRTransientError):
+        await processor._process_documents(urls, "Jean", "Dupont")
+    
+    # Les autres documents sont allés à leur terme (résultats en cache OCR)
+    assert completed == ["diplome"]
+
+
+@pytest.mark.asyncio
+async def test_resume_from_job_queue(processor, tmp_path):
+    """Test de la reprise : documents déjà analysés réutilisés, états enregistrés"""
+    queue = JobQueue(tmp_path / "jobs.db")
+    queue.sync([
+        {"application_id": "app-1", "first_name": "Jean", "last_name": "Dupont", "documents": [
+            {"id": "d1", "type": "cv", "url": "a/cv.pdf"},
+            {"id": "d2", "type": "diploma", "url": "a/bac.pdf"}
+        ]},
+        {"application_id": "app-2", "first_name": "Marie", "last_name": "Curie", "documents": [
+            {"id": "d3", "type": "cv", "url": "b/cv.pdf"}
+        ]}
+    ])
+    # Exécution précédente interrompue après l'OCR du CV de app-1
+    queue.mark_document("app-1", "d1", OCR_DONE, texte="Texte CV repris")
+    processed_urls = []
+    
+    async def fake_single(doc_type, url, first_name, last_name, index, job=None):
+        processed_urls.append(url.split("/public/")[-1].split("/", 1)[-1])
+        if url.endswith("b/cv.pdf"):
+            raise OCRTransientError("cv.pdf: 429")
+        return "Texte BAC"
+    
+    processor.job_queue = queue
+    try:
+        with patch("src.processor.candidature_processor.mongodb_client") as mock_mongo, \
+                patch.object(processor, "_process_single_document", side_effect=fake_single):
+            mock_mongo.get_documents_state.return_value = None
+            mock_mongo.build_candidature_upsert.return_value = ({}, {})
+            mock_mongo.create_bulk_writer.return_value.close = AsyncMock()
+            mock_mongo.create_bulk_writer.return_value.upsert = AsyncMock(return_value="id")
+            summary = await processor._process_candidates(queue.iter_candidates())
+        
+        assert sorted(processed_urls) == ["a/bac.pdf", "b/cv.pdf"]
+        assert summary["processed"] == 1 and summary["failed"] == 1
+        assert [c["_job_key"] for c in queue.iter_candidates(retry_failed=True)] == ["app-2"]
+        assert list(queue.iter_candidates()) == []
+        
+        saved = mock_mongo.build_candidature_upsert.call_args.args[0]
+        assert saved.documents.cv[0].texte == "Texte CV repris"
+        assert queue.get_counts()["documents"][FAILED] == 1
+    finally:
+        processor.job_queue = None
+        queue.close()
@@ -0,0 +1,65 @@
+"""
+Tests pour le limiteur de débit adaptatif des appels OCR
+"""
+import time
+import pytest
+from email.utils import formatdate
+from src.services.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+def test_parse_retry_after_formats():
+    """Test de lecture des différents en-têtes Retry-After"""
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "3"}) == 1.5
+    assert parse_retry_after({"x-ms-retry-after-ms": "250"}) == 0.25
+    assert 8 <= parse_retry_after({"retry-after": formatdate(time.time() + 10, usegmt=True)}) <= 10
+    assert parse_retry_after({"retry-after": "bientôt"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_paces_calls_to_rate():
+    """Test que le débit est limité une fois la rafale consommée"""
+    limiter = AdaptiveRateLimiter(max_rate=20)
+    
+    start = time.monotonic()
+    for _ in range(30):
+        await limiter.acquire()
+    elapsed = time.monotonic() - start
+    
+    # 20 jetons disponibles, puis 10 appels à 20 appels/s
+    assert 0.4 <= elapsed < 1.0
+    assert limiter.get_stats()["acquired"] == 30
+
+
+def test_throttle_decreases_once_per_burst_and_success_recovers():
+    """Test de la diminution multiplicative et de l'augmentation additive"""
+    limiter = AdaptiveRateLimiter(max_rate=10, min_rate=2, increase_step=1)
+    
+    limiter.on_throttle()
+    limiter.on_throttle()  # même rafale : pas de nouvelle réduction
+    assert limiter.rate == 5
+    assert limiter.throttled == 2
+    
+    limiter.last_decrease -= limiter.cooldown
+    limiter.on_throttle()
+    limiter.last_decrease -= limiter.cooldown
+    limiter.on_throttle()
+    assert limiter.rate == 2  # plancher min_rate
+    
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 10  # plafond du niveau tarifaire
+
+
+@pytest.mark.asyncio
+async def test_retry_after_suspends_calls():
+    """Test que Retry-After suspend tous les appels"""
+    limiter = AdaptiveRateLimiter(max_rate=100)
+    
+    limiter.on_throttle(retry_after=0.2)
+    start = time.monotonic()
+    await limiter.acquire()
+    
+    assert time.monotonic() - start >= 0.2
@@ -0,0 +1,93 @@
+"""
+Tests pour le cache de réponses de l'API
+"""
+import pytest
+from unittest.mock import AsyncMock
+from src.api.response_cache import ResponseCache, etag_matches
+
+
+def test_make_key_normalizes_params():
+    """Test que l'ordre et les paramètres absents n'influent pas sur la clé"""
+    key = ResponseCache.make_key("candidatures", {"limit": 10, "fields": ["b", "a"], "after": None})
+    
+    assert key == ResponseCache.make_key("candidatures", {"fields": ["a", "b"], "limit": 10})
+    assert key != ResponseCache.make_key("search", {"fields": ["a", "b"], "limit": 10})
+
+
+def test_lru_eviction():
+    """Test de l'éviction de l'entrée la moins récemment utilisée"""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 0, [1])
+    cache.put("b", 0, [2])
+    cache.get("a", 0)
+    cache.put("c", 0, [3])
+    
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0).value == [1]
+
+
+def test_byte_budget_eviction():
+    """Test que la taille cumulée des réponses reste sous le budget"""
+    size = len(ResponseCache.encode(["x" * 100]))
+    cache = ResponseCache(max_bytes=2 * size)
+    cache.put("a", 0, ["x" * 100])
+    cache.put("b", 0, ["y" * 100])
+    cache.put("c", 0, ["z" * 100])
+    
+    assert cache.get("a", 0) is None
+    assert cache.get("c", 0).value == ["z" * 100]
+    assert cache.get_stats()["bytes"] == 2 * size
+
+
+def test_oversized_response_not_cached():
+    """Test qu'une réponse plus grande que le budget n'est pas conservée"""
+    cache = ResponseCache(max_bytes=64)
+    entry = cache.put("all", 0, [{"texte": "x" * 1000}])
+    
+    assert entry.etag == ResponseCache.make_etag(ResponseCache.encode([{"texte": "x" * 1000}]))
+    assert cache.get("all", 0) is None
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_ttl_expiry():
+    """Test de l'expiration des entrées"""
+    cache = ResponseCache(ttl=0)
+    cache.put("a", 0, [1])
+    
+    assert cache.get("a", 0) is None
+
+
+@pytest.mark.asyncio
+async def test_version_change_clears_entries():
+    """Test de l'invalidation par le compteur de version"""
+    cache = ResponseCache(version_check_interval=0)
+    loader = AsyncMock(return_value=1)
+    await cache.current_version(loader)
+    cache.put("a", 1, [1])
+    
+    loader.return_value = 2
+    assert await cache.current_version(loader) == 2
+    assert cache.get("a", 2) is None
+
+
+@pytest.mark.asyncio
+async def test_version_read_throttled():
+    """Test que la version n'est relue qu'une fois par intervalle"""
+    cache = ResponseCache(version_check_interval=60)
+    loader = AsyncMock(return_value=3)
+    
+    await cache.current_version(loader)
+    await cache.current_version(loader)
+    
+    loader.assert_awaited_once()
+
+
+def test_etag_matches():
+    """Test de la comparaison If-None-Match"""
+    etag = ResponseCache.make_etag(ResponseCache.encode([{"a": 1}]))
+    
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
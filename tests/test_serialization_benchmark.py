@@ -0,0 +1,107 @@
+"""
+Micro-benchmark de la sérialisation de /candidatures
+
+Compare le chemin validé (response_model Pydantic puis json) au chemin
+rapide (orjson direct) sur l'échantillon de 40 candidatures multiplié,
+avec des textes OCR de taille réaliste. Le benchmark est un test lent,
+ignoré par défaut ; l'équivalence des deux chemins est toujours vérifiée.
+    
+    pytest tests/test_serialization_benchmark.py -s -m slow
+"""
+import json
+import time
+from pathlib import Path
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+from src.api.app import app, response_cache
+from src.processor.candidature_processor import CandidatureProcessor
+
+
+SAMPLE_FILE = Path(__file__).parent.parent / "data" / "Donnees_candidatures_SEEG.json"
+SCALE = 25  # 40 × 25 = 1000 candidatures par réponse
+ROUNDS = 3
+OCR_TEXT = "Expérience professionnelle en gestion de réseaux électriques. " * 80
+
+
+def _build_documents(scale: int = SCALE):
+    """Documents MongoDB construits depuis l'échantillon, comme par le traitement"""
+    processor = CandidatureProcessor()
+    candidates = json.loads(SAMPLE_FILE.read_text(encoding="utf-8-sig"))
+    
+    documents = []
+    for _ in range(scale):
+        for candidate in candidates:
+            candidature = processor._build_candidature_from_json(candidate)
+            document = candidature.model_dump(by_alias=True)
+            document["_id"] = str(ObjectId())
+            document["documents"] = {
+                "cv": [{"id": "cv", "nom_fichier": "CV.pdf", "texte": OCR_TEXT}],
+                "cover_letter": [{"id": "lm", "nom_fichier": "LM.pdf", "texte": OCR_TEXT}],
+                "diplome": [
+                    {"id": "bac", "nom_fichier": "BAC.pdf", "texte": OCR_TEXT[:500]},
+                    {"id": "licence", "nom_fichier": "Licence.pdf", "texte": OCR_TEXT[:500]}
+                ],
+                "certificats": []
+            }
+            documents.append(document)
+    return documents
+
+
+def _measure(client, validate: bool, rounds: int = ROUNDS):
+    """Durée moyenne d'un appel à /candidatures et corps de la réponse"""
+    # Sans compression, pour ne mesurer que la sérialisation
+    headers = {"Accept-Encoding": "identity"}
+    with patch("src.api.app.settings.api_validate_responses", validate):
+        client.get("/candidatures", headers=headers)  # échauffement
+        start = time.perf_counter()
+        for _ in range(rounds):
+            response = client.get("/candidatures", headers=headers)
+        elapsed = (time.perf_counter() - start) / rounds
+    
+    assert response.status_code == 200
+    return elapsed, response.json()
+
+
+def _compare_paths(scale: int, rounds: int):
+    """Durées et corps des réponses des chemins validé et rapide"""
+    documents = _build_documents(scale)
+    client = TestClient(app)
+    
+    with patch("src.api.app.async_mongodb_client", new_callable=AsyncMock) as mock, \
+            patch("src.api.app.settings.api_cache_enabled", False):
+        mock.get_all_candidatures.return_value = documents
+        
+        validated_time, validated_body = _measure(client, validate=True, rounds=rounds)
+        fast_time, fast_body = _measure(client, validate=False, rounds=rounds)
+    
+    response_cache.clear()
+    return documents, validated_time, validated_body, fast_time, fast_body
+
+
+@pytest.mark.skipif(not SAMPLE_FILE.exists(), reason="Échantillon de candidatures absent")
+def test_fast_serialization_path_equivalent():
+    """Le chemin orjson produit le même JSON que la validation Pydantic"""
+    _, _, validated_body, _, fast_body = _compare_paths(scale=1, rounds=1)
+    
+    assert fast_body == validated_body
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not SAMPLE_FILE.exists(), reason="Échantillon de candidatures absent")
+def test_fast_serialization_path_benchmark():
+    """Durées des deux chemins, affichées sans assertion de temps (machines chargées)"""
+    documents, validated_time, validated_body, fast_time, fast_body = _compare_paths(
+        scale=SCALE,
+        rounds=ROUNDS
+    )
+    
+    print(
+        f"\n{len(documents)} candidatures: "
+        f"response_model {validated_time * 1000:.1f} ms, "
+        f"orjson {fast_time * 1000:.1f} ms "
+        f"(x{validated_time / fast_time:.1f})"
+    )
+    
+    assert fast_body == validated_body
@@ -0,0 +1,97 @@
+"""
+Tests pour le client Supabase
+"""
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.services.supabase_client import SupabaseClient
+
+
+@pytest_asyncio.fixture
+async def file_server():
+    """Serveur HTTP local servant un faux document"""
+    async def handler(request):
+        return web.Response(body=b"%PDF-1.4 contenu")
+    
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_download_file_reuses_pooled_connection(file_server, tmp_path):
+    """Test que les téléchargements successifs réutilisent la même connexion"""
+    client = SupabaseClient()
+    client.connect()
+    
+    try:
+        for name in ("cv.pdf", "lettre.pdf", "diplome.pdf"):
+            url = str(file_server.make_url(f"/{name}"))
+            assert await client.download_file(url, tmp_path / name)
+            assert (tmp_path / name).read_bytes() == b"%PDF-1.4 contenu"
+    finally:
+        await client.close()
+    
+    assert client.connection_stats == {"new": 1, "reused": 2}
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_download_file_failure(tmp_path):
+    """Test d'échec de téléchargement (hôte injoignable)"""
+    client = SupabaseClient()
+    
+    try:
+        success = await client.download_file(
+            "http://127.0.0.1:1/absent.pdf", tmp_path / "absent.pdf"
+        )
+    finally:
+        await client.close()
+    
+    assert success is False
+
+
+@pytest.mark.asyncio
+async def test_download_to_buffer_spills_above_threshold(file_server):
+    """Test du téléchargement en mémoire, avec débordement au-delà du seuil"""
+    client = SupabaseClient()
+    url = str(file_server.make_url("/cv.pdf"))
+    
+    try:
+        in_memory = await client.download_to_buffer(url, max_memory_size=1024)
+        spilled = await client.download_to_buffer(url, max_memory_size=4)
+        missing = await client.download_to_buffer("http://127.0.0.1:1/absent.pdf", 1024)
+    finally:
+        await client.close()
+    
+    with in_memory, spilled:
+        assert in_memory.read() == b"%PDF-1.4 contenu"
+        assert not in_memory._rolled
+        assert spilled.read() == b"%PDF-1.4 contenu"
+        assert spilled._rolled
+    assert missing is None
+
+
+def test_get_document_urls_from_candidate():
+    """Test de construction des URLs publiques Supabase"""
+    client = SupabaseClient()
+    candidate_data = {
+        "documents": [
+            {"id": "d1", "type": "cv", "nom_fichier": "CV.pdf", "url": "abc/cv.pdf"},
+            {"id": "d2", "type": "diploma", "nom_fichier": "BAC.pdf", "url": "abc/bac.pdf"},
+            {"id": "d3", "type": "diploma", "nom_fichier": "Bachelor.pdf", "url": "abc/bachelor.pdf"}
+        ]
+    }
+    
+    urls = client.get_document_urls_from_candidate(candidate_data)
+    
+    assert set(urls) == {"cv", "diplome"}
+    assert urls["cv"][0]["url"].endswith("/storage/v1/object/public/application-documents/abc/cv.pdf")
+    assert [(d["id"], d["nom_fichier"]) for d in urls["diplome"]] == [
+        ("d2", "BAC.pdf"),
+        ("d3", "Bachelor.pdf")
+    ]